@@ -0,0 +1,5 @@
+CREATE INDEX IF NOT EXISTS events_station_id_idx ON events (station_id);
+CREATE INDEX IF NOT EXISTS comments_station_id_idx ON comments (station_id);
+
+DROP INDEX IF EXISTS events_station_id_charged_at_idx;
+DROP INDEX IF EXISTS comments_station_id_created_at_idx;
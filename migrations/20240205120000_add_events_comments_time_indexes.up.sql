@@ -0,0 +1,7 @@
+-- newest events / comments of a station are read with index range scans
+CREATE INDEX IF NOT EXISTS events_station_id_charged_at_idx ON events (station_id, charged_at DESC);
+CREATE INDEX IF NOT EXISTS comments_station_id_created_at_idx ON comments (station_id, created_at DESC);
+
+-- covered by the indexes above
+DROP INDEX IF EXISTS events_station_id_idx;
+DROP INDEX IF EXISTS comments_station_id_idx;
@@ -0,0 +1,6 @@
+ALTER TABLE stations
+    DROP COLUMN IF EXISTS last_event_at,
+    DROP COLUMN IF EXISTS last_event,
+    DROP COLUMN IF EXISTS rating_sum,
+    DROP COLUMN IF EXISTS rating_count,
+    DROP COLUMN IF EXISTS comment_count;
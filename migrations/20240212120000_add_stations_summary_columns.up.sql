@@ -0,0 +1,54 @@
+ALTER TABLE stations
+    ADD COLUMN IF NOT EXISTS last_event_at TIMESTAMPTZ,
+    ADD COLUMN IF NOT EXISTS last_event JSONB,
+    ADD COLUMN IF NOT EXISTS rating_sum INTEGER NOT NULL DEFAULT 0,
+    ADD COLUMN IF NOT EXISTS rating_count INTEGER NOT NULL DEFAULT 0,
+    ADD COLUMN IF NOT EXISTS comment_count INTEGER NOT NULL DEFAULT 0;
+
+
+UPDATE
+    stations s
+SET
+    last_event_at = e.charged_at,
+    last_event = jsonb_build_object(
+        'charged_at', e.charged_at,
+        'source', e.source,
+        'name', e.name,
+        'is_problem', e.is_problem
+    )
+FROM (
+    SELECT DISTINCT ON (station_id)
+        station_id,
+        charged_at,
+        source,
+        name,
+        is_problem
+    FROM
+        events
+    ORDER BY
+        station_id,
+        charged_at DESC
+) e
+WHERE
+    e.station_id = s.id;
+
+
+UPDATE
+    stations s
+SET
+    rating_sum = c.rating_sum,
+    rating_count = c.rating_count,
+    comment_count = c.comment_count
+FROM (
+    SELECT
+        station_id,
+        COALESCE(SUM(rating) FILTER (WHERE rating <> 0), 0) AS rating_sum,
+        COUNT(rating) FILTER (WHERE rating <> 0) AS rating_count,
+        COUNT(*) AS comment_count
+    FROM
+        comments
+    GROUP BY
+        station_id
+) c
+WHERE
+    c.station_id = s.id;
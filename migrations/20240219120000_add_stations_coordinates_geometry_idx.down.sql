@@ -0,0 +1 @@
+DROP INDEX IF EXISTS stations_coordinates_geometry_idx;
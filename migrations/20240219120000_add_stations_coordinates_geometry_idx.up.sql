@@ -0,0 +1,3 @@
+-- planar index for web mercator tiles: geography envelopes of low zoom tiles
+-- (spanning 180+ degrees of longitude) are not the tiles areas
+CREATE INDEX IF NOT EXISTS stations_coordinates_geometry_idx ON stations USING GIST ((coordinates::geometry));
@@ -0,0 +1,5 @@
+DROP INDEX IF EXISTS events_natural_key_idx;
+DROP INDEX IF EXISTS comments_natural_key_idx;
+DROP INDEX IF EXISTS chargers_natural_key_idx;
+
+DROP FUNCTION IF EXISTS jsonb_sorted_array(JSONB);
@@ -0,0 +1,165 @@
+-- sorted copy of a JSON array, chargers with the same ocpi ids in any order are the same
+CREATE OR REPLACE FUNCTION jsonb_sorted_array(value JSONB) RETURNS JSONB
+    LANGUAGE SQL IMMUTABLE STRICT PARALLEL SAFE
+    AS $$
+        SELECT COALESCE(jsonb_agg(element ORDER BY element), '[]'::jsonb) FROM jsonb_array_elements(value) AS element
+    $$;
+
+
+-- remove duplicates stored before the natural keys, the first stored row is kept
+DELETE FROM
+    events
+WHERE
+    id IN (
+        SELECT
+            id
+        FROM (
+            SELECT
+                id,
+                row_number() OVER (
+                    PARTITION BY
+                        station_id,
+                        source,
+                        COALESCE(name, ''),
+                        name IS NULL,
+                        COALESCE(is_problem::int, -1),
+                        date_trunc('minute', charged_at AT TIME ZONE 'UTC')
+                    ORDER BY
+                        id
+                ) AS n
+            FROM
+                events
+        ) e
+        WHERE
+            e.n > 1
+    );
+
+DELETE FROM
+    comments
+WHERE
+    id IN (
+        SELECT
+            id
+        FROM (
+            SELECT
+                id,
+                row_number() OVER (
+                    PARTITION BY
+                        station_id,
+                        source,
+                        md5(text),
+                        COALESCE(user_name, ''),
+                        user_name IS NULL,
+                        date_trunc('minute', created_at AT TIME ZONE 'UTC')
+                    ORDER BY
+                        id
+                ) AS n
+            FROM
+                comments
+            WHERE
+                created_at IS NOT NULL
+        ) c
+        WHERE
+            c.n > 1
+    );
+
+DELETE FROM
+    chargers
+WHERE
+    id IN (
+        SELECT
+            id
+        FROM (
+            SELECT
+                id,
+                row_number() OVER (
+                    PARTITION BY
+                        station_id,
+                        COALESCE(network, ''),
+                        network IS NULL,
+                        COALESCE(jsonb_sorted_array(ocpi_ids), 'null'::jsonb)
+                    ORDER BY
+                        id
+                ) AS n
+            FROM
+                chargers
+        ) ch
+        WHERE
+            ch.n > 1
+    );
+
+
+-- natural keys, duplicates are skipped on insert with ON CONFLICT DO NOTHING
+CREATE UNIQUE INDEX IF NOT EXISTS events_natural_key_idx ON events (
+    station_id,
+    source,
+    COALESCE(name, ''),
+    (name IS NULL),
+    COALESCE(is_problem::int, -1),
+    date_trunc('minute', charged_at AT TIME ZONE 'UTC')
+);
+
+CREATE UNIQUE INDEX IF NOT EXISTS comments_natural_key_idx ON comments (
+    station_id,
+    source,
+    md5(text),
+    COALESCE(user_name, ''),
+    (user_name IS NULL),
+    date_trunc('minute', created_at AT TIME ZONE 'UTC')
+);
+
+CREATE UNIQUE INDEX IF NOT EXISTS chargers_natural_key_idx ON chargers (
+    station_id,
+    COALESCE(network, ''),
+    (network IS NULL),
+    COALESCE(jsonb_sorted_array(ocpi_ids), 'null'::jsonb)
+);
+
+
+-- summaries counted the removed duplicates
+UPDATE
+    stations s
+SET
+    last_event_at = e.charged_at,
+    last_event = jsonb_build_object(
+        'charged_at', e.charged_at,
+        'source', e.source,
+        'name', e.name,
+        'is_problem', e.is_problem
+    )
+FROM (
+    SELECT DISTINCT ON (station_id)
+        station_id,
+        charged_at,
+        source,
+        name,
+        is_problem
+    FROM
+        events
+    ORDER BY
+        station_id,
+        charged_at DESC
+) e
+WHERE
+    e.station_id = s.id;
+
+
+UPDATE
+    stations s
+SET
+    rating_sum = c.rating_sum,
+    rating_count = c.rating_count,
+    comment_count = c.comment_count
+FROM (
+    SELECT
+        station_id,
+        COALESCE(SUM(rating) FILTER (WHERE rating <> 0), 0) AS rating_sum,
+        COUNT(rating) FILTER (WHERE rating <> 0) AS rating_count,
+        COUNT(*) AS comment_count
+    FROM
+        comments
+    GROUP BY
+        station_id
+) c
+WHERE
+    c.station_id = s.id;
@@ -0,0 +1,17 @@
+CREATE TABLE IF NOT EXISTS ingest_jobs (
+    id SERIAL PRIMARY KEY,
+    status TEXT NOT NULL DEFAULT 'pending',
+    payload JSONB NOT NULL,
+    stations_count INTEGER NOT NULL,
+    processed_count INTEGER NOT NULL DEFAULT 0,
+    stats JSONB NOT NULL DEFAULT '{}',
+    error TEXT,
+
+    created_at TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    started_at TIMESTAMPTZ,
+    finished_at TIMESTAMPTZ,
+    -- updated while the job is processed, running jobs without heartbeat are taken again
+    heartbeat_at TIMESTAMPTZ
+);
+-- workers look only for unfinished jobs
+CREATE INDEX IF NOT EXISTS ingest_jobs_unfinished_idx ON ingest_jobs (id) WHERE status IN ('pending', 'running');
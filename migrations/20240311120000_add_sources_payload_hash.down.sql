@@ -0,0 +1,2 @@
+ALTER TABLE sources
+    DROP COLUMN IF EXISTS payload_hash;
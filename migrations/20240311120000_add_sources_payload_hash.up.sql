@@ -0,0 +1,3 @@
+-- hash of the last ingested payload of the source station, unchanged stations are skipped on ingest
+ALTER TABLE sources
+    ADD COLUMN IF NOT EXISTS payload_hash TEXT;
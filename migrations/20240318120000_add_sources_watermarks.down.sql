@@ -0,0 +1,5 @@
+DROP INDEX IF EXISTS sources_source_station_inner_id_idx;
+
+ALTER TABLE sources
+    DROP COLUMN IF EXISTS events_watermark,
+    DROP COLUMN IF EXISTS comments_watermark;
@@ -0,0 +1,8 @@
+-- latest event / comment time ingested from the source station, older data is dropped on ingest;
+-- set by the first ingest after the migration as stored data isn't linked to the source inner id
+ALTER TABLE sources
+    ADD COLUMN IF NOT EXISTS events_watermark TIMESTAMPTZ,
+    ADD COLUMN IF NOT EXISTS comments_watermark TIMESTAMPTZ;
+
+-- watermarks are listed by source with keyset pagination on inner id
+CREATE INDEX IF NOT EXISTS sources_source_station_inner_id_idx ON sources (source, station_inner_id);
@@ -0,0 +1,4 @@
+DROP TRIGGER IF EXISTS comments_summary_insert_trigger ON comments;
+DROP TRIGGER IF EXISTS comments_summary_delete_trigger ON comments;
+
+DROP FUNCTION IF EXISTS update_stations_comments_summary();
@@ -0,0 +1,61 @@
+-- stations rating_sum, rating_count and comment_count follow inserted and deleted comments,
+-- one update per statement for all affected stations
+CREATE OR REPLACE FUNCTION update_stations_comments_summary() RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        UPDATE
+            stations s
+        SET
+            rating_sum = s.rating_sum + c.rating_sum,
+            rating_count = s.rating_count + c.rating_count,
+            comment_count = s.comment_count + c.comment_count
+        FROM (
+            SELECT
+                station_id,
+                COALESCE(SUM(rating) FILTER (WHERE rating <> 0), 0) AS rating_sum,
+                COUNT(rating) FILTER (WHERE rating <> 0) AS rating_count,
+                COUNT(*) AS comment_count
+            FROM
+                new_comments
+            GROUP BY
+                station_id
+        ) c
+        WHERE
+            c.station_id = s.id;
+    ELSE
+        UPDATE
+            stations s
+        SET
+            rating_sum = s.rating_sum - c.rating_sum,
+            rating_count = s.rating_count - c.rating_count,
+            comment_count = s.comment_count - c.comment_count
+        FROM (
+            SELECT
+                station_id,
+                COALESCE(SUM(rating) FILTER (WHERE rating <> 0), 0) AS rating_sum,
+                COUNT(rating) FILTER (WHERE rating <> 0) AS rating_count,
+                COUNT(*) AS comment_count
+            FROM
+                old_comments
+            GROUP BY
+                station_id
+        ) c
+        WHERE
+            c.station_id = s.id;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+
+CREATE TRIGGER comments_summary_insert_trigger
+    AFTER INSERT ON comments
+    REFERENCING NEW TABLE AS new_comments
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION update_stations_comments_summary();
+
+CREATE TRIGGER comments_summary_delete_trigger
+    AFTER DELETE ON comments
+    REFERENCING OLD TABLE AS old_comments
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION update_stations_comments_summary();
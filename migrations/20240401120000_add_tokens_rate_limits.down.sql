@@ -0,0 +1,5 @@
+DROP TABLE IF EXISTS rate_limit_counters;
+
+ALTER TABLE tokens
+    DROP COLUMN IF EXISTS rate_limit_per_second,
+    DROP COLUMN IF EXISTS rate_limit_burst;
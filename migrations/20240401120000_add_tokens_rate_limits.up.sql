@@ -0,0 +1,13 @@
+-- own rate limit of the api key, NULL - the default one from the app settings
+ALTER TABLE tokens
+    ADD COLUMN IF NOT EXISTS rate_limit_per_second REAL,
+    ADD COLUMN IF NOT EXISTS rate_limit_burst INTEGER;
+
+-- requests of the api key within the current window, shared by all app processes;
+-- losing it on a crash only resets the current windows; no foreign key:
+-- a removed api key is still counted while it is cached by the app
+CREATE UNLOGGED TABLE IF NOT EXISTS rate_limit_counters (
+    api_key TEXT PRIMARY KEY,
+    window_start TIMESTAMPTZ NOT NULL,
+    request_count INTEGER NOT NULL
+);
@@ -0,0 +1,23 @@
+ALTER TABLE events DROP CONSTRAINT IF EXISTS events_natural_key_excl;
+ALTER TABLE comments DROP CONSTRAINT IF EXISTS comments_natural_key_excl;
+
+-- rows closer than a minute are already unique, so are the ones in the same minute
+CREATE UNIQUE INDEX IF NOT EXISTS events_natural_key_idx ON events (
+    station_id,
+    source,
+    COALESCE(name, ''),
+    (name IS NULL),
+    COALESCE(is_problem::int, -1),
+    date_trunc('minute', charged_at AT TIME ZONE 'UTC')
+);
+
+CREATE UNIQUE INDEX IF NOT EXISTS comments_natural_key_idx ON comments (
+    station_id,
+    source,
+    md5(text),
+    COALESCE(user_name, ''),
+    (user_name IS NULL),
+    date_trunc('minute', created_at AT TIME ZONE 'UTC')
+);
+
+DROP EXTENSION IF EXISTS btree_gist;
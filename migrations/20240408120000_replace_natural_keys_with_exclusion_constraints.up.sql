@@ -0,0 +1,134 @@
+-- equality of the natural key columns in gist exclusion constraints
+CREATE EXTENSION IF NOT EXISTS btree_gist;
+
+
+-- remove duplicates closer than a minute that straddled a minute boundary, the first stored row is kept:
+-- a row is removed only when an earlier row it duplicates is kept itself, repeated until nothing is removed
+DO $$
+BEGIN
+    LOOP
+        DELETE FROM
+            events e
+        WHERE
+            EXISTS (
+                SELECT
+                    1
+                FROM
+                    events k
+                WHERE
+                    k.station_id = e.station_id
+                    AND k.source = e.source
+                    AND k.name IS NOT DISTINCT FROM e.name
+                    AND k.is_problem IS NOT DISTINCT FROM e.is_problem
+                    AND k.charged_at > e.charged_at - interval '1 minute'
+                    AND k.charged_at < e.charged_at + interval '1 minute'
+                    AND k.id < e.id
+                    AND NOT EXISTS (
+                        SELECT
+                            1
+                        FROM
+                            events p
+                        WHERE
+                            p.station_id = k.station_id
+                            AND p.source = k.source
+                            AND p.name IS NOT DISTINCT FROM k.name
+                            AND p.is_problem IS NOT DISTINCT FROM k.is_problem
+                            AND p.charged_at > k.charged_at - interval '1 minute'
+                            AND p.charged_at < k.charged_at + interval '1 minute'
+                            AND p.id < k.id
+                    )
+            );
+        EXIT WHEN NOT FOUND;
+    END LOOP;
+
+    LOOP
+        DELETE FROM
+            comments c
+        WHERE
+            c.created_at IS NOT NULL
+            AND EXISTS (
+                SELECT
+                    1
+                FROM
+                    comments k
+                WHERE
+                    k.station_id = c.station_id
+                    AND k.source = c.source
+                    AND k.text = c.text
+                    AND k.user_name IS NOT DISTINCT FROM c.user_name
+                    AND k.created_at > c.created_at - interval '1 minute'
+                    AND k.created_at < c.created_at + interval '1 minute'
+                    AND k.id < c.id
+                    AND NOT EXISTS (
+                        SELECT
+                            1
+                        FROM
+                            comments p
+                        WHERE
+                            p.station_id = k.station_id
+                            AND p.source = k.source
+                            AND p.text = k.text
+                            AND p.user_name IS NOT DISTINCT FROM k.user_name
+                            AND p.created_at > k.created_at - interval '1 minute'
+                            AND p.created_at < k.created_at + interval '1 minute'
+                            AND p.id < k.id
+                    )
+            );
+        EXIT WHEN NOT FOUND;
+    END LOOP;
+END
+$$;
+
+
+-- natural keys, rows closer than a minute overlap in the time ranges;
+-- duplicates are still skipped on insert with ON CONFLICT DO NOTHING;
+-- comments without created_at have no natural key, the range of a NULL time is unbounded and overlaps any other
+DROP INDEX IF EXISTS events_natural_key_idx;
+DROP INDEX IF EXISTS comments_natural_key_idx;
+
+ALTER TABLE events ADD CONSTRAINT events_natural_key_excl EXCLUDE USING gist (
+    station_id WITH =,
+    source WITH =,
+    (COALESCE(name, '')) WITH =,
+    ((name IS NULL)::int) WITH =,
+    (COALESCE(is_problem::int, -1)) WITH =,
+    tstzrange(charged_at - interval '30 seconds', charged_at + interval '30 seconds') WITH &&
+);
+
+ALTER TABLE comments ADD CONSTRAINT comments_natural_key_excl EXCLUDE USING gist (
+    station_id WITH =,
+    source WITH =,
+    (md5(text)) WITH =,
+    (COALESCE(user_name, '')) WITH =,
+    ((user_name IS NULL)::int) WITH =,
+    tstzrange(created_at - interval '30 seconds', created_at + interval '30 seconds') WITH &&
+) WHERE (created_at IS NOT NULL);
+
+
+-- summaries counted the removed duplicates, comments ones are kept by the trigger;
+-- last events timestamps are rendered in UTC whatever the session time zone, same as the ingest does
+UPDATE
+    stations s
+SET
+    last_event_at = e.charged_at,
+    last_event = jsonb_build_object(
+        'charged_at', to_char(e.charged_at AT TIME ZONE 'UTC', 'YYYY-MM-DD"T"HH24:MI:SS.US"Z"'),
+        'source', e.source,
+        'name', e.name,
+        'is_problem', e.is_problem
+    )
+FROM (
+    SELECT DISTINCT ON (station_id)
+        station_id,
+        charged_at,
+        source,
+        name,
+        is_problem
+    FROM
+        events
+    ORDER BY
+        station_id,
+        charged_at DESC
+) e
+WHERE
+    e.station_id = s.id;
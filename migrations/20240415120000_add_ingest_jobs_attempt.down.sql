@@ -0,0 +1 @@
+ALTER TABLE ingest_jobs DROP COLUMN IF EXISTS attempt;
@@ -0,0 +1,2 @@
+-- incremented every time the job is taken, only the worker of the last attempt may update the job
+ALTER TABLE ingest_jobs ADD COLUMN IF NOT EXISTS attempt INTEGER NOT NULL DEFAULT 0;
@@ -34,6 +34,61 @@ class AppSettings(BaseSettings):
 
     ADMIN_AUTH_TOKEN: str
 
+    # share of logged successful requests, errors are always logged
+    LOG_SUCCESS_SAMPLE_RATE: float = 1
+
+    # fetch stations with chargers, events and comments in one query; False - query each of them separately
+    SINGLE_QUERY_HYDRATION: bool = True
+
+    # max number of rendered vector tiles kept in memory (0 - disable cache) and their ttl:
+    # stations ingested by other app processes show up in cached tiles after it at the latest
+    TILE_CACHE_SIZE: int = 4096
+    TILE_CACHE_TTL_SECONDS: float = 60
+
+    # stations-by-area responses cache: max number of responses (0 - disable cache), their ttl
+    # and grid size in degrees the requested area corners are snapped outwards to
+    AREA_CACHE_SIZE: int = 1024
+    AREA_CACHE_TTL_SECONDS: float = 30
+    AREA_CACHE_GRID_SIZE: float = 0.001
+
+    # max number of station batches ingested at the same time, each holds a pg connection; 0 - unlimited
+    INGEST_CONCURRENCY: int = 2
+    # max number of stations read and checked for changes at once
+    INGEST_BATCH_SIZE: int = 500
+    # max number of advisory locks held by one ingest transaction: a station takes ~2-10 of them
+    # (its source and the geohash cells around it), so a batch is stored in transactions of ~25-120 stations;
+    # each lock takes a slot of the postgres lock table, INGEST_MAX_LOCKS x concurrent ingest transactions
+    # of all processes must stay well below max_locks_per_transaction x max_connections (64 x 100 by default)
+    INGEST_MAX_LOCKS: int = 256
+    # max size of one station line of the streamed NDJSON ingest
+    INGEST_NDJSON_MAX_LINE_BYTES: int = 1024 * 1024
+
+    # background ingest jobs: number of workers processing them (0 - no workers in this process),
+    # delay between checks for new jobs and time after which a running job without progress is taken again
+    INGEST_JOB_WORKERS: int = 1
+    INGEST_JOB_POLL_SECONDS: float = 1
+    INGEST_JOB_STALE_SECONDS: float = 300
+
+    # api keys request counts are buffered in memory and stored once per this period;
+    # 0 - count every request right away, api key checks are not cached then
+    TOKEN_USAGE_FLUSH_SECONDS: float = 10
+    # max number of cached api key checks (0 - disable cache) and their ttl:
+    # a removed api key keeps working up to TOKEN_CACHE_TTL_SECONDS, a new one is rejected
+    # up to TOKEN_CACHE_NEGATIVE_TTL_SECONDS if it was checked before being added
+    TOKEN_CACHE_SIZE: int = 10000
+    TOKEN_CACHE_TTL_SECONDS: float = 60
+    TOKEN_CACHE_NEGATIVE_TTL_SECONDS: float = 5
+
+    # rate limit of api keys without their own one in the tokens table: a bucket of RATE_LIMIT_BURST requests
+    # refilled with RATE_LIMIT_PER_SECOND requests per second; 0 - no limit, the default so that existing clients
+    # are not rejected after an upgrade: set it to limit all keys or set limits of single keys in the tokens table
+    RATE_LIMIT_PER_SECOND: float = 0
+    RATE_LIMIT_BURST: int = 20
+    # window of the per api key request counter in postgres shared by all app processes;
+    # each request allowed by the local bucket then costs a db round trip (an upsert of the counter row)
+    # on a pooled connection before the endpoint runs; 0 - each process limits requests on its own
+    RATE_LIMIT_SHARED_WINDOW_SECONDS: float = 0
+
     class Config:
         case_sensitive = False
 
@@ -1,15 +1,29 @@
+import asyncio
+
 import asyncpg
 from fastapi import FastAPI, Request, status
 from fastapi.encoders import jsonable_encoder
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from pydantic import ValidationError
-from starlette.middleware.base import BaseHTTPMiddleware
 
 from settings import AppSettings, PostgresSettings
-from src.api.middlewares.logger import logger_middleware
+from src.api.depends import create_ingest_jobs_service, create_stations_service, create_token_service
+from src.api.middlewares.logger import LoggerMiddleware
+from src.api.middlewares.metrics import MetricsMiddleware
+from src.api.middlewares.server_timing import ServerTimingMiddleware
+from src.api.routers.inner.ingest_jobs import router as inner_ingest_jobs_router
+from src.api.routers.inner.sources import router as inner_sources_router
 from src.api.routers.inner.stations import router as inner_stations_router
+from src.api.routers.metrics import router as metrics_router
 from src.api.routers.v1.stations import router as stations_router_v1
+from src.api.routers.v1.tiles import router as tiles_router_v1
+from src.repositories.postgres.instrumentation import InstrumentedPool
+from src.utils.area_cache import AreaCache
+from src.utils.rate_limiter import RateLimiter
+from src.utils.tile_cache import TileCache
+from src.utils.token_cache import TokenCache
+from src.utils.token_usage_buffer import TokenUsageBuffer
 
 
 def setup_middlewares(app: FastAPI) -> None:
@@ -25,7 +39,46 @@ def setup_middlewares(app: FastAPI) -> None:
 async def setup_pg_pool(app: FastAPI) -> None:
     pg_settings = PostgresSettings()
     pool = await asyncpg.create_pool(dsn=pg_settings.url)
-    app.state.pool = pool
+    app.state.pool = InstrumentedPool(pool)
+
+
+def start_ingest_workers(app: FastAPI, settings: AppSettings) -> None:
+    ingest_jobs_service = create_ingest_jobs_service(
+        state=app.state,
+        stations_service=create_stations_service(state=app.state)
+    )
+    app.state.ingest_workers = [
+        asyncio.create_task(ingest_jobs_service.run_worker(
+            poll_interval_seconds=settings.INGEST_JOB_POLL_SECONDS,
+            stale_seconds=settings.INGEST_JOB_STALE_SECONDS,
+        ))
+        for _ in range(settings.INGEST_JOB_WORKERS)
+    ]
+
+
+def start_token_usage_flusher(app: FastAPI, settings: AppSettings) -> None:
+    app.state.token_usage_flusher = None
+    if app.state.token_usage_buffer is not None:
+        app.state.token_usage_flusher = asyncio.create_task(
+            create_token_service(state=app.state).run_usage_flusher(
+                interval_seconds=settings.TOKEN_USAGE_FLUSH_SECONDS
+            )
+        )
+
+
+async def stop_token_usage_flusher(app: FastAPI) -> None:
+    # counts buffered since the last flush are stored before the pool is closed
+    if app.state.token_usage_flusher is not None:
+        app.state.token_usage_flusher.cancel()
+        await asyncio.gather(app.state.token_usage_flusher, return_exceptions=True)
+    await create_token_service(state=app.state).flush_usage()
+
+
+async def stop_ingest_workers(app: FastAPI) -> None:
+    # interrupted jobs are taken again once they become stale
+    for worker in app.state.ingest_workers:
+        worker.cancel()
+    await asyncio.gather(*app.state.ingest_workers, return_exceptions=True)
 
 
 def create_app(settings: AppSettings) -> FastAPI:
@@ -34,15 +87,46 @@ def create_app(settings: AppSettings) -> FastAPI:
         version=settings.VERSION,
     )
     app.state.admin_auth_token = settings.ADMIN_AUTH_TOKEN
+    app.state.single_query_hydration = settings.SINGLE_QUERY_HYDRATION
+    app.state.ingest_batch_size = settings.INGEST_BATCH_SIZE
+    app.state.ingest_max_locks = settings.INGEST_MAX_LOCKS
+    app.state.ingest_ndjson_max_line_bytes = settings.INGEST_NDJSON_MAX_LINE_BYTES
+    app.state.rate_limit_shared_window_seconds = settings.RATE_LIMIT_SHARED_WINDOW_SECONDS
 
     setup_middlewares(app)
 
     @app.on_event('startup')
     async def startup() -> None:
         await setup_pg_pool(app)
+        app.state.tile_cache = TileCache(
+            max_size=settings.TILE_CACHE_SIZE,
+            ttl_seconds=settings.TILE_CACHE_TTL_SECONDS,
+        ) if settings.TILE_CACHE_SIZE else None
+        app.state.area_cache = AreaCache(
+            max_size=settings.AREA_CACHE_SIZE,
+            ttl_seconds=settings.AREA_CACHE_TTL_SECONDS,
+            grid_size=settings.AREA_CACHE_GRID_SIZE,
+        ) if settings.AREA_CACHE_SIZE else None
+        app.state.ingest_semaphore = (
+            asyncio.Semaphore(settings.INGEST_CONCURRENCY) if settings.INGEST_CONCURRENCY else None
+        )
+        app.state.token_cache = TokenCache(
+            max_size=settings.TOKEN_CACHE_SIZE,
+            ttl_seconds=settings.TOKEN_CACHE_TTL_SECONDS,
+            negative_ttl_seconds=settings.TOKEN_CACHE_NEGATIVE_TTL_SECONDS,
+        ) if settings.TOKEN_CACHE_SIZE else None
+        app.state.token_usage_buffer = TokenUsageBuffer() if settings.TOKEN_USAGE_FLUSH_SECONDS else None
+        app.state.rate_limiter = RateLimiter(
+            default_rate_per_second=settings.RATE_LIMIT_PER_SECOND,
+            default_burst=settings.RATE_LIMIT_BURST,
+        )
+        start_ingest_workers(app, settings)
+        start_token_usage_flusher(app, settings)
 
     @app.on_event('shutdown')
     async def shutdown() -> None:
+        await stop_ingest_workers(app)
+        await stop_token_usage_flusher(app)
         await app.state.pool.close()
 
     @app.exception_handler(ValidationError)
@@ -53,6 +137,13 @@ def create_app(settings: AppSettings) -> FastAPI:
         )
 
     app.include_router(stations_router_v1)
+    app.include_router(tiles_router_v1)
     app.include_router(inner_stations_router)
-    app.add_middleware(BaseHTTPMiddleware, dispatch=logger_middleware)
+    app.include_router(inner_ingest_jobs_router)
+    app.include_router(inner_sources_router)
+    app.include_router(metrics_router)
+    app.add_middleware(LoggerMiddleware, success_sample_rate=settings.LOG_SUCCESS_SAMPLE_RATE)
+    app.add_middleware(MetricsMiddleware)
+    # outermost, so that the access log gets the timings
+    app.add_middleware(ServerTimingMiddleware, admin_auth_token=settings.ADMIN_AUTH_TOKEN)
     return app
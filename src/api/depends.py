@@ -1,12 +1,51 @@
-from fastapi import Request
+from fastapi import Depends, Request
+from starlette.datastructures import State
 
+from src.services.ingest_jobs import IngestJobsServices
 from src.services.stations import StationsServices
 from src.services.tokens import TokenServices
 
 
+def create_stations_service(state: State) -> StationsServices:
+    return StationsServices(
+        pool=state.pool,
+        single_query_hydration=state.single_query_hydration,
+        tile_cache=state.tile_cache,
+        area_cache=state.area_cache,
+        ingest_semaphore=state.ingest_semaphore,
+        ingest_batch_size=state.ingest_batch_size,
+        ingest_max_locks=state.ingest_max_locks,
+    )
+
+
+def create_ingest_jobs_service(state: State, stations_service: StationsServices) -> IngestJobsServices:
+    return IngestJobsServices(
+        pool=state.pool,
+        stations_service=stations_service,
+        batch_size=state.ingest_batch_size,
+    )
+
+
+def create_token_service(state: State) -> TokenServices:
+    return TokenServices(
+        pool=state.pool,
+        cache=state.token_cache,
+        usage_buffer=state.token_usage_buffer,
+        rate_limiter=state.rate_limiter,
+        rate_limit_shared_window_seconds=state.rate_limit_shared_window_seconds,
+    )
+
+
 async def get_stations_service(request: Request) -> StationsServices:
-    return StationsServices(pool=request.app.state.pool)
+    return create_stations_service(state=request.app.state)
+
+
+async def get_ingest_jobs_service(
+        request: Request,
+        stations_service: StationsServices = Depends(get_stations_service),
+) -> IngestJobsServices:
+    return create_ingest_jobs_service(state=request.app.state, stations_service=stations_service)
 
 
 async def get_token_service(request: Request) -> TokenServices:
-    return TokenServices(pool=request.app.state.pool)
+    return create_token_service(state=request.app.state)
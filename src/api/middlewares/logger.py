@@ -1,24 +1,59 @@
-from fastapi import Request
-from starlette.responses import Response
-
-from src.utils.logging.logger import logger
-
-
-async def logger_middleware(request: Request, call_next: callable) -> Response:
-    request_log = {
-        'method': request.method,
-        'url': request.url.path,
-        'query-params': dict(request.query_params),
-        'path_params': request.path_params,
-    }
-    logger.info("Request log", extra={"extra": request_log})
-
-    try:
-        response = await call_next(request)
-        response_log = {
-            'status': response.status_code,
-        }
-        logger.info("Response log", extra={"extra": response_log})
-        return response
-    except Exception as e:
-        logger.error(e, exc_info=True)
+import random
+import time
+from urllib.parse import parse_qsl
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.utils.logging.logger import logger
+from src.utils.timing import get_timings
+
+
+class LoggerMiddleware:
+    # one log record per request; errors are always logged,
+    # successful requests only with the `success_sample_rate` probability
+    def __init__(self, app: ASGIApp, success_sample_rate: float = 1) -> None:
+        self.app = app
+        self.success_sample_rate = success_sample_rate
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        started_at = time.perf_counter()
+        status_code = None
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message['type'] == 'http.response.start':
+                status_code = message['status']
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except Exception as e:
+            logger.error(e, exc_info=True, extra={'extra': self._get_request_log(scope, status_code, started_at)})
+            raise
+
+        if status_code is not None and status_code < 400 and random.random() >= self.success_sample_rate:
+            return
+        logger.info('Request log', extra={'extra': self._get_request_log(scope, status_code, started_at)})
+
+    @staticmethod
+    def _get_request_log(scope: Scope, status_code: int | None, started_at: float) -> dict:
+        # route is set by the router on the matched request
+        route = scope.get('route')
+        request_log = {
+            'method': scope['method'],
+            'url': scope['path'],
+            'route': getattr(route, 'path', None),
+            'query-params': dict(parse_qsl(scope['query_string'].decode('latin-1'))),
+            'path_params': scope.get('path_params', {}),
+            'status': status_code,
+            'duration_ms': round((time.perf_counter() - started_at) * 1000, 3),
+        }
+        # steps of the request if the server timing is on for it
+        timings = get_timings()
+        if timings is not None:
+            request_log['timings_ms'] = {name: round(duration * 1000, 3) for name, duration in timings.items()}
+        return request_log
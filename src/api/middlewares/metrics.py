@@ -0,0 +1,43 @@
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.utils.metrics import Histogram
+
+REQUEST_DURATION = Histogram(
+    'livechrg_request_duration_seconds',
+    'Duration of http requests by route template.',
+    label_names=('method', 'route', 'status'),
+)
+
+
+class MetricsMiddleware:
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        started_at = time.perf_counter()
+        # not sent response is an error
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message['type'] == 'http.response.start':
+                status_code = message['status']
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            # route is set by the router on the matched request, paths of unmatched ones are not labels
+            route = scope.get('route')
+            REQUEST_DURATION.observe(
+                time.perf_counter() - started_at,
+                scope['method'],
+                getattr(route, 'path', 'unmatched'),
+                str(status_code)
+            )
@@ -0,0 +1,44 @@
+import secrets
+import time
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.utils.timing import add_timing, format_server_timing, get_timings, start_timing, stop_timing
+
+SERVER_TIMING_REQUEST_HEADER = 'X-Server-Timing'
+
+
+class ServerTimingMiddleware:
+    # `Server-Timing` response header with the steps timed during the request;
+    # only for admin requests asking for it with the `X-Server-Timing` header
+    def __init__(self, app: ASGIApp, admin_auth_token: str) -> None:
+        self.app = app
+        self.admin_auth_token = admin_auth_token.encode()
+
+    def _is_enabled(self, scope: Scope) -> bool:
+        headers = Headers(scope=scope)
+        if SERVER_TIMING_REQUEST_HEADER not in headers:
+            return False
+        authorization = headers.get('Authorization', '').encode('latin-1')
+        return secrets.compare_digest(authorization, self.admin_auth_token)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope['type'] != 'http' or not self._is_enabled(scope):
+            await self.app(scope, receive, send)
+            return
+
+        started_at = time.perf_counter()
+
+        async def send_wrapper(message: Message) -> None:
+            if message['type'] == 'http.response.start':
+                # the body is already rendered by then
+                add_timing('total', time.perf_counter() - started_at)
+                MutableHeaders(scope=message).append('Server-Timing', format_server_timing(get_timings()))
+            await send(message)
+
+        token = start_timing()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            stop_timing(token)
@@ -0,0 +1,21 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.security import APIKeyHeader
+
+from src.api.depends import get_ingest_jobs_service
+from src.api.routers.inner.models import IngestJob
+from src.api.security import check_authorization_header
+from src.services.ingest_jobs import IngestJobsServices
+
+router = APIRouter(prefix='/inner/api', tags=['ingest-jobs'])
+
+
+@router.get('/ingest-jobs/{job_id}', response_model=IngestJob, include_in_schema=False)
+async def get_ingest_job(
+        job_id: int,
+        ingest_jobs_service: IngestJobsServices = Depends(get_ingest_jobs_service),
+        _: APIKeyHeader = Depends(check_authorization_header)
+) -> IngestJob:
+    job = await ingest_jobs_service.get_job(job_id=job_id)
+    if not job:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
+    return job
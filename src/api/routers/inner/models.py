@@ -1,4 +1,5 @@
 from datetime import datetime
+from enum import StrEnum, auto
 
 from pydantic import BaseModel
 
@@ -47,3 +48,59 @@ class AddStation(BaseModel):
 
 class AddStationsRequest(BaseModel):
     stations: list[AddStation]
+
+
+class IngestStats(BaseModel):
+    stations: int = 0
+    # stations with the same payload as the last ingested one
+    skipped: int = 0
+    # events and comments older than the source watermarks
+    outdated: int = 0
+    new_stations: int = 0
+    new_sources: int = 0
+    # stored rows, duplicates of the already stored ones are not counted
+    events: int = 0
+    comments: int = 0
+    chargers: int = 0
+
+    def add(self, other: 'IngestStats') -> None:
+        for field in type(self).model_fields:
+            setattr(self, field, getattr(self, field) + getattr(other, field))
+
+
+class AddStationsJobResponse(BaseModel):
+    job_id: int
+
+
+class IngestJobStatus(StrEnum):
+    pending = auto()
+    running = auto()
+    done = auto()
+    failed = auto()
+
+
+class IngestJob(BaseModel):
+    id: int
+    status: IngestJobStatus
+    stations_count: int
+    processed_count: int
+    stats: IngestStats
+    error: str | None = None
+    created_at: datetime
+    started_at: datetime | None = None
+    finished_at: datetime | None = None
+    # from the start till the finish or till now for the running job
+    duration_seconds: float | None = None
+
+
+class SourceWatermark(BaseModel):
+    inner_id: int
+    # latest ingested event / comment time, older data is dropped on ingest
+    events_watermark: datetime | None = None
+    comments_watermark: datetime | None = None
+
+
+class GetWatermarksResponse(BaseModel):
+    watermarks: list[SourceWatermark]
+    # pass as `after_inner_id` to get the next page, None on the last page
+    next_after_inner_id: int | None = None
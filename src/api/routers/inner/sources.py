@@ -0,0 +1,26 @@
+from fastapi import APIRouter, Depends, Query
+from fastapi.security import APIKeyHeader
+
+from src.api.depends import get_stations_service
+from src.api.routers.inner.models import GetWatermarksResponse
+from src.api.security import check_authorization_header
+from src.services.stations import StationsServices
+
+router = APIRouter(prefix='/inner/api', tags=['sources'])
+
+
+@router.get('/sources/{source}/watermarks', response_model=GetWatermarksResponse, include_in_schema=False)
+async def get_watermarks(
+        source: str,
+        after_inner_id: int = Query(-1),
+        limit: int = Query(1000, ge=1, le=10000),
+        stations_service: StationsServices = Depends(get_stations_service),
+        _: APIKeyHeader = Depends(check_authorization_header)
+) -> GetWatermarksResponse:
+    # scrapers request only data newer than the watermarks, pages are ordered by inner id
+    watermarks, next_after_inner_id = await stations_service.get_watermarks(
+        source=source,
+        after_inner_id=after_inner_id,
+        limit=limit
+    )
+    return GetWatermarksResponse(watermarks=watermarks, next_after_inner_id=next_after_inner_id)
@@ -1,19 +1,74 @@
-from fastapi import APIRouter, Depends, Response, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
 from fastapi.security import APIKeyHeader
+from pydantic import ValidationError
 
-from src.api.depends import get_stations_service
-from src.api.routers.inner.models import AddStationsRequest
+from src.api.depends import get_ingest_jobs_service, get_stations_service
+from src.api.routers.inner.models import AddStation, AddStationsJobResponse, AddStationsRequest, IngestStats
 from src.api.security import check_authorization_header
+from src.services.ingest_jobs import IngestJobsServices
 from src.services.stations import StationsServices
+from src.utils.ndjson import LineTooLongError, iter_ndjson_lines
 
 router = APIRouter(prefix='/inner/api', tags=['stations'])
 
 
-@router.post('/stations', status_code=status.HTTP_201_CREATED, include_in_schema=False)
+@router.post('/stations', status_code=status.HTTP_201_CREATED, response_model=IngestStats, include_in_schema=False)
 async def add_stations(
         request: AddStationsRequest,
+        # True - store stations in a background job, its id is returned with 202
+        background: bool = Query(False),
         stations_service: StationsServices = Depends(get_stations_service),
+        ingest_jobs_service: IngestJobsServices = Depends(get_ingest_jobs_service),
         _: APIKeyHeader = Depends(check_authorization_header)
 ) -> Response:
-    await stations_service.add_stations(stations=request.stations)
-    return Response(status_code=status.HTTP_201_CREATED)
+    if background:
+        job_id = await ingest_jobs_service.add_job(stations=request.stations)
+        return JSONResponse(
+            status_code=status.HTTP_202_ACCEPTED,
+            content=AddStationsJobResponse(job_id=job_id).model_dump()
+        )
+
+    stats = await stations_service.add_stations(stations=request.stations)
+    return JSONResponse(status_code=status.HTTP_201_CREATED, content=stats.model_dump())
+
+
+@router.post(
+    '/stations/ndjson',
+    status_code=status.HTTP_201_CREATED,
+    response_model=IngestStats,
+    include_in_schema=False
+)
+async def add_stations_ndjson(
+        request: Request,
+        stations_service: StationsServices = Depends(get_stations_service),
+        _: APIKeyHeader = Depends(check_authorization_header)
+) -> IngestStats:
+    # one station per line, stations are stored by batches while the body is being read;
+    # on invalid line batches stored before it are kept and reported in the error
+    stats = IngestStats()
+    batch = []
+    lines = iter_ndjson_lines(request.stream(), max_line_bytes=request.app.state.ingest_ndjson_max_line_bytes)
+    try:
+        async for line_number, line in lines:
+            try:
+                batch.append(AddStation.model_validate_json(line))
+            except ValidationError as e:
+                raise HTTPException(
+                    status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                    detail={'line': line_number, 'errors': jsonable_encoder(e.errors()), 'stored': stats.model_dump()}
+                ) from e
+
+            if len(batch) == stations_service.ingest_batch_size:
+                stats.add(await stations_service.add_stations(stations=batch))
+                batch = []
+    except LineTooLongError as e:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail={'error': str(e), 'stored': stats.model_dump()}
+        ) from e
+
+    if batch:
+        stats.add(await stations_service.add_stations(stations=batch))
+    return stats
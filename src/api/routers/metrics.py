@@ -0,0 +1,55 @@
+from fastapi import APIRouter, Depends, Request
+from fastapi.responses import PlainTextResponse
+from fastapi.security import APIKeyHeader
+from starlette.datastructures import State
+
+from src.api.security import check_authorization_header
+from src.utils.metrics import REGISTRY, Counter, Gauge, Metric, render_metrics
+
+router = APIRouter(tags=['metrics'])
+
+
+def _get_state_metrics(state: State) -> list[Metric]:
+    # values kept by the app objects themselves, read on scrape only
+    pool_connections = Gauge(
+        'livechrg_pg_pool_connections', 'Pool connections by state.', label_names=('state',), registry=None
+    )
+    pool_connections.set(state.pool.get_size(), 'open')
+    pool_connections.set(state.pool.get_idle_size(), 'idle')
+    pool_connections.set(state.pool.get_max_size(), 'max')
+    pool_waiting = Gauge('livechrg_pg_pool_waiting', 'Requests waiting for a pool connection.', registry=None)
+    pool_waiting.set(getattr(state.pool, 'waiting', 0))
+
+    cache_hits = Counter('livechrg_cache_hits_total', 'Cache hits.', label_names=('cache',), registry=None)
+    cache_misses = Counter('livechrg_cache_misses_total', 'Cache misses.', label_names=('cache',), registry=None)
+    cache_hit_ratio = Gauge(
+        'livechrg_cache_hit_ratio', 'Share of cache hits since start.', label_names=('cache',), registry=None
+    )
+    cache_size = Gauge('livechrg_cache_size', 'Number of cache entries.', label_names=('cache',), registry=None)
+    for name, cache in (('tile', state.tile_cache), ('area', state.area_cache), ('token', state.token_cache)):
+        if cache is None:
+            continue
+        cache_hits.inc(name, value=cache.hits)
+        cache_misses.inc(name, value=cache.misses)
+        if cache.hits + cache.misses:
+            cache_hit_ratio.set(cache.hits / (cache.hits + cache.misses), name)
+        cache_size.set(len(cache), name)
+
+    rate_limited = Counter(
+        'livechrg_rate_limited_requests_total', 'Requests rejected by the rate limit.', registry=None
+    )
+    rate_limited.inc(value=state.rate_limiter.rejected)
+
+    return [pool_connections, pool_waiting, cache_hits, cache_misses, cache_hit_ratio, cache_size, rate_limited]
+
+
+@router.get('/metrics', response_class=PlainTextResponse, include_in_schema=False)
+async def get_metrics(
+        request: Request,
+        _: APIKeyHeader = Depends(check_authorization_header)
+) -> PlainTextResponse:
+    # prometheus text format
+    return PlainTextResponse(
+        render_metrics([*REGISTRY, *_get_state_metrics(request.app.state)]),
+        media_type='text/plain; version=0.0.4'
+    )
@@ -60,14 +60,24 @@ class Source(BaseModel):
     inner_id: int
 
 
+class StationsResponseMode(StrEnum):
+    # station with chargers, events and comments
+    full = auto()
+    # station without chargers, events and comments (they are None), with comment_count instead
+    summary = auto()
+
+
 class Station(BaseModel):
     coordinates: Coordinates
     sources: list[Source]
-    chargers: list[Charger]
-    events: list[Event]
-    comments: list[Comment]
+    chargers: list[Charger] | None = None
+    events: list[Event] | None = None
+    comments: list[Comment] | None = None
     last_event: Event | None = None
     average_rating: float | None = None
+    comment_count: int | None = None
+    # distance in meters to the requested point
+    distance: float | None = None
     geo: dict | None = None
     address: str | None = None
     ocpi_ids: list[str] | None = None
@@ -75,6 +85,34 @@ class Station(BaseModel):
 
 class GetStationsByAreaResponse(BaseModel):
     stations: list[Station]
+    next_cursor: str | None = None
+
+
+class GetStationsNearbyResponse(BaseModel):
+    stations: list[Station]
+
+
+class StationKey(BaseModel):
+    source: SourceName
+    inner_id: int
+
+
+class LookupStationsRequest(BaseModel):
+    stations: list[StationKey] = Field(max_length=1000)
+
+
+class LookupStationsResponse(BaseModel):
+    # found stations by "{source}:{inner_id}" keys
+    stations: dict[str, Station]
+
+
+class StationCluster(BaseModel):
+    coordinates: Coordinates
+    count: int
+
+
+class GetStationClustersResponse(BaseModel):
+    clusters: list[StationCluster]
 
 
 # add stations
@@ -2,41 +2,116 @@ from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from fastapi.security import APIKeyHeader
 
 from src.api.depends import get_stations_service
-from src.api.routers.v1.models import AddStationsRequest, AreaRequest, GetStationsByAreaResponse, SourceName, Station
+from src.api.routers.v1.models import (
+    AddStationsRequest,
+    AreaRequest,
+    GetStationClustersResponse,
+    GetStationsByAreaResponse,
+    GetStationsNearbyResponse,
+    LookupStationsRequest,
+    LookupStationsResponse,
+    SourceName,
+    Station,
+    StationsResponseMode,
+)
 from src.api.security import check_authorization_header
 from src.services.stations import StationsServices
+from src.utils.cursor import decode_cursor
+from src.utils.tile_cache import MAX_ZOOM
 
 router = APIRouter(prefix='/api/v1', tags=['stations'])
 
 
-@router.get('/stations-by-area')
+@router.get('/stations-by-area', response_model=GetStationsByAreaResponse)
 async def get_stations_by_area(
-        limit: int = Query(10, le=10),
-        offset: int = Query(0),
+        limit: int = Query(10, ge=1, le=10),
+        offset: int = Query(0, ge=0),
+        cursor: str | None = Query(None),
+        events_limit: int | None = Query(None, ge=1),
+        comments_limit: int | None = Query(None, ge=1),
+        mode: StationsResponseMode = Query(StationsResponseMode.full),
         area: AreaRequest = Depends(),
         stations_service: StationsServices = Depends(get_stations_service),
         _: APIKeyHeader = Depends(check_authorization_header)
-) -> GetStationsByAreaResponse:
-    stations = await stations_service.get_by_area(
+) -> Response:
+    after_id = 0
+    if cursor:
+        # cursor pages start right after the previous page, an offset would skip stations
+        if offset:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail='Offset cannot be used with cursor'
+            )
+        try:
+            after_id = decode_cursor(cursor)
+        except ValueError as e:
+            raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail='Invalid cursor') from e
+
+    content = await stations_service.get_by_area_response(
         limit=limit,
         offset=offset,
         area=area,
+        after_id=after_id,
+        events_limit=events_limit,
+        comments_limit=comments_limit,
+        mode=mode,
+    )
+    return Response(content=content, media_type='application/json')
+
+
+@router.get('/stations-nearby')
+async def get_stations_nearby(
+        lat: float = Query(ge=-90, le=90),
+        lon: float = Query(ge=-180, le=180),
+        limit: int = Query(10, ge=1, le=10),
+        events_limit: int | None = Query(None, ge=1),
+        comments_limit: int | None = Query(None, ge=1),
+        stations_service: StationsServices = Depends(get_stations_service),
+        _: APIKeyHeader = Depends(check_authorization_header)
+) -> GetStationsNearbyResponse:
+    stations = await stations_service.get_nearby(
+        lat=lat,
+        lon=lon,
+        limit=limit,
+        events_limit=events_limit,
+        comments_limit=comments_limit,
     )
-    return GetStationsByAreaResponse(
+    return GetStationsNearbyResponse(
         stations=stations
     )
 
 
+@router.get('/station-clusters')
+async def get_station_clusters(
+        zoom: int = Query(ge=0, le=MAX_ZOOM),
+        limit: int = Query(500, ge=1, le=1000),
+        area: AreaRequest = Depends(),
+        stations_service: StationsServices = Depends(get_stations_service),
+        _: APIKeyHeader = Depends(check_authorization_header)
+) -> GetStationClustersResponse:
+    clusters = await stations_service.get_clusters(
+        area=area,
+        zoom=zoom,
+        limit=limit,
+    )
+    return GetStationClustersResponse(
+        clusters=clusters
+    )
+
+
 @router.get('/stations')
 async def get_station_by_source_and_inner_id(
         station_source: SourceName,
         station_inner_id: int,
+        events_limit: int | None = Query(None, ge=1),
+        comments_limit: int | None = Query(None, ge=1),
         stations_service: StationsServices = Depends(get_stations_service),
         _: APIKeyHeader = Depends(check_authorization_header)
 ) -> Station:
     station = await stations_service.get_by_source_and_inner_id(
         station_source=station_source,
-        station_inner_id=station_inner_id
+        station_inner_id=station_inner_id,
+        events_limit=events_limit,
+        comments_limit=comments_limit,
     )
     if not station:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
@@ -44,6 +119,27 @@ async def get_station_by_source_and_inner_id(
     return station
 
 
+@router.post('/stations/lookup')
+async def lookup_stations(
+        request: LookupStationsRequest,
+        events_limit: int | None = Query(None, ge=1),
+        comments_limit: int | None = Query(None, ge=1),
+        stations_service: StationsServices = Depends(get_stations_service),
+        _: APIKeyHeader = Depends(check_authorization_header)
+) -> LookupStationsResponse:
+    stations = await stations_service.get_by_sources(
+        sources=[(station.source, station.inner_id) for station in request.stations],
+        events_limit=events_limit,
+        comments_limit=comments_limit,
+    )
+    return LookupStationsResponse(
+        stations={
+            f'{source}:{inner_id}': station
+            for (source, inner_id), station in stations.items()
+        }
+    )
+
+
 @router.post('/stations', status_code=status.HTTP_201_CREATED, include_in_schema=False)
 async def add_stations(
         request: AddStationsRequest,
@@ -0,0 +1,30 @@
+from fastapi import APIRouter, Depends, HTTPException, Path, Response, status
+from fastapi.security import APIKeyHeader
+
+from src.api.depends import get_stations_service
+from src.api.security import check_authorization_header
+from src.services.stations import StationsServices
+from src.utils.tile_cache import MAX_ZOOM
+
+router = APIRouter(prefix='/api/v1', tags=['tiles'])
+
+MVT_MEDIA_TYPE = 'application/vnd.mapbox-vector-tile'
+
+
+@router.get(
+    '/tiles/{z}/{x}/{y}.mvt',
+    response_class=Response,
+    responses={status.HTTP_200_OK: {'content': {MVT_MEDIA_TYPE: {}}}},
+)
+async def get_stations_tile(
+        z: int = Path(ge=0, le=MAX_ZOOM),
+        x: int = Path(ge=0),
+        y: int = Path(ge=0),
+        stations_service: StationsServices = Depends(get_stations_service),
+        _: APIKeyHeader = Depends(check_authorization_header)
+) -> Response:
+    if x >= 2 ** z or y >= 2 ** z:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
+
+    tile = await stations_service.get_tile(z=z, x=x, y=y)
+    return Response(content=tile, media_type=MVT_MEDIA_TYPE)
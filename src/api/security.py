@@ -1,3 +1,4 @@
+import math
 import secrets
 
 from fastapi import Depends, HTTPException, Request, status
@@ -23,8 +24,17 @@ async def check_authorization_header(
     if secrets.compare_digest(authorization, request.app.state.admin_auth_token):
         return authorization
 
-    if await token_service.is_existing_token(authorization):
-        return authorization
-    raise HTTPException(
-        status_code=status.HTTP_403_FORBIDDEN, detail='Invalid authorization header'
-    )
+    is_existing, retry_after = await token_service.check_token(authorization)
+    if not is_existing:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN, detail='Invalid authorization header'
+        )
+
+    # rejected before the endpoint gets a db connection
+    if retry_after:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail='Rate limit exceeded',
+            headers={'Retry-After': str(math.ceil(retry_after))}
+        )
+    return authorization
@@ -0,0 +1,27 @@
+# usage: python -m src.commands.backfill_comments_summaries [batch_size]
+# recalculates stations rating_sum, rating_count and comment_count from their comments,
+# safe to run on a live database: every batch is a short transaction
+import asyncio
+import sys
+
+import asyncpg
+
+from settings import PostgresSettings
+from src.repositories.postgres.stations import StationsRepository
+
+
+async def main() -> None:
+    batch_size = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    pool = await asyncpg.create_pool(dsn=PostgresSettings().url)
+    try:
+        stations_repo = StationsRepository(pool=pool)
+        after_id = 0
+        while (last_id := await stations_repo.recalculate_comments_summaries(after_id=after_id, limit=batch_size)):
+            after_id = last_id
+            sys.stdout.write(f'recalculated stations up to id {after_id}\n')
+    finally:
+        await pool.close()
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -3,7 +3,10 @@ from collections import defaultdict
 
 import asyncpg
 
+from src.repositories.postgres.instrumentation import instrument_repository
 
+
+@instrument_repository
 class ChargersRepository:
     def __init__(self, pool: asyncpg.Pool) -> None:
         self.pool = pool
@@ -32,25 +35,31 @@ class ChargersRepository:
             res[row['station_id']].append(row)
         return res
 
-    async def add_charger(
+    async def add_chargers(
         self,
-        station_id: int,
-        ocpi_ids: dict | None = None,
-        network: str | None = None
-    ) -> None:
-        async with self.pool.acquire() as conn:
-            query = """
-                INSERT INTO chargers (
-                    station_id,
-                    ocpi_ids,
-                    network
-                )
-                VALUES
-                    ($1, $2, $3)
-            """
-            await conn.execute(
-                query,
+        conn: asyncpg.Connection,
+        chargers: list[tuple[int, list[str] | None, str | None]]
+    ) -> int:
+        # rows are (station_id, ocpi_ids, network), returns the number of inserted ones
+        query = """
+            INSERT INTO chargers (
                 station_id,
-                json.dumps(ocpi_ids) if ocpi_ids else None,
+                ocpi_ids,
                 network
             )
+            SELECT
+                station_id,
+                ocpi_ids::jsonb,
+                network
+            FROM
+                unnest($1::integer[], $2::text[], $3::text[]) AS ch(station_id, ocpi_ids, network)
+            ON CONFLICT DO NOTHING
+        """
+        status = await conn.execute(
+            query,
+            [station_id for station_id, _, _ in chargers],
+            [json.dumps(ocpi_ids) if ocpi_ids else None for _, ocpi_ids, _ in chargers],
+            [network for _, _, network in chargers]
+        )
+        # command tag is `INSERT 0 <count>`
+        return int(status.split()[-1])
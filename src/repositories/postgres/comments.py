@@ -3,7 +3,10 @@ from datetime import datetime
 
 import asyncpg
 
+from src.repositories.postgres.instrumentation import instrument_repository
 
+
+@instrument_repository
 class CommentsRepository:
     def __init__(self, pool: asyncpg.Pool) -> None:
         self.pool = pool
@@ -11,60 +14,73 @@ class CommentsRepository:
     async def get_by_station_ids(
             self,
             station_ids: list[int],
+            limit: int | None = None,
     ) -> dict[int, list[asyncpg.Record]]:
+        # newest `limit` comments of each station (all comments if limit is None)
         query = """
             SELECT
                 c.text,
                 c.user_name,
                 c.source,
                 c.created_at,
-                c.station_id,
-                c.rating
+                c.station_id
             FROM
-                comments c
-            WHERE
-                c.station_id = ANY($1)
+                unnest($1::integer[]) AS st(id)
+            CROSS JOIN LATERAL (
+                SELECT
+                    *
+                FROM
+                    comments
+                WHERE
+                    station_id = st.id
+                ORDER BY
+                    created_at DESC
+                LIMIT
+                    $2
+            ) c
             ORDER BY
                 c.created_at DESC
         """
         async with self.pool.acquire() as conn:
             rows = await conn.fetch(
                 query,
-                station_ids
+                station_ids,
+                limit
             )
         res = defaultdict(list)
         for row in rows:
             res[row['station_id']].append(row)
         return res
 
-    async def add_comment(
+    async def add_comments(
         self,
-        station_id: int,
-        text: str,
-        source: str,
-        created_at: datetime,
-        user_name: str | None = None,
-        rating: int = None,
-    ) -> None:
-        async with self.pool.acquire() as conn:
-            query = """
-                INSERT INTO comments (
-                    station_id,
-                    text,
-                    created_at,
-                    user_name,
-                    source,
-                    rating
-                )
-                VALUES
-                    ($1, $2, $3, $4, $5, $6)
-            """
-            await conn.execute(
-                query,
+        conn: asyncpg.Connection,
+        comments: list[tuple[int, str, str, datetime, str | None, int | None]]
+    ) -> int:
+        # rows are (station_id, text, source, created_at, user_name, rating), returns the number of inserted ones
+        query = """
+            INSERT INTO comments (
                 station_id,
                 text,
+                source,
                 created_at,
                 user_name,
-                source,
                 rating
             )
+            SELECT
+                *
+            FROM
+                unnest($1::integer[], $2::text[], $3::text[], $4::timestamptz[], $5::text[], $6::integer[])
+            ON CONFLICT DO NOTHING
+        """
+        status = await conn.execute(
+            query,
+            [station_id for station_id, *_ in comments],
+            [text for _, text, *_ in comments],
+            [source for _, _, source, *_ in comments],
+            [created_at for _, _, _, created_at, *_ in comments],
+            [user_name for *_, user_name, _ in comments],
+            [rating for *_, rating in comments]
+        )
+        # command tag is `INSERT 0 <count>`
+        return int(status.split()[-1])
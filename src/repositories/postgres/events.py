@@ -3,7 +3,10 @@ from datetime import datetime
 
 import asyncpg
 
+from src.repositories.postgres.instrumentation import instrument_repository
 
+
+@instrument_repository
 class EventsRepository:
     def __init__(self, pool: asyncpg.Pool) -> None:
         self.pool = pool
@@ -11,7 +14,9 @@ class EventsRepository:
     async def get_by_station_ids(
             self,
             station_ids: list[int],
+            limit: int | None = None,
     ) -> dict[int, list[asyncpg.Record]]:
+        # newest `limit` events of each station (all events if limit is None)
         query = """
             SELECT
                 e.name,
@@ -20,47 +25,64 @@ class EventsRepository:
                 e.station_id,
                 e.is_problem
             FROM
-                events e
-            WHERE
-                e.station_id = ANY($1)
+                unnest($1::integer[]) AS st(id)
+            CROSS JOIN LATERAL (
+                SELECT
+                    *
+                FROM
+                    events
+                WHERE
+                    station_id = st.id
+                ORDER BY
+                    charged_at DESC
+                LIMIT
+                    $2
+            ) e
             ORDER BY
                 e.charged_at DESC
         """
         async with self.pool.acquire() as conn:
             rows = await conn.fetch(
                 query,
-                station_ids
+                station_ids,
+                limit
             )
         res = defaultdict(list)
         for row in rows:
             res[row['station_id']].append(row)
         return res
 
-    async def add_event(
+    async def add_events(
         self,
-        station_id: int,
-        source: str,
-        charged_at: datetime,
-        is_problem: bool,
-        name: str | None
-    ) -> None:
-        async with self.pool.acquire() as conn:
-            query = """
-                INSERT INTO events (
-                    station_id,
-                    source,
-                    charged_at,
-                    name,
-                    is_problem
-                )
-                VALUES
-                    ($1, $2, $3, $4, $5)
-            """
-            await conn.execute(
-                query,
+        conn: asyncpg.Connection,
+        events: list[tuple[int, str, datetime, bool, str | None]]
+    ) -> list[asyncpg.Record]:
+        # rows are (station_id, source, charged_at, is_problem, name), returns the inserted ones
+        query = """
+            INSERT INTO events (
                 station_id,
                 source,
                 charged_at,
-                name,
-                is_problem
+                is_problem,
+                name
             )
+            SELECT
+                *
+            FROM
+                unnest($1::integer[], $2::text[], $3::timestamptz[], $4::boolean[], $5::text[])
+            ON CONFLICT DO NOTHING
+            RETURNING
+                station_id,
+                source,
+                charged_at,
+                is_problem,
+                name
+        """
+        return await conn.fetch(
+            query,
+            [station_id for station_id, *_ in events],
+            [source for _, source, *_ in events],
+            [charged_at for _, _, charged_at, *_ in events],
+            [is_problem for *_, is_problem, _ in events],
+            [name for *_, name in events]
+        )
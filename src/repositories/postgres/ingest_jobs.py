@@ -0,0 +1,150 @@
+import asyncpg
+
+from src.repositories.postgres.instrumentation import instrument_repository
+
+
+@instrument_repository
+class IngestJobsRepository:
+    def __init__(self, pool: asyncpg.Pool) -> None:
+        self.pool = pool
+
+    async def add_job(self, payload: str, stations_count: int) -> int:
+        query = """
+            INSERT INTO
+                ingest_jobs (
+                    payload,
+                    stations_count
+                )
+            VALUES
+                ($1, $2)
+            RETURNING id;
+        """
+        async with self.pool.acquire() as conn:
+            row = await conn.fetchrow(
+                query,
+                payload,
+                stations_count
+            )
+        return row['id']
+
+    async def get_by_id(self, job_id: int) -> asyncpg.Record | None:
+        query = """
+            SELECT
+                id,
+                status,
+                stations_count,
+                processed_count,
+                stats,
+                error,
+                created_at,
+                started_at,
+                finished_at
+            FROM
+                ingest_jobs
+            WHERE
+                id = $1;
+        """
+        async with self.pool.acquire() as conn:
+            return await conn.fetchrow(query, job_id)
+
+    async def take_job(self, stale_seconds: float) -> asyncpg.Record | None:
+        # oldest pending job or the running one abandoned by a stopped worker,
+        # jobs being taken by other workers right now are skipped
+        query = """
+            UPDATE
+                ingest_jobs
+            SET
+                status = 'running',
+                started_at = COALESCE(started_at, now()),
+                heartbeat_at = now(),
+                attempt = attempt + 1
+            WHERE
+                id = (
+                    SELECT
+                        id
+                    FROM
+                        ingest_jobs
+                    WHERE
+                        status = 'pending' OR
+                        status = 'running' AND heartbeat_at < now() - make_interval(secs => $1)
+                    ORDER BY
+                        id
+                    LIMIT
+                        1
+                    FOR UPDATE SKIP LOCKED
+                )
+            RETURNING
+                id,
+                attempt,
+                payload,
+                processed_count,
+                stats;
+        """
+        async with self.pool.acquire() as conn:
+            return await conn.fetchrow(query, stale_seconds)
+
+    async def touch_job(self, job_id: int, attempt: int) -> bool:
+        # False if the job was taken again by another worker
+        query = """
+            UPDATE
+                ingest_jobs
+            SET
+                heartbeat_at = now()
+            WHERE
+                id = $1 AND
+                attempt = $2 AND
+                status = 'running';
+        """
+        async with self.pool.acquire() as conn:
+            status = await conn.execute(query, job_id, attempt)
+        # command tag is `UPDATE <count>`
+        return status != 'UPDATE 0'
+
+    async def update_progress(self, job_id: int, attempt: int, processed_count: int, stats: str) -> bool:
+        # False if the job was taken again by another worker
+        query = """
+            UPDATE
+                ingest_jobs
+            SET
+                processed_count = $3,
+                stats = $4,
+                heartbeat_at = now()
+            WHERE
+                id = $1 AND
+                attempt = $2 AND
+                status = 'running';
+        """
+        async with self.pool.acquire() as conn:
+            status = await conn.execute(
+                query,
+                job_id,
+                attempt,
+                processed_count,
+                stats
+            )
+        return status != 'UPDATE 0'
+
+    async def finish_job(self, job_id: int, attempt: int, status: str, error: str | None = None) -> bool:
+        # payload of the done job is not needed anymore; False if the job was taken again by another worker
+        query = """
+            UPDATE
+                ingest_jobs
+            SET
+                status = $3,
+                error = $4,
+                payload = CASE WHEN $3 = 'done' THEN '[]' ELSE payload END,
+                finished_at = now()
+            WHERE
+                id = $1 AND
+                attempt = $2 AND
+                status = 'running';
+        """
+        async with self.pool.acquire() as conn:
+            command_status = await conn.execute(
+                query,
+                job_id,
+                attempt,
+                status,
+                error
+            )
+        return command_status != 'UPDATE 0'
@@ -0,0 +1,95 @@
+import functools
+import inspect
+import time
+from collections.abc import Awaitable, Callable, Generator
+from typing import Any, TypeVar
+
+import asyncpg
+
+from src.utils.metrics import Histogram
+from src.utils.timing import add_timing
+
+_T = TypeVar('_T')
+
+QUERY_DURATION = Histogram(
+    'livechrg_query_duration_seconds',
+    'Duration of repository methods, including waiting for a pool connection.',
+    label_names=('method',),
+)
+POOL_ACQUIRE_DURATION = Histogram(
+    'livechrg_pg_pool_acquire_duration_seconds',
+    'Time spent waiting for a pool connection.',
+)
+
+
+class _AcquireContext:
+    # same as asyncpg `Pool.acquire` result: either awaited for a connection released by the caller,
+    # or used as an async context manager releasing it on exit
+    def __init__(self, pool: 'InstrumentedPool', timeout: float | None) -> None:
+        self._pool = pool
+        self._timeout = timeout
+        self._conn: asyncpg.Connection | None = None
+
+    async def _acquire(self) -> asyncpg.Connection:
+        started_at = time.perf_counter()
+        self._pool.waiting += 1
+        try:
+            conn = await self._pool.pool.acquire(timeout=self._timeout)
+        finally:
+            self._pool.waiting -= 1
+        duration = time.perf_counter() - started_at
+        POOL_ACQUIRE_DURATION.observe(duration)
+        add_timing('pg_acquire', duration)
+        return conn
+
+    def __await__(self) -> Generator[Any, None, asyncpg.Connection]:
+        return self._acquire().__await__()
+
+    async def __aenter__(self) -> asyncpg.Connection:
+        self._conn = await self._acquire()
+        return self._conn
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        conn, self._conn = self._conn, None
+        await self._pool.release(conn)
+
+
+class InstrumentedPool:
+    # asyncpg pool measuring how long connections are waited for,
+    # everything except `acquire` and `release` goes to the wrapped pool as is
+    def __init__(self, pool: asyncpg.Pool) -> None:
+        self.pool = pool
+        # number of `acquire` calls waiting for a connection
+        self.waiting = 0
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.pool, name)
+
+    def acquire(self, *, timeout: float | None = None) -> _AcquireContext:
+        return _AcquireContext(pool=self, timeout=timeout)
+
+    async def release(self, connection: asyncpg.Connection, *, timeout: float | None = None) -> None:
+        await self.pool.release(connection, timeout=timeout)
+
+
+def _observe_duration(method: Callable[..., Awaitable[_T]], label: str) -> Callable[..., Awaitable[_T]]:
+    @functools.wraps(method)
+    async def wrapper(*args: Any, **kwargs: Any) -> _T:
+        started_at = time.perf_counter()
+        try:
+            return await method(*args, **kwargs)
+        finally:
+            duration = time.perf_counter() - started_at
+            QUERY_DURATION.observe(duration, label)
+            add_timing(label, duration)
+
+    return wrapper
+
+
+def instrument_repository(cls: type[_T]) -> type[_T]:
+    # durations of all public async methods labeled as `Class.method`,
+    # also reported to the request timing if it's on
+    for name, method in list(vars(cls).items()):
+        if not name.startswith('_') and inspect.iscoroutinefunction(method):
+            setattr(cls, name, _observe_duration(method, label=f'{cls.__name__}.{name}'))
+    return cls
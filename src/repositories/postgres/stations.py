@@ -1,10 +1,86 @@
 import json
+from datetime import datetime
 
 import asyncpg
 
 from src.api.routers.v1.models import SourceName
+from src.repositories.postgres.instrumentation import instrument_repository
 
 
+def _utc_json_timestamp(column: str) -> str:
+    # json renders timestamptz in the session time zone, datetimes fetched by asyncpg are in UTC
+    return f"""to_char({column} AT TIME ZONE 'UTC', 'YYYY-MM-DD"T"HH24:MI:SS.US"Z"')"""
+
+
+def _extra_data_columns(events_limit_param: str, comments_limit_param: str) -> str:
+    # chargers, events and comments of station `s` aggregated into json arrays,
+    # so station can be fetched with all extra data in one query;
+    # events and comments are limited to the newest N (NULL - no limit) with the given query params
+    return f""",
+        (
+            SELECT
+                COALESCE(json_agg(json_build_object(
+                    'network', ch.network,
+                    'ocpi_ids', ch.ocpi_ids::text
+                )), '[]')
+            FROM
+                chargers ch
+            WHERE
+                ch.station_id = s.id
+        ) AS chargers,
+        (
+            SELECT
+                COALESCE(json_agg(json_build_object(
+                    'name', e.name,
+                    'source', e.source,
+                    'charged_at', {_utc_json_timestamp('e.charged_at')},
+                    'is_problem', e.is_problem
+                ) ORDER BY e.charged_at DESC), '[]')
+            FROM (
+                SELECT
+                    *
+                FROM
+                    events
+                WHERE
+                    station_id = s.id
+                ORDER BY
+                    charged_at DESC
+                LIMIT
+                    {events_limit_param}
+            ) e
+        ) AS events,
+        (
+            SELECT
+                COALESCE(json_agg(json_build_object(
+                    'text', c.text,
+                    'user_name', c.user_name,
+                    'source', c.source,
+                    'created_at', {_utc_json_timestamp('c.created_at')}
+                ) ORDER BY c.created_at DESC), '[]')
+            FROM (
+                SELECT
+                    *
+                FROM
+                    comments
+                WHERE
+                    station_id = s.id
+                ORDER BY
+                    created_at DESC
+                LIMIT
+                    {comments_limit_param}
+            ) c
+        ) AS comments
+    """
+
+
+# station summary maintained on ingest, enough for list views without extra data
+_SUMMARY_COLUMNS = """,
+    s.last_event,
+    s.comment_count
+"""
+
+
+@instrument_repository
 class StationsRepository:
     def __init__(self, pool: asyncpg.Pool) -> None:
         self.pool = pool
@@ -17,8 +93,16 @@ class StationsRepository:
             max_lat: float,
             limit: int,
             offset: int,
+            after_id: int = 0,
+            with_extra_data: bool = False,
+            with_summary: bool = False,
+            events_limit: int | None = None,
+            comments_limit: int | None = None,
     ) -> list[asyncpg.Record]:
-        query = """
+        extra_data_columns = _extra_data_columns('$8', '$9') if with_extra_data else ''
+        extra_data_args = (events_limit, comments_limit) if with_extra_data else ()
+        summary_columns = _SUMMARY_COLUMNS if with_summary else ''
+        query = f"""
             SELECT
                 s.id,
                 ST_AsGeoJson(coordinates)::jsonb -> 'coordinates' as coordinates,
@@ -26,24 +110,27 @@ class StationsRepository:
                 s.address,
                 s.ocpi_ids,
                 s.rating,
+                s.rating_sum,
+                s.rating_count,
                 json_agg(json_build_object(
                     'station_inner_id', ss.station_inner_id,
                     'source', ss.source
-                )) AS sources
+                )) AS sources{extra_data_columns}{summary_columns}
             FROM
                 stations s
             JOIN
                 sources ss ON s.id = ss.station_id
             WHERE
-                ST_Intersects(s.coordinates, ST_MakeEnvelope($1, $2, $3, $4, 4326)::geography('POLYGON'))
+                ST_Intersects(s.coordinates, ST_MakeEnvelope($1, $2, $3, $4, 4326)::geography('POLYGON')) AND
+                s.id > $5
             GROUP BY
                 s.id
             ORDER BY
                 s.id
             LIMIT
-                $5
+                $6
             OFFSET
-                $6;
+                $7;
         """
         async with self.pool.acquire() as conn:
             rows = await conn.fetch(
@@ -52,11 +139,147 @@ class StationsRepository:
                 min_lat,
                 max_lon,
                 max_lat,
+                after_id,
                 limit,
-                offset
+                offset,
+                *extra_data_args
             )
         return rows
 
+    async def get_nearby(
+            self,
+            lon: float,
+            lat: float,
+            limit: int,
+            with_extra_data: bool = False,
+            events_limit: int | None = None,
+            comments_limit: int | None = None,
+    ) -> list[asyncpg.Record]:
+        # nearest stations are taken in distance order from the coordinates GIST index;
+        # distance is in meters
+        extra_data_columns = _extra_data_columns('$4', '$5') if with_extra_data else ''
+        extra_data_args = (events_limit, comments_limit) if with_extra_data else ()
+        query = f"""
+            SELECT
+                s.id,
+                ST_AsGeoJson(coordinates)::jsonb -> 'coordinates' as coordinates,
+                s.geo,
+                s.address,
+                s.ocpi_ids,
+                s.rating,
+                s.rating_sum,
+                s.rating_count,
+                json_agg(json_build_object(
+                    'station_inner_id', ss.station_inner_id,
+                    'source', ss.source
+                )) AS sources{extra_data_columns},
+                n.distance
+            FROM (
+                SELECT
+                    id,
+                    coordinates <-> ST_Point($1, $2)::geography AS distance
+                FROM
+                    stations
+                ORDER BY
+                    coordinates <-> ST_Point($1, $2)::geography
+                LIMIT
+                    $3
+            ) n
+            JOIN
+                stations s ON s.id = n.id
+            JOIN
+                sources ss ON s.id = ss.station_id
+            GROUP BY
+                s.id,
+                n.distance
+            ORDER BY
+                n.distance;
+        """
+        async with self.pool.acquire() as conn:
+            rows = await conn.fetch(
+                query,
+                lon,
+                lat,
+                limit,
+                *extra_data_args
+            )
+        return rows
+
+    async def get_clusters(
+            self,
+            min_lon: float,
+            min_lat: float,
+            max_lon: float,
+            max_lat: float,
+            grid_size: float,
+            limit: int,
+    ) -> list[asyncpg.Record]:
+        # stations snapped to the grid (in degrees); cluster coordinates are stations centroid
+        query = """
+            SELECT
+                COUNT(*) AS count,
+                AVG(ST_X(s.coordinates::geometry)) AS lon,
+                AVG(ST_Y(s.coordinates::geometry)) AS lat
+            FROM
+                stations s
+            WHERE
+                s.coordinates::geometry && ST_MakeEnvelope($1, $2, $3, $4, 4326)
+            GROUP BY
+                ST_SnapToGrid(s.coordinates::geometry, $5)
+            ORDER BY
+                count DESC
+            LIMIT
+                $6;
+        """
+        async with self.pool.acquire() as conn:
+            rows = await conn.fetch(
+                query,
+                min_lon,
+                min_lat,
+                max_lon,
+                max_lat,
+                grid_size,
+                limit
+            )
+        return rows
+
+    async def get_tile(self, z: int, x: int, y: int) -> bytes:
+        # mapbox vector tile with stations layer
+        query = """
+            WITH bounds AS (
+                SELECT
+                    ST_TileEnvelope($1, $2, $3) AS geom
+            ),
+            tile AS (
+                SELECT
+                    ST_AsMVTGeom(ST_Transform(s.coordinates::geometry, 3857), bounds.geom) AS geom,
+                    s.id,
+                    s.address,
+                    s.rating,
+                    s.comment_count,
+                    EXTRACT(EPOCH FROM s.last_event_at)::bigint AS last_event_at
+                FROM
+                    stations s,
+                    bounds
+                WHERE
+                    s.coordinates::geometry && ST_Transform(bounds.geom, 4326)
+            )
+            SELECT
+                ST_AsMVT(tile, 'stations', 4096, 'geom', 'id')
+            FROM
+                tile
+            WHERE
+                tile.geom IS NOT NULL;
+        """
+        async with self.pool.acquire() as conn:
+            tile = await conn.fetchval(
+                query,
+                z,
+                x,
+                y
+            )
+        return tile or b''
+
     async def get_by_id(
             self,
             station_id: int,
@@ -69,6 +292,8 @@ class StationsRepository:
                 s.address,
                 s.ocpi_ids,
                 s.rating,
+                s.rating_sum,
+                s.rating_count,
                 json_agg(json_build_object(
                     'station_inner_id', ss.station_inner_id,
                     'source', ss.source
@@ -91,9 +316,14 @@ class StationsRepository:
     async def get_by_source_and_inner_id(
             self,
             station_source: SourceName,
-            station_inner_id: int
+            station_inner_id: int,
+            with_extra_data: bool = False,
+            events_limit: int | None = None,
+            comments_limit: int | None = None,
     ) -> asyncpg.Record | None:
-        query = """
+        extra_data_columns = _extra_data_columns('$3', '$4') if with_extra_data else ''
+        extra_data_args = (events_limit, comments_limit) if with_extra_data else ()
+        query = f"""
             SELECT
                 s.id,
                 ST_AsGeoJson(coordinates)::jsonb -> 'coordinates' as coordinates,
@@ -101,10 +331,12 @@ class StationsRepository:
                 s.address,
                 s.ocpi_ids,
                 s.rating,
+                s.rating_sum,
+                s.rating_count,
                 json_agg(json_build_object(
                     'station_inner_id', ss.station_inner_id,
                     'source', ss.source
-                )) AS sources
+                )) AS sources{extra_data_columns}
             FROM
                 stations s
             JOIN
@@ -118,106 +350,351 @@ class StationsRepository:
             rows = await conn.fetch(
                 query,
                 station_source,
-                station_inner_id
+                station_inner_id,
+                *extra_data_args
             )
         return rows[0] if rows else None
 
-    async def get_station_id_by_source(self, source: str, inner_id: int) -> int | None:
-        query = """
+    async def get_by_sources(
+            self,
+            sources: list[tuple[str, int]],
+            with_extra_data: bool = False,
+            events_limit: int | None = None,
+            comments_limit: int | None = None,
+    ) -> list[asyncpg.Record]:
+        # stations by (source, inner_id) pairs, each row has the pair it was found by
+        extra_data_columns = _extra_data_columns('$3', '$4') if with_extra_data else ''
+        extra_data_args = (events_limit, comments_limit) if with_extra_data else ()
+        query = f"""
             SELECT
-                station_id
+                q.source AS requested_source,
+                q.inner_id AS requested_inner_id,
+                s.id,
+                ST_AsGeoJson(coordinates)::jsonb -> 'coordinates' as coordinates,
+                s.geo,
+                s.address,
+                s.ocpi_ids,
+                s.rating,
+                s.rating_sum,
+                s.rating_count,
+                json_agg(json_build_object(
+                    'station_inner_id', ss.station_inner_id,
+                    'source', ss.source
+                )) AS sources{extra_data_columns}
             FROM
-                sources
-            WHERE
-                source = $1 AND
-                station_inner_id = $2;
+                unnest($1::text[], $2::bigint[]) AS q(source, inner_id)
+            JOIN
+                sources qs ON qs.source = q.source AND qs.station_inner_id = q.inner_id
+            JOIN
+                stations s ON s.id = qs.station_id
+            JOIN
+                sources ss ON s.id = ss.station_id
+            GROUP BY
+                q.source,
+                q.inner_id,
+                s.id;
         """
         async with self.pool.acquire() as conn:
-            row = await conn.fetchrow(
+            rows = await conn.fetch(
                 query,
-                source,
-                inner_id
+                [source for source, _ in sources],
+                [inner_id for _, inner_id in sources],
+                *extra_data_args
             )
-        return row['station_id'] if row else None
+        return rows
 
-    async def get_station_id_by_coordinates(self, lon: float, lat: float, distance_threshold: int = 100) -> int | None:
+    async def get_ingest_states(self, sources: list[tuple[str, int]]) -> dict[tuple[str, int], asyncpg.Record]:
         query = """
             SELECT
-                id
+                sources.source,
+                sources.station_inner_id,
+                sources.payload_hash,
+                sources.events_watermark,
+                sources.comments_watermark
             FROM
-                stations
-            WHERE
-                ST_DWithin(coordinates, ST_Point($1, $2)::geography, $3)
-            LIMIT
-                1;
+                sources
+            JOIN
+                unnest($1::text[], $2::bigint[]) AS q(source, inner_id)
+            ON
+                sources.source = q.source AND
+                sources.station_inner_id = q.inner_id;
         """
         async with self.pool.acquire() as conn:
-            row = await conn.fetchrow(
+            rows = await conn.fetch(
                 query,
-                lon,
-                lat,
-                distance_threshold
+                [source for source, _ in sources],
+                [inner_id for _, inner_id in sources]
             )
-        return row['id'] if row else None
+        return {(row['source'], row['station_inner_id']): row for row in rows}
 
-    async def add_source(
+    async def update_ingest_states(
             self,
-            station_id: int,
-            inner_id: int,
-            source: str
+            conn: asyncpg.Connection,
+            ingest_states: list[tuple[str, int, str, datetime | None, datetime | None]]
     ) -> None:
+        # rows are (source, inner_id, payload_hash, events_watermark, comments_watermark)
         query = """
-            INSERT INTO
-                sources (
-                    station_id,
-                    station_inner_id,
-                    source
-                )
-            VALUES ($1, $2, $3);
+            UPDATE
+                sources
+            SET
+                payload_hash = q.payload_hash,
+                events_watermark = GREATEST(sources.events_watermark, q.events_watermark),
+                comments_watermark = GREATEST(sources.comments_watermark, q.comments_watermark)
+            FROM
+                unnest($1::text[], $2::bigint[], $3::text[], $4::timestamptz[], $5::timestamptz[])
+                    AS q(source, inner_id, payload_hash, events_watermark, comments_watermark)
+            WHERE
+                sources.source = q.source AND
+                sources.station_inner_id = q.inner_id;
+        """
+        await conn.execute(
+            query,
+            [source for source, *_ in ingest_states],
+            [inner_id for _, inner_id, *_ in ingest_states],
+            [payload_hash for _, _, payload_hash, *_ in ingest_states],
+            [events_watermark for *_, events_watermark, _ in ingest_states],
+            [comments_watermark for *_, comments_watermark in ingest_states]
+        )
+
+    async def get_watermarks(self, source: str, after_inner_id: int, limit: int) -> list[asyncpg.Record]:
+        query = """
+            SELECT
+                station_inner_id,
+                events_watermark,
+                comments_watermark
+            FROM
+                sources
+            WHERE
+                source = $1 AND
+                station_inner_id > $2
+            ORDER BY
+                station_inner_id
+            LIMIT
+                $3;
         """
         async with self.pool.acquire() as conn:
-            await conn.execute(
+            return await conn.fetch(
                 query,
-                station_id,
-                inner_id,
-                source
+                source,
+                after_inner_id,
+                limit
             )
 
-    async def add_station(
+    async def lock_keys(self, conn: asyncpg.Connection, keys: list[int]) -> None:
+        # transaction-scoped advisory locks, taken in the keys order so that sorted keys can't deadlock
+        query = """
+            SELECT
+                pg_advisory_xact_lock(k.key)
+            FROM (
+                SELECT
+                    key
+                FROM
+                    unnest($1::bigint[]) WITH ORDINALITY AS t(key, n)
+                ORDER BY
+                    n
+            ) k;
+        """
+        await conn.execute(query, keys)
+
+    async def get_station_ids_by_sources(
             self,
-            lon: float,
-            lat: float,
-            rating: int | None = None,
-            geo: dict | None = None,
-            address: str | None = None,
-            ocpi_ids: list[str] | None = None
-    ) -> int:
+            conn: asyncpg.Connection,
+            sources: list[tuple[str, int]]
+    ) -> dict[tuple[str, int], int]:
+        query = """
+            SELECT
+                sources.source,
+                sources.station_inner_id,
+                sources.station_id
+            FROM
+                sources
+            JOIN
+                unnest($1::text[], $2::bigint[]) AS q(source, inner_id)
+            ON
+                sources.source = q.source AND
+                sources.station_inner_id = q.inner_id;
+        """
+        rows = await conn.fetch(
+            query,
+            [source for source, _ in sources],
+            [inner_id for _, inner_id in sources]
+        )
+        return {(row['source'], row['station_inner_id']): row['station_id'] for row in rows}
+
+    async def get_station_ids_by_coordinates(
+            self,
+            conn: asyncpg.Connection,
+            points: list[tuple[float, float]],
+            distance_threshold: int = 100
+    ) -> dict[int, int]:
+        # index of the (lon, lat) point -> id of the nearest station within the threshold
+        query = """
+            SELECT
+                p.n,
+                s.id
+            FROM
+                unnest($1::float8[], $2::float8[]) WITH ORDINALITY AS p(lon, lat, n)
+            CROSS JOIN LATERAL (
+                SELECT
+                    id
+                FROM
+                    stations
+                WHERE
+                    ST_DWithin(coordinates, ST_Point(p.lon, p.lat)::geography, $3)
+                ORDER BY
+                    coordinates <-> ST_Point(p.lon, p.lat)::geography
+                LIMIT
+                    1
+            ) s;
+        """
+        rows = await conn.fetch(
+            query,
+            [lon for lon, _ in points],
+            [lat for _, lat in points],
+            distance_threshold
+        )
+        return {row['n'] - 1: row['id'] for row in rows}
+
+    async def allocate_station_ids(self, conn: asyncpg.Connection, count: int) -> list[int]:
+        query = """
+            SELECT
+                nextval(pg_get_serial_sequence('stations', 'id')) AS id
+            FROM
+                generate_series(1, $1);
+        """
+        rows = await conn.fetch(query, count)
+        return sorted(row['id'] for row in rows)
+
+    async def add_stations(
+            self,
+            conn: asyncpg.Connection,
+            stations: list[tuple[int, float, float, float | None, dict | None, str | None, list[str] | None]]
+    ) -> None:
+        # rows are (id, lon, lat, rating, geo, address, ocpi_ids)
         query = """
             INSERT INTO
                 stations (
+                    id,
                     coordinates,
                     geo,
                     address,
                     ocpi_ids,
                     rating
                 )
-            VALUES (
-                    ST_Point($1, $2),
-                     $3,
-                    $4,
-                    $5,
-                    $6
-                )
-            RETURNING id;
-        """
-        async with self.pool.acquire() as conn:
-            row = await conn.fetchrow(
-                query,
-                lon,
-                lat,
-                json.dumps(geo) if geo else None,
+            SELECT
+                id,
+                ST_Point(lon, lat),
+                geo::jsonb,
                 address,
-                json.dumps(ocpi_ids) if ocpi_ids else None,
+                ocpi_ids::jsonb,
                 rating
-            )
-        return row['id']
+            FROM
+                unnest(
+                    $1::integer[], $2::float8[], $3::float8[], $4::text[], $5::text[], $6::text[], $7::float8[]
+                ) AS t(id, lon, lat, geo, address, ocpi_ids, rating);
+        """
+        await conn.execute(
+            query,
+            [station_id for station_id, *_ in stations],
+            [lon for _, lon, *_ in stations],
+            [lat for _, _, lat, *_ in stations],
+            [json.dumps(geo) if geo else None for *_, geo, _, _ in stations],
+            [address for *_, address, _ in stations],
+            [json.dumps(ocpi_ids) if ocpi_ids else None for *_, ocpi_ids in stations],
+            [rating for _, _, _, rating, *_ in stations],
+        )
+
+    async def add_sources(self, conn: asyncpg.Connection, sources: list[tuple[int, int, str]]) -> None:
+        # rows are (station_id, inner_id, source)
+        query = """
+            INSERT INTO
+                sources (
+                    station_id,
+                    station_inner_id,
+                    source
+                )
+            SELECT
+                *
+            FROM
+                unnest($1::integer[], $2::bigint[], $3::text[]);
+        """
+        await conn.execute(
+            query,
+            [station_id for station_id, _, _ in sources],
+            [inner_id for _, inner_id, _ in sources],
+            [source for _, _, source in sources]
+        )
+
+    async def update_summaries(
+            self,
+            conn: asyncpg.Connection,
+            summaries: list[tuple[int, datetime, dict]]
+    ) -> None:
+        # rows are (station_id, last_event_at, last_event);
+        # ratings and comment count are maintained by the comments trigger
+        query = """
+            UPDATE
+                stations
+            SET
+                last_event = CASE
+                    WHEN last_event_at IS NULL OR $2 > last_event_at THEN $3
+                    ELSE last_event
+                END,
+                last_event_at = GREATEST(last_event_at, $2)
+            WHERE
+                id = $1;
+        """
+        await conn.executemany(
+            query,
+            [
+                (station_id, last_event_at, json.dumps(last_event))
+                for station_id, last_event_at, last_event in summaries
+            ]
+        )
+
+    async def recalculate_comments_summaries(self, after_id: int, limit: int) -> int | None:
+        # ratings and comment count of the next `limit` stations recalculated from all their comments,
+        # returns the last recalculated station id, None if there are no stations left;
+        # stations are locked first so that comments inserted meanwhile are either counted here or by the trigger
+        lock_query = """
+            SELECT
+                id
+            FROM
+                stations
+            WHERE
+                id > $1
+            ORDER BY
+                id
+            LIMIT
+                $2
+            FOR UPDATE;
+        """
+        update_query = """
+            UPDATE
+                stations s
+            SET
+                rating_sum = c.rating_sum,
+                rating_count = c.rating_count,
+                comment_count = c.comment_count
+            FROM
+                unnest($1::integer[]) AS st(id)
+            CROSS JOIN LATERAL (
+                SELECT
+                    COALESCE(SUM(rating) FILTER (WHERE rating <> 0), 0) AS rating_sum,
+                    COUNT(rating) FILTER (WHERE rating <> 0) AS rating_count,
+                    COUNT(*) AS comment_count
+                FROM
+                    comments
+                WHERE
+                    station_id = st.id
+            ) c
+            WHERE
+                s.id = st.id;
+        """
+        async with self.pool.acquire() as conn, conn.transaction():
+            rows = await conn.fetch(lock_query, after_id, limit)
+            station_ids = [row['id'] for row in rows]
+            if not station_ids:
+                return None
+            await conn.execute(update_query, station_ids)
+        return station_ids[-1]
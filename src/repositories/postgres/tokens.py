@@ -1,14 +1,30 @@
+from datetime import datetime
+
 import asyncpg
 
+from src.repositories.postgres.instrumentation import instrument_repository
+
 
+@instrument_repository
 class TokensRepository:
     def __init__(self, pool: asyncpg.Pool) -> None:
         self.pool = pool
 
-    async def is_existing_token(self, token: str) -> bool:
-        return await self._update_token_usage(token)
+    async def get_by_api_key(self, token: str) -> asyncpg.Record | None:
+        query = """
+            SELECT
+                rate_limit_per_second,
+                rate_limit_burst
+            FROM
+                tokens
+            WHERE
+                api_key = $1;
+        """
+        async with self.pool.acquire() as connection:
+            return await connection.fetchrow(query, token)
 
-    async def _update_token_usage(self, token: str) -> bool:
+    async def update_token_usage(self, token: str) -> asyncpg.Record | None:
+        # checks the token and counts the request in one query
         query = """
             UPDATE
                 tokens
@@ -17,9 +33,70 @@ class TokensRepository:
                 updated_at = now()
             WHERE
                 api_key = $1
-            RETURNING api_key;
+            RETURNING
+                rate_limit_per_second,
+                rate_limit_burst;
+        """
+        async with self.pool.acquire() as connection:
+            return await connection.fetchrow(query, token)
+
+    async def add_usages(self, usages: list[tuple[str, int, datetime]]) -> None:
+        # rows are (api_key, request_count, used_at); rows are locked in the id order first,
+        # so that flushes of several processes can't deadlock
+        lock_query = """
+            SELECT
+                id
+            FROM
+                tokens
+            WHERE
+                api_key = ANY($1::text[])
+            ORDER BY
+                id
+            FOR UPDATE;
+        """
+        update_query = """
+            UPDATE
+                tokens t
+            SET
+                request_count = t.request_count + u.request_count,
+                updated_at = GREATEST(t.updated_at, u.used_at)
+            FROM
+                unnest($1::text[], $2::integer[], $3::timestamptz[]) AS u(api_key, request_count, used_at)
+            WHERE
+                t.api_key = u.api_key;
+        """
+        api_keys = [api_key for api_key, _, _ in usages]
+        async with self.pool.acquire() as connection, connection.transaction():
+            await connection.execute(lock_query, api_keys)
+            await connection.execute(
+                update_query,
+                api_keys,
+                [request_count for _, request_count, _ in usages],
+                [used_at for _, _, used_at in usages]
+            )
+
+    async def add_window_request(self, token: str, window_seconds: float) -> tuple[int, float]:
+        # counts the request in the current window of the api key,
+        # returns (requests in the window, seconds until the window ends)
+        query = """
+            INSERT INTO
+                rate_limit_counters AS c (
+                    api_key,
+                    window_start,
+                    request_count
+                )
+            VALUES
+                ($1, to_timestamp(floor(extract(EPOCH FROM now()) / $2::float8) * $2::float8), 1)
+            ON CONFLICT (api_key) DO UPDATE SET
+                request_count = CASE
+                    WHEN c.window_start >= EXCLUDED.window_start THEN c.request_count + 1
+                    ELSE 1
+                END,
+                window_start = GREATEST(c.window_start, EXCLUDED.window_start)
+            RETURNING
+                request_count,
+                extract(EPOCH FROM window_start - now())::float8 + $2::float8 AS window_left_seconds;
         """
         async with self.pool.acquire() as connection:
-            rows = await connection.fetch(query, token)
-        is_updated = bool(rows)
-        return is_updated
+            row = await connection.fetchrow(query, token, window_seconds)
+        return row['request_count'], row['window_left_seconds']
@@ -0,0 +1,115 @@
+import asyncio
+import json
+from datetime import UTC, datetime
+
+import asyncpg
+
+from src.api.routers.inner.models import IngestJob, IngestJobStatus, IngestStats
+from src.api.routers.v1.models import AddStation
+from src.repositories.postgres.ingest_jobs import IngestJobsRepository
+from src.services.stations import StationsServices
+from src.utils.logging.logger import logger
+
+
+class IngestJobsServices:
+    def __init__(
+            self,
+            pool: asyncpg.Pool,
+            stations_service: StationsServices,
+            batch_size: int = 500,
+    ) -> None:
+        self.stations_service = stations_service
+        self.batch_size = batch_size
+
+        self.ingest_jobs_repo = IngestJobsRepository(pool=pool)
+
+    async def add_job(self, stations: list[AddStation]) -> int:
+        payload = json.dumps([station.model_dump(mode='json') for station in stations])
+        return await self.ingest_jobs_repo.add_job(payload=payload, stations_count=len(stations))
+
+    async def get_job(self, job_id: int) -> IngestJob | None:
+        row = await self.ingest_jobs_repo.get_by_id(job_id=job_id)
+        if not row:
+            return None
+
+        duration_seconds = None
+        if row['started_at']:
+            duration_seconds = ((row['finished_at'] or datetime.now(UTC)) - row['started_at']).total_seconds()
+
+        return IngestJob(
+            id=row['id'],
+            status=row['status'],
+            stations_count=row['stations_count'],
+            processed_count=row['processed_count'],
+            stats=IngestStats.model_validate_json(row['stats']),
+            error=row['error'],
+            created_at=row['created_at'],
+            started_at=row['started_at'],
+            finished_at=row['finished_at'],
+            duration_seconds=duration_seconds,
+        )
+
+    async def process_next_job(self, stale_seconds: float) -> bool:
+        # False if there is no job to process
+        row = await self.ingest_jobs_repo.take_job(stale_seconds=stale_seconds)
+        if not row:
+            return False
+
+        # heartbeat goes on while a batch waits for the ingest semaphore or locks,
+        # so that the job is not taken by another worker meanwhile
+        heartbeat_task = asyncio.create_task(
+            self._keep_alive(job_id=row['id'], attempt=row['attempt'], interval_seconds=stale_seconds / 3)
+        )
+        try:
+            await self._process_job(row=row)
+        finally:
+            heartbeat_task.cancel()
+        return True
+
+    async def _keep_alive(self, job_id: int, attempt: int, interval_seconds: float) -> None:
+        while True:
+            await asyncio.sleep(interval_seconds)
+            try:
+                await self.ingest_jobs_repo.touch_job(job_id=job_id, attempt=attempt)
+            except Exception as e:
+                logger.error(e, exc_info=True)
+
+    async def _process_job(self, row: asyncpg.Record) -> None:
+        job_id, attempt = row['id'], row['attempt']
+        try:
+            # payload stored by an older version may not be valid anymore, the job fails then
+            stations = [AddStation.model_validate(station) for station in json.loads(row['payload'])]
+            stats = IngestStats.model_validate_json(row['stats'])
+
+            # job taken after a stopped worker continues from the last stored batch
+            for start in range(row['processed_count'], len(stations), self.batch_size):
+                batch = stations[start:start + self.batch_size]
+                stats.add(await self.stations_service.add_stations(stations=batch))
+                is_owned = await self.ingest_jobs_repo.update_progress(
+                    job_id=job_id,
+                    attempt=attempt,
+                    processed_count=start + len(batch),
+                    stats=stats.model_dump_json()
+                )
+                if not is_owned:
+                    # taken again after a missed heartbeat, the other worker goes on with it
+                    logger.error(f'Ingest job {job_id} was taken by another worker')
+                    return
+        except Exception as e:
+            logger.error(e, exc_info=True)
+            await self.ingest_jobs_repo.finish_job(
+                job_id=job_id, attempt=attempt, status=IngestJobStatus.failed, error=str(e)
+            )
+        else:
+            await self.ingest_jobs_repo.finish_job(job_id=job_id, attempt=attempt, status=IngestJobStatus.done)
+
+    async def run_worker(self, poll_interval_seconds: float, stale_seconds: float) -> None:
+        while True:
+            try:
+                is_processed = await self.process_next_job(stale_seconds=stale_seconds)
+            except Exception as e:
+                logger.error(e, exc_info=True)
+                is_processed = False
+
+            if not is_processed:
+                await asyncio.sleep(poll_interval_seconds)
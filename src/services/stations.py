@@ -1,41 +1,102 @@
 import asyncio
+import hashlib
 import json
+from collections import defaultdict
+from collections.abc import Callable
+from contextlib import nullcontext
+from datetime import UTC, datetime, timedelta
+from typing import TypeVar
 
 import asyncpg
 
+from src.api.routers.inner.models import IngestStats, SourceWatermark
 from src.api.routers.v1.models import (
+    AddComment,
     AddStation,
     AreaRequest,
     Charger,
     Comment,
     Coordinates,
     Event,
+    GetStationsByAreaResponse,
     Source,
     SourceName,
     Station,
+    StationCluster,
+    StationsResponseMode,
 )
 from src.repositories.postgres.chargers import ChargersRepository
 from src.repositories.postgres.comments import CommentsRepository
 from src.repositories.postgres.events import EventsRepository
 from src.repositories.postgres.stations import StationsRepository
-from src.utils.calculate_average_rating import calculate_average_rating
-from src.utils.filter_entities import filter_chargers, filter_comments, filter_events
+from src.utils.advisory_lock import advisory_lock_key
+from src.utils.area_cache import AreaCache
+from src.utils.calculate_average_rating import calculate_average_rating_from_sum
+from src.utils.cursor import encode_cursor
+from src.utils.geo import MAX_LAT, bboxes_around
+from src.utils.geohash import cells_in_bbox
+from src.utils.metrics import Counter
+from src.utils.spatial_index import PointsGrid
+from src.utils.tile_cache import TileCache
+from src.utils.timing import timed
+
+_T = TypeVar('_T')
+
+# cluster grid cells per tile width, tile of zoom z is 360 / 2^z degrees wide
+CLUSTER_CELLS_PER_TILE = 8
+
+# incoming station is matched to the stored one within this distance
+STATION_MATCH_DISTANCE_METERS = 100
+
+# events and comments of a station closer in time than this are duplicates, same as the natural keys in the db
+DATETIME_THRESHOLD_SECONDS = 60
+
+# ~1.2 x 0.6 km geohash cells locked around ingested stations
+LOCK_GEOHASH_PRECISION = 6
+
+INGEST_ROWS = Counter(
+    'livechrg_ingest_rows_total',
+    'Ingested stations by outcome and stored events, comments and chargers.',
+    label_names=('kind',),
+)
 
 
 class StationsServices:
-    def __init__(self, pool: asyncpg.Pool) -> None:
+    def __init__(
+            self,
+            pool: asyncpg.Pool,
+            single_query_hydration: bool = True,
+            tile_cache: TileCache | None = None,
+            area_cache: AreaCache | None = None,
+            ingest_semaphore: asyncio.Semaphore | None = None,
+            ingest_batch_size: int = 500,
+            ingest_max_locks: int = 256,
+    ) -> None:
+        self.pool = pool
+        self.ingest_semaphore = ingest_semaphore
+        self.ingest_batch_size = ingest_batch_size
+        self.ingest_max_locks = ingest_max_locks
+        self.single_query_hydration = single_query_hydration
+        self.tile_cache = tile_cache
+        self.area_cache = area_cache
+
         self.stations_repo = StationsRepository(pool=pool)
         self.comments_repo = CommentsRepository(pool=pool)
         self.events_repo = EventsRepository(pool=pool)
         self.chargers_repo = ChargersRepository(pool=pool)
 
     async def _get_station_extra_data(
-            self, station_ids: list[int]
+            self,
+            station_ids: list[int],
+            events_limit: int | None = None,
+            comments_limit: int | None = None,
     ) -> tuple[dict[int, list[asyncpg.Record]], dict[int, list[asyncpg.Record]], dict[int, list[asyncpg.Record]]]:
 
         async with asyncio.TaskGroup() as tg:
-            get_comments_task = tg.create_task(self.comments_repo.get_by_station_ids(station_ids))
-            get_events_task = tg.create_task(self.events_repo.get_by_station_ids(station_ids))
+            get_comments_task = tg.create_task(
+                self.comments_repo.get_by_station_ids(station_ids, limit=comments_limit)
+            )
+            get_events_task = tg.create_task(self.events_repo.get_by_station_ids(station_ids, limit=events_limit))
             get_chargers_task = tg.create_task(self.chargers_repo.get_by_station_ids(station_ids))
 
         comment_rows_by_station_id = get_comments_task.result()
@@ -49,14 +110,13 @@ class StationsServices:
             station_row: asyncpg.Record,
             charger_rows: list,
             events_rows: list,
-            comment_rows: list
+            comment_rows: list,
     ) -> Station:
         sources = json.loads(station_row['sources'])
         coordinates = json.loads(station_row['coordinates'])
 
-        average_rating = calculate_average_rating(
-            [comment_row['rating'] for comment_row in comment_rows if comment_row['rating']]
-        )
+        # ratings of all station comments are summed up by the comments trigger
+        average_rating = calculate_average_rating_from_sum(station_row['rating_sum'], station_row['rating_count'])
 
         events = self._format_events(event_rows=events_rows)
         last_event = events[0] if events else None
@@ -79,10 +139,37 @@ class StationsServices:
             address=station_row['address'],
             ocpi_ids=json.loads(station_row['ocpi_ids']) if station_row['ocpi_ids'] else None,
             last_event=last_event if last_event else None,
-            average_rating=station_row['rating'] or average_rating
+            average_rating=station_row['rating'] or average_rating,
+            distance=station_row.get('distance')
         )
         return station
 
+    @staticmethod
+    def _format_station_summary(station_row: asyncpg.Record) -> Station:
+        sources = json.loads(station_row['sources'])
+        coordinates = json.loads(station_row['coordinates'])
+
+        average_rating = calculate_average_rating_from_sum(station_row['rating_sum'], station_row['rating_count'])
+
+        return Station(
+            coordinates=Coordinates(
+                lat=coordinates[1],
+                lon=coordinates[0]
+            ),
+            sources=[
+                Source(
+                    source=source['source'],
+                    inner_id=source['station_inner_id']
+                ) for source in sources
+            ],
+            geo=json.loads(station_row['geo']) if station_row['geo'] else None,
+            address=station_row['address'],
+            ocpi_ids=json.loads(station_row['ocpi_ids']) if station_row['ocpi_ids'] else None,
+            last_event=Event(**json.loads(station_row['last_event'])) if station_row['last_event'] else None,
+            average_rating=station_row['rating'] or average_rating,
+            comment_count=station_row['comment_count']
+        )
+
     @staticmethod
     def _format_comments(comment_rows: list[asyncpg.Record]) -> list[Comment]:
         return [
@@ -117,12 +204,67 @@ class StationsServices:
             for charger in charger_rows
         ]
 
+    async def _build_stations(
+            self,
+            station_rows: list[asyncpg.Record],
+            events_limit: int | None = None,
+            comments_limit: int | None = None,
+    ) -> list[Station]:
+        if self.single_query_hydration:
+            with timed('format'):
+                return [
+                    self._format_station(
+                        station_row=row,
+                        charger_rows=json.loads(row['chargers']),
+                        events_rows=json.loads(row['events']),
+                        comment_rows=json.loads(row['comments'])
+                    )
+                    for row in station_rows
+                ]
+
+        # the same station can be in several rows
+        station_ids = list(dict.fromkeys(row['id'] for row in station_rows))
+        # wall time of the concurrent queries, each of them is timed by the repositories too
+        with timed('extra_data'):
+            (
+                comment_rows_by_station_id,
+                event_rows_by_station_id,
+                charger_rows_by_station_id
+            ) = await self._get_station_extra_data(
+                station_ids=station_ids,
+                events_limit=events_limit,
+                comments_limit=comments_limit
+            )
+
+        stations = []
+
+        with timed('format'):
+            for row in station_rows:
+                station_id = row['id']
+                charger_rows = charger_rows_by_station_id.get(station_id, [])
+                events_rows = event_rows_by_station_id.get(station_id, [])
+                comment_rows = comment_rows_by_station_id.get(station_id, [])
+                station = self._format_station(
+                    station_row=row,
+                    charger_rows=charger_rows,
+                    events_rows=events_rows,
+                    comment_rows=comment_rows
+                )
+                stations.append(station)
+
+        return stations
+
     async def get_by_area(
             self,
             limit: int,
             offset: int,
             area: AreaRequest,
-    ) -> list[Station]:
+            after_id: int = 0,
+            events_limit: int | None = None,
+            comments_limit: int | None = None,
+            mode: StationsResponseMode = StationsResponseMode.full,
+    ) -> tuple[list[Station], int | None]:
+        is_summary = mode == StationsResponseMode.summary
         station_rows = await self.stations_repo.get_by_area(
             min_lat=area.sw_lat,
             min_lon=area.sw_lon,
@@ -130,139 +272,515 @@ class StationsServices:
             max_lon=area.ne_lon,
             limit=limit,
             offset=offset,
+            after_id=after_id,
+            with_extra_data=self.single_query_hydration and not is_summary,
+            with_summary=is_summary,
+            events_limit=events_limit,
+            comments_limit=comments_limit,
         )
-        station_ids = [row['id'] for row in station_rows]
-        (
-            comment_rows_by_station_id,
-            event_rows_by_station_id,
-            charger_rows_by_station_id
-        ) = await self._get_station_extra_data(station_ids=station_ids)
+        if is_summary:
+            with timed('format'):
+                stations = [self._format_station_summary(station_row=row) for row in station_rows]
+        else:
+            stations = await self._build_stations(
+                station_rows=station_rows,
+                events_limit=events_limit,
+                comments_limit=comments_limit
+            )
 
-        stations = []
+        next_after_id = station_rows[-1]['id'] if station_rows and len(station_rows) == limit else None
+        return stations, next_after_id
 
-        for row in station_rows:
-            station_id = row['id']
-            charger_rows = charger_rows_by_station_id.get(station_id, [])
-            events_rows = event_rows_by_station_id.get(station_id, [])
-            comment_rows = comment_rows_by_station_id.get(station_id, [])
-            station = self._format_station(
-                station_row=row,
-                charger_rows=charger_rows,
-                events_rows=events_rows,
-                comment_rows=comment_rows
-            )
-            stations.append(station)
+    async def get_by_area_response(
+            self,
+            limit: int,
+            offset: int,
+            area: AreaRequest,
+            after_id: int = 0,
+            events_limit: int | None = None,
+            comments_limit: int | None = None,
+            mode: StationsResponseMode = StationsResponseMode.full,
+    ) -> bytes:
+        # serialized GetStationsByAreaResponse, cached for the area snapped to the cache grid
+        params = (limit, offset, after_id, events_limit, comments_limit, mode)
+        if self.area_cache:
+            area = self.area_cache.snap(area)
+            content = self.area_cache.get(area=area, params=params)
+            if content is not None:
+                return content
+            version = self.area_cache.version
 
-        return stations
+        stations, next_after_id = await self.get_by_area(
+            limit=limit,
+            offset=offset,
+            area=area,
+            after_id=after_id,
+            events_limit=events_limit,
+            comments_limit=comments_limit,
+            mode=mode,
+        )
+        with timed('serialize'):
+            content = GetStationsByAreaResponse(
+                stations=stations,
+                next_cursor=encode_cursor(next_after_id) if next_after_id is not None else None
+            ).model_dump_json().encode()
+
+        if self.area_cache:
+            self.area_cache.set(area=area, params=params, content=content, version=version)
+        return content
 
     async def get_by_source_and_inner_id(
             self,
             station_source: SourceName,
-            station_inner_id: int
+            station_inner_id: int,
+            events_limit: int | None = None,
+            comments_limit: int | None = None,
     ) -> Station | None:
         row = await self.stations_repo.get_by_source_and_inner_id(
             station_inner_id=station_inner_id,
-            station_source=station_source
+            station_source=station_source,
+            with_extra_data=self.single_query_hydration,
+            events_limit=events_limit,
+            comments_limit=comments_limit,
         )
 
         if not row:
             return
 
-        station_id = row['id']
-        (
-            comment_rows_by_station_id,
-            event_rows_by_station_id,
-            charger_rows_by_station_id
-        ) = await self._get_station_extra_data(station_ids=[station_id])
-
-        charger_rows = charger_rows_by_station_id.get(station_id, [])
-        events_rows = event_rows_by_station_id.get(station_id, [])
-        comment_rows = comment_rows_by_station_id.get(station_id, [])
-
-        return self._format_station(
-            station_row=row,
-            charger_rows=charger_rows,
-            events_rows=events_rows,
-            comment_rows=comment_rows
+        stations = await self._build_stations(
+            station_rows=[row],
+            events_limit=events_limit,
+            comments_limit=comments_limit
+        )
+        return stations[0]
+
+    async def get_by_sources(
+            self,
+            sources: list[tuple[SourceName, int]],
+            events_limit: int | None = None,
+            comments_limit: int | None = None,
+    ) -> dict[tuple[str, int], Station]:
+        station_rows = await self.stations_repo.get_by_sources(
+            sources=sources,
+            with_extra_data=self.single_query_hydration,
+            events_limit=events_limit,
+            comments_limit=comments_limit,
+        )
+        stations = await self._build_stations(
+            station_rows=station_rows,
+            events_limit=events_limit,
+            comments_limit=comments_limit
+        )
+        return {
+            (row['requested_source'], row['requested_inner_id']): station
+            for row, station in zip(station_rows, stations, strict=True)
+        }
+
+    async def get_nearby(
+            self,
+            lat: float,
+            lon: float,
+            limit: int,
+            events_limit: int | None = None,
+            comments_limit: int | None = None,
+    ) -> list[Station]:
+        station_rows = await self.stations_repo.get_nearby(
+            lat=lat,
+            lon=lon,
+            limit=limit,
+            with_extra_data=self.single_query_hydration,
+            events_limit=events_limit,
+            comments_limit=comments_limit,
+        )
+        return await self._build_stations(
+            station_rows=station_rows,
+            events_limit=events_limit,
+            comments_limit=comments_limit
+        )
+
+    async def get_clusters(self, area: AreaRequest, zoom: int, limit: int) -> list[StationCluster]:
+        cluster_rows = await self.stations_repo.get_clusters(
+            min_lat=area.sw_lat,
+            min_lon=area.sw_lon,
+            max_lat=area.ne_lat,
+            max_lon=area.ne_lon,
+            grid_size=360 / 2 ** zoom / CLUSTER_CELLS_PER_TILE,
+            limit=limit,
+        )
+        return [
+            StationCluster(
+                coordinates=Coordinates(
+                    lat=row['lat'],
+                    lon=row['lon']
+                ),
+                count=row['count']
+            )
+            for row in cluster_rows
+        ]
+
+    async def get_tile(self, z: int, x: int, y: int) -> bytes:
+        if not self.tile_cache:
+            return await self.stations_repo.get_tile(z=z, x=x, y=y)
+
+        tile = self.tile_cache.get(z, x, y)
+        if tile is None:
+            version = self.tile_cache.version
+            tile = await self.stations_repo.get_tile(z=z, x=x, y=y)
+            self.tile_cache.set(z, x, y, tile, version=version)
+        return tile
+
+    async def get_watermarks(
+            self,
+            source: str,
+            after_inner_id: int,
+            limit: int
+    ) -> tuple[list[SourceWatermark], int | None]:
+        rows = await self.stations_repo.get_watermarks(source=source, after_inner_id=after_inner_id, limit=limit)
+        watermarks = [
+            SourceWatermark(
+                inner_id=row['station_inner_id'],
+                events_watermark=row['events_watermark'],
+                comments_watermark=row['comments_watermark'],
+            )
+            for row in rows
+        ]
+        return watermarks, rows[-1]['station_inner_id'] if len(rows) == limit else None
+
+    def _invalidate_caches(self, stations: list[AddStation]) -> None:
+        # stored station can be up to match distance away from the incoming one
+        bboxes = [
+            bbox
+            for station in stations
+            for bbox in bboxes_around(
+                lon=station.coordinates.lon,
+                lat=station.coordinates.lat,
+                distance_meters=STATION_MATCH_DISTANCE_METERS
+            )
+        ]
+
+        if self.tile_cache:
+            self.tile_cache.invalidate_areas(bboxes)
+
+        if self.area_cache:
+            self.area_cache.invalidate_areas(bboxes)
+
+    async def add_stations(self, stations: list[AddStation]) -> IngestStats:
+        stats = IngestStats()
+        # each batch is checked for changes at once and stored in transactions of a bounded number of locks
+        for start in range(0, len(stations), self.ingest_batch_size):
+            batch = stations[start:start + self.ingest_batch_size]
+            try:
+                async with self.ingest_semaphore or nullcontext():
+                    batch_stats = await self._add_stations_batch(stations=batch)
+            finally:
+                # stored batches are visible at once, don't serve them stale until the whole upload is done
+                self._invalidate_caches(stations=batch)
+            stats.add(batch_stats)
+            for kind, count in batch_stats.model_dump().items():
+                INGEST_ROWS.inc(kind, value=count)
+        return stats
+
+    @staticmethod
+    def _get_lock_keys(station: AddStation) -> set[int]:
+        # stations within the match distance always share a locked geohash cell:
+        # the cell of one of them is among the cells around the other one
+        keys = {advisory_lock_key('source', station.source.source, station.source.inner_id)}
+        for min_lon, min_lat, max_lon, max_lat in bboxes_around(
+            lon=station.coordinates.lon,
+            lat=station.coordinates.lat,
+            distance_meters=STATION_MATCH_DISTANCE_METERS
+        ):
+            if min_lat < -MAX_LAT or max_lat > MAX_LAT:
+                # cells are too narrow near the poles, one lock for each of them
+                keys.add(advisory_lock_key('geo', 'pole', max_lat > 0))
+            cells = cells_in_bbox(
+                min_lon=min_lon,
+                min_lat=max(min_lat, -MAX_LAT),
+                max_lon=max_lon,
+                max_lat=min(max_lat, MAX_LAT),
+                precision=LOCK_GEOHASH_PRECISION
+            )
+            keys.update(advisory_lock_key('geo', cell) for cell in cells)
+        return keys
+
+    @classmethod
+    def _split_by_lock_keys(
+            cls,
+            stations: list[AddStation],
+            max_locks: int
+    ) -> list[tuple[list[AddStation], list[int]]]:
+        # consecutive chunks of stations with their sorted lock keys, each stored in its own transaction
+        # holding at most `max_locks` locks (a single station over the limit still gets a chunk);
+        # stations of the same source stay in one chunk, their ingest state is stored with all of them
+        stations_by_source = defaultdict(list)
+        for station in stations:
+            stations_by_source[(station.source.source, station.source.inner_id)].append(station)
+
+        chunks = []
+        chunk_stations, chunk_keys = [], set()
+        for source_stations in stations_by_source.values():
+            keys = set().union(*(cls._get_lock_keys(station=station) for station in source_stations))
+            if chunk_stations and len(chunk_keys | keys) > max_locks:
+                chunks.append((chunk_stations, sorted(chunk_keys)))
+                chunk_stations, chunk_keys = [], set()
+            chunk_stations.extend(source_stations)
+            chunk_keys |= keys
+        if chunk_stations:
+            chunks.append((chunk_stations, sorted(chunk_keys)))
+        return chunks
+
+    async def _resolve_station_ids(
+            self,
+            conn: asyncpg.Connection,
+            stations: list[AddStation]
+    ) -> tuple[list[int], list[AddStation], list[tuple[int, int, str]]]:
+        # station id for every incoming station, new stations get placeholder ids -1, -2, ...
+        # matching their position in the returned new stations
+        station_id_by_source = await self.stations_repo.get_station_ids_by_sources(
+            conn=conn,
+            sources=[(station.source.source, station.source.inner_id) for station in stations]
         )
 
-    async def add_stations(self, stations: list[AddStation]) -> None:
+        unresolved = [
+            i for i, station in enumerate(stations)
+            if (station.source.source, station.source.inner_id) not in station_id_by_source
+        ]
+        nearby_station_ids = {}
+        if unresolved:
+            nearby_station_ids = await self.stations_repo.get_station_ids_by_coordinates(
+                conn=conn,
+                points=[(stations[i].coordinates.lon, stations[i].coordinates.lat) for i in unresolved],
+                distance_threshold=STATION_MATCH_DISTANCE_METERS
+            )
+        nearby_station_id_by_index = {unresolved[n]: station_id for n, station_id in nearby_station_ids.items()}
+
+        station_ids = []
+        new_stations = []
+        new_stations_grid = PointsGrid(max_distance_meters=STATION_MATCH_DISTANCE_METERS)
+        new_sources = []
+        for i, station in enumerate(stations):
+            source_key = (station.source.source, station.source.inner_id)
+            station_id = station_id_by_source.get(source_key)
+            if station_id is None:
+                # stored station first, then the ones created earlier in this batch
+                station_id = nearby_station_id_by_index.get(i)
+                if station_id is None:
+                    n = new_stations_grid.find_first(lon=station.coordinates.lon, lat=station.coordinates.lat)
+                    if n is not None:
+                        station_id = -(n + 1)
+                if station_id is None:
+                    new_stations.append(station)
+                    new_stations_grid.add(lon=station.coordinates.lon, lat=station.coordinates.lat)
+                    station_id = -len(new_stations)
+
+                station_id_by_source[source_key] = station_id
+                new_sources.append((station_id, station.source.inner_id, station.source.source))
+            station_ids.append(station_id)
+
+        return station_ids, new_stations, new_sources
+
+    @staticmethod
+    def _get_payload_hash(station: AddStation) -> str:
+        return hashlib.sha256(station.model_dump_json().encode()).hexdigest()
+
+    @staticmethod
+    def _drop_outdated(items: list[_T], get_time: Callable[[_T], datetime], watermark: datetime | None) -> list[_T]:
+        # older data is already stored, the dedup threshold keeps the ones that may still be new
+        if watermark is None:
+            return items
+        min_time = watermark - timedelta(seconds=DATETIME_THRESHOLD_SECONDS)
+        return [item for item in items if get_time(item).astimezone(UTC) >= min_time]
+
+    @staticmethod
+    def _get_watermark(times: list[datetime], watermark: datetime | None) -> datetime | None:
+        # naive datetimes are stored as local time, same as asyncpg does
+        times = [time.astimezone(UTC) for time in times]
+        if watermark:
+            times.append(watermark)
+        return max(times, default=None)
+
+    async def _add_stations_batch(self, stations: list[AddStation]) -> IngestStats:
+        # skip stations sent with the same payload as the last time,
+        # drop data older than the source watermarks of the others
+        stats = IngestStats(stations=len(stations))
+        stored_ingest_states = await self.stations_repo.get_ingest_states(
+            sources=[(station.source.source, station.source.inner_id) for station in stations]
+        )
+        ingest_states = {}
+        changed_stations = []
         for station in stations:
-            # try to find station by source
-            station_id = await self.stations_repo.get_station_id_by_source(
-                source=station.source.source, inner_id=station.source.inner_id
+            source_key = (station.source.source, station.source.inner_id)
+            payload_hash = self._get_payload_hash(station=station)
+            stored_ingest_state = stored_ingest_states.get(source_key)
+            if stored_ingest_state and stored_ingest_state['payload_hash'] == payload_hash:
+                stats.skipped += 1
+                continue
+
+            events = self._drop_outdated(
+                items=station.events or [],
+                get_time=lambda event: event.charged_at,
+                watermark=stored_ingest_state['events_watermark'] if stored_ingest_state else None
             )
-            if not station_id:
-                # try to find station by coordinates
-                station_id = await self.stations_repo.get_station_id_by_coordinates(
-                    lat=station.coordinates.lat, lon=station.coordinates.lon
-                )
-                if station_id:
-                    # station exists, add source
-                    await self.stations_repo.add_source(
-                        station_id=station_id,
-                        source=station.source.source,
-                        inner_id=station.source.inner_id
-                    )
-                else:
-                    # add new station with source
-                    station_id = await self.stations_repo.add_station(
-                        lat=station.coordinates.lat,
-                        lon=station.coordinates.lon,
-                        geo=station.geo,
-                        address=station.address,
-                        ocpi_ids=station.ocpi_ids,
-                        rating=station.rating
-                    )
-                    await self.stations_repo.add_source(
-                        station_id=station_id,
-                        source=station.source.source,
-                        inner_id=station.source.inner_id
-                    )
+            comments = self._drop_outdated(
+                items=station.comments or [],
+                get_time=lambda comment: comment.created_at,
+                watermark=stored_ingest_state['comments_watermark'] if stored_ingest_state else None
+            )
+            stats.outdated += len(station.events or []) - len(events) + len(station.comments or []) - len(comments)
+            changed_stations.append(station.model_copy(update={'events': events, 'comments': comments}))
 
-            # get already saved data
-            (
-                comment_rows_by_station_id,
-                event_rows_by_station_id,
-                charger_rows_by_station_id
-            ) = await self._get_station_extra_data(station_ids=[station_id])
-
-            presented_events = self._format_events(event_rows=event_rows_by_station_id.get(station_id, []))
-            presented_comments = self._format_comments(comment_rows=comment_rows_by_station_id.get(station_id, []))
-            presented_chargers = self._format_chargers(charger_rows=charger_rows_by_station_id.get(station_id, []))
-
-            # filter new data
-            events_to_add = filter_events(old_events=presented_events, new_events=station.events or [])
-            comments_to_add = filter_comments(old_comments=presented_comments, new_comments=station.comments or [])
-            chargers_to_add = filter_chargers(old_chargers=presented_chargers, new_chargers=station.chargers or [])
-
-            # add new data
-            async with asyncio.TaskGroup() as tg:
-                for event in events_to_add:
-                    tg.create_task(self.events_repo.add_event(
-                        station_id=station_id,
-                        source=event.source,
-                        charged_at=event.charged_at,
-                        name=event.name,
-                        is_problem=event.is_problem
-                        )
-                    )
+            # the last payload of a source repeated in the batch is stored
+            _, events_watermark, comments_watermark = ingest_states.get(source_key, (None, None, None))
+            ingest_states[source_key] = (
+                payload_hash,
+                self._get_watermark(times=[event.charged_at for event in events], watermark=events_watermark),
+                self._get_watermark(times=[comment.created_at for comment in comments], watermark=comments_watermark),
+            )
 
-                for comment in comments_to_add:
-                    tg.create_task(self.comments_repo.add_comment(
-                        station_id=station_id,
-                        text=comment.text,
-                        created_at=comment.created_at,
-                        user_name=comment.user_name,
-                        source=comment.source,
-                        rating=comment.rating
-                        )
-                    )
+        for chunk_stations, lock_keys in self._split_by_lock_keys(
+            stations=changed_stations,
+            max_locks=self.ingest_max_locks
+        ):
+            stats.add(await self._add_stations_chunk(
+                stations=chunk_stations,
+                lock_keys=lock_keys,
+                ingest_states={
+                    source_key: ingest_states[source_key]
+                    for source_key in {(station.source.source, station.source.inner_id) for station in chunk_stations}
+                }
+            ))
+        return stats
+
+    async def _add_stations_chunk(
+            self,
+            stations: list[AddStation],
+            lock_keys: list[int],
+            ingest_states: dict[tuple[str, int], tuple[str, datetime | None, datetime | None]],
+    ) -> IngestStats:
+        async with self.pool.acquire() as conn, conn.transaction():
+            # concurrent chunks with the same sources or nearby stations wait for each other
+            await self.stations_repo.lock_keys(conn=conn, keys=lock_keys)
+            station_ids, new_stations, new_sources = await self._resolve_station_ids(conn=conn, stations=stations)
 
-                for charger in chargers_to_add:
-                    tg.create_task(self.chargers_repo.add_charger(
-                        station_id=station_id,
-                        network=charger.network,
-                        ocpi_ids=charger.ocpi_ids
+            if new_stations:
+                new_station_ids = await self.stations_repo.allocate_station_ids(conn=conn, count=len(new_stations))
+                await self.stations_repo.add_stations(
+                    conn=conn,
+                    stations=[
+                        (
+                            station_id,
+                            station.coordinates.lon,
+                            station.coordinates.lat,
+                            station.rating,
+                            station.geo,
+                            station.address,
+                            station.ocpi_ids
                         )
-                    )
+                        for station_id, station in zip(new_station_ids, new_stations, strict=True)
+                    ]
+                )
+                # replace placeholders with the allocated ids
+                station_ids = [
+                    station_id if station_id > 0 else new_station_ids[-station_id - 1] for station_id in station_ids
+                ]
+                new_sources = [
+                    (station_id if station_id > 0 else new_station_ids[-station_id - 1], inner_id, source)
+                    for station_id, inner_id, source in new_sources
+                ]
+
+            if new_sources:
+                await self.stations_repo.add_sources(conn=conn, sources=new_sources)
+
+            stats = await self._add_children(
+                conn=conn,
+                events=[
+                    (station_id, event)
+                    for station_id, station in zip(station_ids, stations, strict=True)
+                    for event in station.events or []
+                ],
+                comments=[
+                    (station_id, comment)
+                    for station_id, station in zip(station_ids, stations, strict=True)
+                    for comment in station.comments or []
+                ],
+                chargers=[
+                    (station_id, charger)
+                    for station_id, station in zip(station_ids, stations, strict=True)
+                    for charger in station.chargers or []
+                ]
+            )
+            await self.stations_repo.update_ingest_states(
+                conn=conn,
+                ingest_states=[(*source_key, *ingest_state) for source_key, ingest_state in ingest_states.items()]
+            )
+
+        stats.new_stations = len(new_stations)
+        stats.new_sources = len(new_sources)
+        return stats
+
+    async def _add_children(
+            self,
+            conn: asyncpg.Connection,
+            events: list[tuple[int, Event]],
+            comments: list[tuple[int, AddComment]],
+            chargers: list[tuple[int, Charger]],
+    ) -> IngestStats:
+        # already stored data is skipped by the natural keys, last events are taken from the inserted rows only
+        stats = IngestStats()
+        added_events_by_station_id = defaultdict(list)
+        if events:
+            event_rows = await self.events_repo.add_events(
+                conn=conn,
+                events=[
+                    (station_id, event.source, event.charged_at, event.is_problem, event.name)
+                    for station_id, event in events
+                ]
+            )
+            stats.events = len(event_rows)
+            for row in event_rows:
+                added_events_by_station_id[row['station_id']].append(Event(
+                    charged_at=row['charged_at'],
+                    source=row['source'],
+                    name=row['name'],
+                    is_problem=row['is_problem']
+                ))
+
+        if comments:
+            stats.comments = await self.comments_repo.add_comments(
+                conn=conn,
+                comments=[
+                    (station_id, comment.text, comment.source, comment.created_at, comment.user_name, comment.rating)
+                    for station_id, comment in comments
+                ]
+            )
+
+        if chargers:
+            stats.chargers = await self.chargers_repo.add_chargers(
+                conn=conn,
+                chargers=[(station_id, charger.ocpi_ids, charger.network) for station_id, charger in chargers]
+            )
+
+        summaries = [
+            self._get_station_summary(station_id=station_id, added_events=added_events)
+            for station_id, added_events in added_events_by_station_id.items()
+        ]
+        if summaries:
+            await self.stations_repo.update_summaries(conn=conn, summaries=summaries)
+        return stats
+
+    @staticmethod
+    def _get_station_summary(station_id: int, added_events: list[Event]) -> tuple[int, datetime, dict]:
+        # `StationsRepository.update_summaries` row
+        # naive datetimes are stored as local time, same as asyncpg does
+        last_event = max(added_events, key=lambda event: event.charged_at.astimezone(UTC))
+        last_event_at = last_event.charged_at.astimezone(UTC)
+        return (
+            station_id,
+            last_event_at,
+            {
+                'charged_at': last_event_at.isoformat(),
+                'source': last_event.source,
+                'name': last_event.name,
+                'is_problem': last_event.is_problem,
+            }
+        )
@@ -1,11 +1,101 @@
+import asyncio
+
 import asyncpg
 
 from src.repositories.postgres.tokens import TokensRepository
+from src.utils.logging.logger import logger
+from src.utils.rate_limiter import RateLimiter
+from src.utils.token_cache import TokenCache
+from src.utils.token_usage_buffer import TokenUsageBuffer
+
+# retry after for requests rejected at the very end of the shared window
+MIN_RETRY_AFTER_SECONDS = 0.001
 
 
 class TokenServices:
-    def __init__(self, pool: asyncpg.Pool) -> None:
+    def __init__(
+            self,
+            pool: asyncpg.Pool,
+            cache: TokenCache | None = None,
+            usage_buffer: TokenUsageBuffer | None = None,
+            rate_limiter: RateLimiter | None = None,
+            rate_limit_shared_window_seconds: float = 0,
+    ) -> None:
         self._tokens_repo = TokensRepository(pool=pool)
+        self._cache = cache
+        self._usage_buffer = usage_buffer
+        self._rate_limiter = rate_limiter
+        self._rate_limit_shared_window_seconds = rate_limit_shared_window_seconds
+
+    async def check_token(self, token: str) -> tuple[bool, float]:
+        # (is existing, seconds to wait if the request is over the rate limit, 0 - request is allowed)
+        token = str(token)
+        if self._usage_buffer is None:
+            # every request is counted right away, nothing to cache
+            row = await self._tokens_repo.update_token_usage(token)
+            is_existing, rate_limit = self._parse_token_row(row)
+        else:
+            cached = self._cache.get(token) if self._cache else None
+            if cached is None:
+                row = await self._tokens_repo.get_by_api_key(token)
+                cached = self._parse_token_row(row)
+                if self._cache:
+                    self._cache.set(token, *cached)
+
+            is_existing, rate_limit = cached
+            if is_existing:
+                self._usage_buffer.add(token)
+
+        if not is_existing:
+            return False, 0
+        return True, await self._get_retry_after(token=token, rate_limit=rate_limit)
+
+    async def _get_retry_after(self, token: str, rate_limit: tuple[float | None, int | None]) -> float:
+        if self._rate_limiter is None:
+            return 0
+
+        rate_per_second, burst = self._rate_limiter.get_limits(*rate_limit)
+        retry_after = self._rate_limiter.acquire(key=token, rate_per_second=rate_per_second, burst=burst)
+        if retry_after or rate_per_second <= 0 or not self._rate_limit_shared_window_seconds:
+            return retry_after
+
+        # requests of all processes; the local bucket rejects bursts before they get to the db
+        window_seconds = self._rate_limit_shared_window_seconds
+        request_count, window_left_seconds = await self._tokens_repo.add_window_request(
+            token=token,
+            window_seconds=window_seconds
+        )
+        if request_count > max(burst, rate_per_second * window_seconds):
+            self._rate_limiter.rejected += 1
+            # rounding of the window start can leave nothing of the window at its edge,
+            # the rejected request still has to wait a bit
+            return max(window_left_seconds, MIN_RETRY_AFTER_SECONDS)
+        return 0
+
+    @staticmethod
+    def _parse_token_row(row: asyncpg.Record | None) -> tuple[bool, tuple[float | None, int | None]]:
+        if row is None:
+            return False, (None, None)
+        return True, (row['rate_limit_per_second'], row['rate_limit_burst'])
+
+    async def flush_usage(self) -> None:
+        # no buffer or nothing buffered
+        if not self._usage_buffer:
+            return
+
+        usages = self._usage_buffer.pop_all()
+        try:
+            await self._tokens_repo.add_usages(usages)
+        except BaseException:
+            # counts are kept for the next flush
+            for token, count, used_at in usages:
+                self._usage_buffer.add(token, count=count, used_at=used_at)
+            raise
 
-    async def is_existing_token(self, token: str) -> bool:
-        return await self._tokens_repo.is_existing_token(str(token))
+    async def run_usage_flusher(self, interval_seconds: float) -> None:
+        while True:
+            await asyncio.sleep(interval_seconds)
+            try:
+                await self.flush_usage()
+            except Exception as e:
+                logger.error(e, exc_info=True)
@@ -0,0 +1,8 @@
+import hashlib
+
+
+# bigint key of a postgres advisory lock, parts are joined into the lock name
+def advisory_lock_key(*parts: object) -> int:
+    digest = hashlib.blake2b(':'.join(map(str, parts)).encode(), digest_size=8).digest()
+    return int.from_bytes(digest, 'big', signed=True)
+
@@ -0,0 +1,97 @@
+import math
+import time
+from collections import OrderedDict
+from collections.abc import Hashable
+
+from src.api.routers.v1.models import AreaRequest
+from src.utils.spatial_index import BoxesIndex
+
+
+class AreaCache:
+    # LRU cache with TTL of serialized responses for an area;
+    # areas are snapped outwards to the grid, so close viewports share the same entries
+    def __init__(self, max_size: int, ttl_seconds: float, grid_size: float) -> None:
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.grid_size = grid_size
+        # incremented on every invalidation; responses built before it are not cached
+        self.version = 0
+
+        self.hits = 0
+        self.misses = 0
+        # entries removed because of max size or ttl
+        self.evictions = 0
+        # entries removed because stations in their area were changed
+        self.invalidations = 0
+
+        # key -> (expires_at, area bbox, content)
+        self._entries: OrderedDict[Hashable, tuple[float, tuple[float, float, float, float], bytes]] = OrderedDict()
+        # keys of the entries by their area, invalidation looks only at the ones around the changed stations
+        self._index = BoxesIndex()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def snap(self, area: AreaRequest) -> AreaRequest:
+        return AreaRequest(
+            sw_lat=max(self._snap_down(area.sw_lat), -90),
+            sw_lon=max(self._snap_down(area.sw_lon), -180),
+            ne_lat=min(self._snap_up(area.ne_lat), 90),
+            ne_lon=min(self._snap_up(area.ne_lon), 180),
+        )
+
+    def get(self, area: AreaRequest, params: Hashable) -> bytes | None:
+        key = (self._bbox(area), params)
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        expires_at, _, content = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            self._index.remove(key)
+            self.evictions += 1
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return content
+
+    def set(self, area: AreaRequest, params: Hashable, content: bytes, version: int) -> None:
+        if version != self.version or self.max_size <= 0:
+            # content could be built from data changed after that
+            return
+
+        bbox = self._bbox(area)
+        self._entries[(bbox, params)] = (time.monotonic() + self.ttl_seconds, bbox, content)
+        self._entries.move_to_end((bbox, params))
+        self._index.add((bbox, params), bbox)
+
+        while len(self._entries) > self.max_size:
+            evicted_key, _ = self._entries.popitem(last=False)
+            self._index.remove(evicted_key)
+            self.evictions += 1
+
+    def invalidate_areas(self, bboxes: list[tuple[float, float, float, float]]) -> None:
+        self.version += 1
+        if not self._entries or not bboxes:
+            return
+
+        keys = set().union(*(self._index.find_intersecting(bbox) for bbox in bboxes))
+        for key in keys:
+            del self._entries[key]
+            self._index.remove(key)
+        self.invalidations += len(keys)
+
+    def _snap_down(self, value: float) -> float:
+        # tolerance for values already on the grid, like 0.3 / 0.1 = 2.9999999999999996
+        return math.floor(value / self.grid_size + 1e-9) * self.grid_size
+
+    def _snap_up(self, value: float) -> float:
+        return math.ceil(value / self.grid_size - 1e-9) * self.grid_size
+
+    @staticmethod
+    def _bbox(area: AreaRequest) -> tuple[float, float, float, float]:
+        return area.sw_lon, area.sw_lat, area.ne_lon, area.ne_lat
@@ -7,3 +7,13 @@ def calculate_average_rating(comments_rating: list[int]) -> float | None:
         return float(format(average_rating, '.1f'))
     else:
         return None
+
+
+def calculate_average_rating_from_sum(comments_rating_sum: int, comments_rating_count: int) -> float | None:
+    # Same linear transformation as in `calculate_average_rating`, applied to the sum of scores
+    if not comments_rating_count:
+        return None
+
+    ratings_sum = ((comments_rating_sum + comments_rating_count) / 2) * 9 + comments_rating_count
+    average_rating = ratings_sum / comments_rating_count
+    return float(format(average_rating, '.1f'))
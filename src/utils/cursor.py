@@ -0,0 +1,23 @@
+import base64
+import binascii
+
+# station ids are postgres integers
+MAX_STATION_ID = 2 ** 31 - 1
+
+
+def encode_cursor(station_id: int) -> str:
+    return base64.urlsafe_b64encode(str(station_id).encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str) -> int:
+    # restore padding stripped in `encode_cursor`; only cursors `encode_cursor` could return are accepted:
+    # no characters outside the alphabet, no signs, spaces, underscores or leading zeros in the id
+    padded_cursor = cursor + '=' * (-len(cursor) % 4)
+    try:
+        value = base64.b64decode(padded_cursor.encode(), altchars=b'-_', validate=True).decode('ascii')
+    except (binascii.Error, UnicodeError, ValueError) as e:
+        raise ValueError('Invalid cursor') from e
+
+    if not value.isdigit() or value != str(int(value)) or int(value) > MAX_STATION_ID:
+        raise ValueError('Invalid cursor')
+    return int(value)
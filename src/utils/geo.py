@@ -0,0 +1,103 @@
+import math
+
+EARTH_RADIUS_METERS = 6_371_008.8
+METERS_PER_DEGREE = 2 * math.pi * EARTH_RADIUS_METERS / 360
+
+# WGS 84 spheroid, postgis measures geography distances on it
+WGS84_SEMI_MAJOR_AXIS_METERS = 6_378_137.0
+WGS84_FLATTENING = 1 / 298.257223563
+WGS84_SEMI_MINOR_AXIS_METERS = WGS84_SEMI_MAJOR_AXIS_METERS * (1 - WGS84_FLATTENING)
+
+# web mercator latitude limits
+MAX_LAT = 85.05112878
+
+
+# postgis measures geography distances on the spheroid, they differ from the spherical ones by up to ~0.5%
+SPHEROID_DISTANCE_PADDING = 1.01
+
+
+# (min_lon, min_lat, max_lon, max_lat) boxes containing all points within the distance,
+# the area crossing the antimeridian is split into two boxes on both sides of it
+def bboxes_around(lon: float, lat: float, distance_meters: float) -> list[tuple[float, float, float, float]]:
+    distance_meters *= SPHEROID_DISTANCE_PADDING
+    lat_delta = distance_meters / METERS_PER_DEGREE
+    # longitude degrees shrink towards the poles; near them the box covers all longitudes
+    cos_lat = math.cos(math.radians(min(abs(lat) + lat_delta, 90)))
+    lon_delta = distance_meters / (METERS_PER_DEGREE * cos_lat) if cos_lat > 1e-6 else 360
+
+    min_lat = max(lat - lat_delta, -90)
+    max_lat = min(lat + lat_delta, 90)
+    if lon_delta >= 180:
+        return [(-180, min_lat, 180, max_lat)]
+
+    min_lon = lon - lon_delta
+    max_lon = lon + lon_delta
+    if min_lon < -180:
+        return [(-180, min_lat, max_lon, max_lat), (min_lon + 360, min_lat, 180, max_lat)]
+    if max_lon > 180:
+        return [(min_lon, min_lat, 180, max_lat), (-180, min_lat, max_lon - 360, max_lat)]
+    return [(min_lon, min_lat, max_lon, max_lat)]
+
+
+# (x, y) of the web mercator (slippy map) tile containing the point
+def lon_lat_to_tile(lon: float, lat: float, zoom: int) -> tuple[int, int]:
+    tiles_count = 2 ** zoom
+    lat = max(min(lat, MAX_LAT), -MAX_LAT)
+
+    x = int((lon + 180) / 360 * tiles_count)
+    y = int((1 - math.asinh(math.tan(math.radians(lat))) / math.pi) / 2 * tiles_count)
+    return min(max(x, 0), tiles_count - 1), min(max(y, 0), tiles_count - 1)
+
+
+# great-circle distance between two points
+def distance_meters(lon_1: float, lat_1: float, lon_2: float, lat_2: float) -> float:
+    lon_1, lat_1, lon_2, lat_2 = map(math.radians, (lon_1, lat_1, lon_2, lat_2))
+    a = (
+        math.sin((lat_2 - lat_1) / 2) ** 2
+        + math.cos(lat_1) * math.cos(lat_2) * math.sin((lon_2 - lon_1) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_METERS * math.asin(min(math.sqrt(a), 1))
+
+
+# geodesic distance on the WGS 84 spheroid (Vincenty's inverse formula), same as ST_Distance / ST_DWithin
+# of geography points; falls back to the great-circle one for nearly antipodal points it doesn't converge for
+def spheroid_distance_meters(lon_1: float, lat_1: float, lon_2: float, lat_2: float) -> float:
+    a, b, f = WGS84_SEMI_MAJOR_AXIS_METERS, WGS84_SEMI_MINOR_AXIS_METERS, WGS84_FLATTENING
+    u_1 = math.atan((1 - f) * math.tan(math.radians(lat_1)))
+    u_2 = math.atan((1 - f) * math.tan(math.radians(lat_2)))
+    sin_u_1, cos_u_1 = math.sin(u_1), math.cos(u_1)
+    sin_u_2, cos_u_2 = math.sin(u_2), math.cos(u_2)
+
+    lon_delta = math.radians(lon_2 - lon_1)
+    lambda_ = lon_delta
+    for _ in range(100):
+        sin_lambda, cos_lambda = math.sin(lambda_), math.cos(lambda_)
+        sin_sigma = math.hypot(cos_u_2 * sin_lambda, cos_u_1 * sin_u_2 - sin_u_1 * cos_u_2 * cos_lambda)
+        if sin_sigma == 0:
+            return 0.0
+        cos_sigma = sin_u_1 * sin_u_2 + cos_u_1 * cos_u_2 * cos_lambda
+        sigma = math.atan2(sin_sigma, cos_sigma)
+        sin_alpha = cos_u_1 * cos_u_2 * sin_lambda / sin_sigma
+        cos_sq_alpha = 1 - sin_alpha ** 2
+        # points on the equator
+        cos_2_sigma_m = cos_sigma - 2 * sin_u_1 * sin_u_2 / cos_sq_alpha if cos_sq_alpha else 0
+        c = f / 16 * cos_sq_alpha * (4 + f * (4 - 3 * cos_sq_alpha))
+        previous_lambda = lambda_
+        lambda_ = lon_delta + (1 - c) * f * sin_alpha * (
+            sigma + c * sin_sigma * (cos_2_sigma_m + c * cos_sigma * (-1 + 2 * cos_2_sigma_m ** 2))
+        )
+        if abs(lambda_ - previous_lambda) < 1e-12:
+            break
+    else:
+        return distance_meters(lon_1, lat_1, lon_2, lat_2)
+
+    u_sq = cos_sq_alpha * (a ** 2 - b ** 2) / b ** 2
+    big_a = 1 + u_sq / 16384 * (4096 + u_sq * (-768 + u_sq * (320 - 175 * u_sq)))
+    big_b = u_sq / 1024 * (256 + u_sq * (-128 + u_sq * (74 - 47 * u_sq)))
+    sigma_delta = big_b * sin_sigma * (
+        cos_2_sigma_m + big_b / 4 * (
+            cos_sigma * (-1 + 2 * cos_2_sigma_m ** 2)
+            - big_b / 6 * cos_2_sigma_m * (-3 + 4 * sin_sigma ** 2) * (-3 + 4 * cos_2_sigma_m ** 2)
+        )
+    )
+    return b * big_a * (sigma - sigma_delta)
@@ -0,0 +1,47 @@
+from itertools import product
+
+_BASE32 = '0123456789bcdefghjkmnpqrstuvwxyz'
+
+
+# geohash cells form a regular grid: 5 bits per char, longitude takes the even bits
+def _grid_bits(precision: int) -> tuple[int, int]:
+    return (5 * precision + 1) // 2, 5 * precision // 2
+
+
+def _grid_index(value: float, min_value: float, max_value: float, bits: int) -> int:
+    index = int((value - min_value) / (max_value - min_value) * 2 ** bits)
+    return min(max(index, 0), 2 ** bits - 1)
+
+
+def _encode_grid_index(lon_index: int, lat_index: int, precision: int) -> str:
+    lon_bits, lat_bits = _grid_bits(precision)
+    code = 0
+    for bit in range(5 * precision):
+        if bit % 2 == 0:
+            lon_bits -= 1
+            code = code << 1 | (lon_index >> lon_bits) & 1
+        else:
+            lat_bits -= 1
+            code = code << 1 | (lat_index >> lat_bits) & 1
+
+    return ''.join(_BASE32[(code >> shift) & 31] for shift in range(5 * (precision - 1), -1, -5))
+
+
+def encode(lon: float, lat: float, precision: int) -> str:
+    lon_bits, lat_bits = _grid_bits(precision)
+    return _encode_grid_index(
+        lon_index=_grid_index(lon, -180, 180, lon_bits),
+        lat_index=_grid_index(lat, -90, 90, lat_bits),
+        precision=precision
+    )
+
+
+# geohashes of all cells intersecting the box
+def cells_in_bbox(min_lon: float, min_lat: float, max_lon: float, max_lat: float, precision: int) -> list[str]:
+    lon_bits, lat_bits = _grid_bits(precision)
+    lon_indexes = range(_grid_index(min_lon, -180, 180, lon_bits), _grid_index(max_lon, -180, 180, lon_bits) + 1)
+    lat_indexes = range(_grid_index(min_lat, -90, 90, lat_bits), _grid_index(max_lat, -90, 90, lat_bits) + 1)
+    return [
+        _encode_grid_index(lon_index=lon_index, lat_index=lat_index, precision=precision)
+        for lon_index, lat_index in product(lon_indexes, lat_indexes)
+    ]
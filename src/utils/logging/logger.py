@@ -1,12 +1,33 @@
-import logging
-
-from src.utils.logging.formatter import JsonFormatter
-
-logger = logging.getLogger(__name__)
-formatter = JsonFormatter()
-
-console_handler = logging.StreamHandler()
-console_handler.setFormatter(formatter)
-logger.addHandler(console_handler)
-
-logger.setLevel(logging.INFO)
+import atexit
+import copy
+import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
+
+from src.utils.logging.formatter import JsonFormatter
+
+
+class _QueueHandler(QueueHandler):
+    # records are formatted by the listener thread; only the message args are merged here,
+    # so that their later changes don't affect the message
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+logger = logging.getLogger(__name__)
+formatter = JsonFormatter()
+
+console_handler = logging.StreamHandler()
+console_handler.setFormatter(formatter)
+
+# formatting and writing to stdout are done off the event loop
+log_queue = queue.SimpleQueue()
+logger.addHandler(_QueueHandler(log_queue))
+log_listener = QueueListener(log_queue, console_handler)
+log_listener.start()
+atexit.register(log_listener.stop)
+
+logger.setLevel(logging.INFO)
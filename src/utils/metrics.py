@@ -0,0 +1,112 @@
+import bisect
+import math
+
+# seconds
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+# metrics created with the default registry, rendered by the /metrics endpoint
+REGISTRY: list['Metric'] = []
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return '+Inf' if value > 0 else '-Inf'
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def _format_labels(label_names: tuple[str, ...], label_values: tuple[str, ...]) -> str:
+    if not label_names:
+        return ''
+    labels = ','.join(
+        '{}="{}"'.format(name, str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n'))
+        for name, value in zip(label_names, label_values, strict=True)
+    )
+    return f'{{{labels}}}'
+
+
+class Metric:
+    # prometheus text format metric; label values are passed positionally in the `label_names` order
+    type = 'untyped'
+
+    def __init__(
+            self,
+            name: str,
+            documentation: str,
+            label_names: tuple[str, ...] = (),
+            registry: list['Metric'] | None = REGISTRY,
+    ) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.label_names = label_names
+        self._values: dict[tuple[str, ...], float] = {}
+        if registry is not None:
+            registry.append(self)
+
+    def render(self) -> str:
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} {self.type}']
+        lines.extend(self._render_samples())
+        return '\n'.join(lines)
+
+    def _render_samples(self) -> list[str]:
+        return [
+            f'{self.name}{_format_labels(self.label_names, label_values)} {_format_value(value)}'
+            for label_values, value in self._values.items()
+        ]
+
+
+class Counter(Metric):
+    type = 'counter'
+
+    def inc(self, *label_values: str, value: float = 1) -> None:
+        self._values[label_values] = self._values.get(label_values, 0) + value
+
+
+class Gauge(Metric):
+    type = 'gauge'
+
+    def set(self, value: float, *label_values: str) -> None:
+        self._values[label_values] = value
+
+
+class Histogram(Metric):
+    type = 'histogram'
+
+    def __init__(
+            self,
+            name: str,
+            documentation: str,
+            label_names: tuple[str, ...] = (),
+            buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+            registry: list['Metric'] | None = REGISTRY,
+    ) -> None:
+        super().__init__(name=name, documentation=documentation, label_names=label_names, registry=registry)
+        self.buckets = buckets
+        # label values -> (observations count of each bucket and +Inf, not cumulative; sum)
+        self._series: dict[tuple[str, ...], tuple[list[int], list[float]]] = {}
+
+    def observe(self, value: float, *label_values: str) -> None:
+        series = self._series.get(label_values)
+        if series is None:
+            series = self._series[label_values] = ([0] * (len(self.buckets) + 1), [0.0])
+        counts, total = series
+        # bucket upper bounds are inclusive
+        counts[bisect.bisect_left(self.buckets, value)] += 1
+        total[0] += value
+
+    def _render_samples(self) -> list[str]:
+        lines = []
+        label_names = (*self.label_names, 'le')
+        for label_values, (counts, total) in self._series.items():
+            cumulative_count = 0
+            for bound, count in zip((*self.buckets, math.inf), counts, strict=True):
+                cumulative_count += count
+                labels = _format_labels(label_names, (*label_values, _format_value(bound)))
+                lines.append(f'{self.name}_bucket{labels} {cumulative_count}')
+            labels = _format_labels(self.label_names, label_values)
+            lines.append(f'{self.name}_sum{labels} {_format_value(total[0])}')
+            lines.append(f'{self.name}_count{labels} {cumulative_count}')
+        return lines
+
+
+def render_metrics(metrics: list[Metric]) -> str:
+    return '\n'.join(metric.render() for metric in metrics) + '\n'
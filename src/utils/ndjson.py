@@ -0,0 +1,25 @@
+from collections.abc import AsyncIterator
+
+
+class LineTooLongError(ValueError):
+    pass
+
+
+# non empty lines of the byte stream with their 1-based numbers, at most one line is kept in memory
+async def iter_ndjson_lines(chunks: AsyncIterator[bytes], max_line_bytes: int) -> AsyncIterator[tuple[int, bytes]]:
+    buffer = b''
+    line_number = 0
+    async for chunk in chunks:
+        *lines, buffer = (buffer + chunk).split(b'\n')
+        for line in lines:
+            line_number += 1
+            if len(line) > max_line_bytes:
+                raise LineTooLongError(f'Line {line_number} is longer than {max_line_bytes} bytes')
+            if line.strip():
+                yield line_number, line
+
+        if len(buffer) > max_line_bytes:
+            raise LineTooLongError(f'Line {line_number + 1} is longer than {max_line_bytes} bytes')
+
+    if buffer.strip():
+        yield line_number + 1, buffer
@@ -0,0 +1,42 @@
+import time
+
+
+class RateLimiter:
+    # token buckets keyed by api key: a bucket holds up to `burst` requests
+    # and is refilled with `rate_per_second` requests per second
+    def __init__(self, default_rate_per_second: float, default_burst: int) -> None:
+        # 0 - no limit for api keys without their own one
+        self.default_rate_per_second = default_rate_per_second
+        self.default_burst = default_burst
+
+        self.rejected = 0
+
+        # api key -> (available requests, updated_at)
+        self._buckets: dict[str, tuple[float, float]] = {}
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+    def get_limits(self, rate_per_second: float | None, burst: int | None) -> tuple[float, int]:
+        # own limits of the api key with the defaults instead of missing ones
+        if rate_per_second is None:
+            rate_per_second = self.default_rate_per_second
+        if burst is None:
+            burst = self.default_burst
+        return rate_per_second, max(burst, 1)
+
+    def acquire(self, key: str, rate_per_second: float, burst: int) -> float:
+        # seconds to wait until the next request is allowed, 0 - the request is allowed and counted
+        if rate_per_second <= 0:
+            return 0
+
+        now = time.monotonic()
+        available, updated_at = self._buckets.get(key, (burst, now))
+        available = min(burst, available + (now - updated_at) * rate_per_second)
+        if available >= 1:
+            self._buckets[key] = (available - 1, now)
+            return 0
+
+        self._buckets[key] = (available, now)
+        self.rejected += 1
+        return (1 - available) / rate_per_second
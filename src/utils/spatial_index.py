@@ -0,0 +1,134 @@
+import math
+from collections import defaultdict
+from collections.abc import Hashable
+from itertools import product
+
+from src.utils.geo import EARTH_RADIUS_METERS, SPHEROID_DISTANCE_PADDING, distance_meters, spheroid_distance_meters
+
+
+# points on the sphere bucketed into cubes with the side of the search distance padded for the spheroid;
+# cartesian cells have no special cases at the antimeridian and near the poles
+class PointsGrid:
+    def __init__(self, max_distance_meters: float) -> None:
+        self.max_distance_meters = max_distance_meters
+        self._cell_size_meters = max_distance_meters * SPHEROID_DISTANCE_PADDING
+        self._points: list[tuple[float, float]] = []
+        self._cells: dict[tuple[int, int, int], list[int]] = defaultdict(list)
+
+    def __len__(self) -> int:
+        return len(self._points)
+
+    def _get_cell(self, lon: float, lat: float) -> tuple[int, int, int]:
+        lon, lat = math.radians(lon), math.radians(lat)
+        x = EARTH_RADIUS_METERS * math.cos(lat) * math.cos(lon)
+        y = EARTH_RADIUS_METERS * math.cos(lat) * math.sin(lon)
+        z = EARTH_RADIUS_METERS * math.sin(lat)
+        return (
+            math.floor(x / self._cell_size_meters),
+            math.floor(y / self._cell_size_meters),
+            math.floor(z / self._cell_size_meters),
+        )
+
+    # index of the added point, indexes go in the insertion order
+    def add(self, lon: float, lat: float) -> int:
+        index = len(self._points)
+        self._points.append((lon, lat))
+        self._cells[self._get_cell(lon=lon, lat=lat)].append(index)
+        return index
+
+    # first added point within the distance on the spheroid, same as ST_DWithin matching stored stations
+    def find_first(self, lon: float, lat: float) -> int | None:
+        # straight-line distance is never longer than the great-circle one, which is within the padding
+        # of the spheroid one, so all points within the distance are in the neighbouring cells;
+        # the cheap great-circle distance filters out the far points before the exact check
+        x, y, z = self._get_cell(lon=lon, lat=lat)
+        found = None
+        for dx, dy, dz in product((-1, 0, 1), repeat=3):
+            for index in self._cells.get((x + dx, y + dy, z + dz), ()):
+                if found is not None and index > found:
+                    break
+                point_lon, point_lat = self._points[index]
+                if (
+                    distance_meters(lon, lat, point_lon, point_lat) <= self._cell_size_meters
+                    and spheroid_distance_meters(lon, lat, point_lon, point_lat) <= self.max_distance_meters
+                ):
+                    found = index
+                    break
+        return found
+
+
+# keys of (min_lon, min_lat, max_lon, max_lat) boxes bucketed into grid levels: a box goes to the finest level
+# where it covers at most 2 x 2 cells, so the boxes intersecting a small one are found in a few cells per level
+class BoxesIndex:
+    MAX_LEVEL = 24
+
+    def __init__(self) -> None:
+        self._cells: dict[tuple[int, int, int], set[Hashable]] = defaultdict(set)
+        self._keys_by_level: dict[int, set[Hashable]] = defaultdict(set)
+        # key -> (box, level)
+        self._boxes: dict[Hashable, tuple[tuple[float, float, float, float], int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._boxes)
+
+    @classmethod
+    def _get_level(cls, box: tuple[float, float, float, float]) -> int:
+        min_lon, min_lat, max_lon, max_lat = box
+        size = max(max_lon - min_lon, max_lat - min_lat)
+        level = 0
+        while level < cls.MAX_LEVEL and 360 / 2 ** (level + 1) >= size:
+            level += 1
+        return level
+
+    @staticmethod
+    def _get_cell_ranges(box: tuple[float, float, float, float], level: int) -> tuple[range, range]:
+        min_lon, min_lat, max_lon, max_lat = box
+        cell_size = 360 / 2 ** level
+        return (
+            range(math.floor((min_lon + 180) / cell_size), math.floor((max_lon + 180) / cell_size) + 1),
+            range(math.floor((min_lat + 90) / cell_size), math.floor((max_lat + 90) / cell_size) + 1),
+        )
+
+    def add(self, key: Hashable, box: tuple[float, float, float, float]) -> None:
+        self.remove(key)
+        level = self._get_level(box)
+        self._boxes[key] = (box, level)
+        self._keys_by_level[level].add(key)
+        x_range, y_range = self._get_cell_ranges(box, level)
+        for x, y in product(x_range, y_range):
+            self._cells[(level, x, y)].add(key)
+
+    def remove(self, key: Hashable) -> None:
+        if key not in self._boxes:
+            return
+
+        box, level = self._boxes.pop(key)
+        self._keys_by_level[level].discard(key)
+        if not self._keys_by_level[level]:
+            del self._keys_by_level[level]
+        x_range, y_range = self._get_cell_ranges(box, level)
+        for x, y in product(x_range, y_range):
+            keys = self._cells[(level, x, y)]
+            keys.discard(key)
+            if not keys:
+                del self._cells[(level, x, y)]
+
+    def find_intersecting(self, box: tuple[float, float, float, float]) -> set[Hashable]:
+        candidates = set()
+        for level, level_keys in self._keys_by_level.items():
+            x_range, y_range = self._get_cell_ranges(box, level)
+            if len(x_range) * len(y_range) > len(level_keys):
+                # a large box at a fine level, fewer keys than cells to look at
+                candidates.update(level_keys)
+            else:
+                for x, y in product(x_range, y_range):
+                    candidates.update(self._cells.get((level, x, y), ()))
+
+        return {key for key in candidates if self._is_intersected(self._boxes[key][0], box)}
+
+    @staticmethod
+    def _is_intersected(box_1: tuple[float, float, float, float], box_2: tuple[float, float, float, float]) -> bool:
+        return (
+            box_1[0] <= box_2[2] and box_2[0] <= box_1[2]
+            and box_1[1] <= box_2[3] and box_2[1] <= box_1[3]
+        )
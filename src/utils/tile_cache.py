@@ -0,0 +1,86 @@
+import time
+from collections import Counter, OrderedDict
+
+from src.utils.geo import lon_lat_to_tile
+
+MAX_ZOOM = 22
+
+
+class TileCache:
+    # LRU cache with TTL of rendered tiles keyed by (z, x, y);
+    # the ttl bounds staleness of tiles missed by the invalidation, e.g. changed by other app processes
+    def __init__(self, max_size: int, ttl_seconds: float) -> None:
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        # incremented on every invalidation; tiles rendered before it are not cached
+        self.version = 0
+
+        self.hits = 0
+        self.misses = 0
+
+        # (z, x, y) -> (expires_at, tile)
+        self._tiles: OrderedDict[tuple[int, int, int], tuple[float, bytes]] = OrderedDict()
+        self._tiles_count_by_zoom: Counter[int] = Counter()
+
+    def __len__(self) -> int:
+        return len(self._tiles)
+
+    def get(self, z: int, x: int, y: int) -> bytes | None:
+        entry = self._tiles.get((z, x, y))
+        if entry is None:
+            self.misses += 1
+            return None
+
+        expires_at, tile = entry
+        if expires_at <= time.monotonic():
+            del self._tiles[(z, x, y)]
+            self._remove_zoom(z)
+            self.misses += 1
+            return None
+
+        self._tiles.move_to_end((z, x, y))
+        self.hits += 1
+        return tile
+
+    def set(self, z: int, x: int, y: int, tile: bytes, version: int) -> None:
+        if version != self.version or self.max_size <= 0:
+            # tile could be rendered from data changed after that
+            return
+
+        if (z, x, y) not in self._tiles:
+            self._tiles_count_by_zoom[z] += 1
+        self._tiles[(z, x, y)] = (time.monotonic() + self.ttl_seconds, tile)
+        self._tiles.move_to_end((z, x, y))
+
+        while len(self._tiles) > self.max_size:
+            (evicted_z, _, _), _ = self._tiles.popitem(last=False)
+            self._remove_zoom(evicted_z)
+
+    def invalidate_areas(self, bboxes: list[tuple[float, float, float, float]]) -> None:
+        # one version bump for all the areas of a changed batch
+        self.version += 1
+
+        for bbox in bboxes:
+            self._invalidate_area(*bbox)
+
+    def _invalidate_area(self, min_lon: float, min_lat: float, max_lon: float, max_lat: float) -> None:
+        for z in list(self._tiles_count_by_zoom):
+            min_x, min_y = lon_lat_to_tile(lon=min_lon, lat=max_lat, zoom=z)
+            max_x, max_y = lon_lat_to_tile(lon=max_lon, lat=min_lat, zoom=z)
+
+            if (max_x - min_x + 1) * (max_y - min_y + 1) > self._tiles_count_by_zoom[z]:
+                keys = [
+                    key for key in self._tiles
+                    if key[0] == z and min_x <= key[1] <= max_x and min_y <= key[2] <= max_y
+                ]
+            else:
+                keys = [(z, x, y) for x in range(min_x, max_x + 1) for y in range(min_y, max_y + 1)]
+
+            for key in keys:
+                if self._tiles.pop(key, None) is not None:
+                    self._remove_zoom(z)
+
+    def _remove_zoom(self, z: int) -> None:
+        self._tiles_count_by_zoom[z] -= 1
+        if not self._tiles_count_by_zoom[z]:
+            del self._tiles_count_by_zoom[z]
@@ -0,0 +1,45 @@
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+
+# seconds spent in each step of the current request, None - timing is off;
+# tasks started by the request copy the context and share the same dict
+_timings: ContextVar[dict[str, float] | None] = ContextVar('timings', default=None)
+
+
+def start_timing() -> Token:
+    return _timings.set({})
+
+
+def stop_timing(token: Token) -> None:
+    _timings.reset(token)
+
+
+def get_timings() -> dict[str, float] | None:
+    return _timings.get()
+
+
+def add_timing(name: str, duration: float) -> None:
+    # repeated steps are summed up
+    timings = _timings.get()
+    if timings is not None:
+        timings[name] = timings.get(name, 0) + duration
+
+
+@contextmanager
+def timed(name: str) -> Iterator[None]:
+    if _timings.get() is None:
+        yield
+        return
+
+    started_at = time.perf_counter()
+    try:
+        yield
+    finally:
+        add_timing(name, time.perf_counter() - started_at)
+
+
+# `Server-Timing` header value, durations in milliseconds
+def format_server_timing(timings: dict[str, float]) -> str:
+    return ', '.join(f'{name};dur={duration * 1000:.1f}' for name, duration in timings.items())
@@ -0,0 +1,51 @@
+import time
+from collections import OrderedDict
+
+
+class TokenCache:
+    # LRU cache with TTL of api key checks and their own rate limits (requests per second, burst);
+    # a revoked key keeps working until its entry expires,
+    # unknown keys are cached for a shorter time so that a newly added key starts working soon
+    def __init__(self, max_size: int, ttl_seconds: float, negative_ttl_seconds: float) -> None:
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.negative_ttl_seconds = negative_ttl_seconds
+
+        self.hits = 0
+        self.misses = 0
+
+        # api key -> (expires_at, is_existing, rate limit)
+        self._entries: OrderedDict[str, tuple[float, bool, tuple[float | None, int | None]]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, token: str) -> tuple[bool, tuple[float | None, int | None]] | None:
+        # (is existing, rate limit), None if the key is not checked yet or the check is expired
+        entry = self._entries.get(token)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        expires_at, is_existing, rate_limit = entry
+        if expires_at <= time.monotonic():
+            del self._entries[token]
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(token)
+        self.hits += 1
+        return is_existing, rate_limit
+
+    def set(
+            self,
+            token: str,
+            is_existing: bool,
+            rate_limit: tuple[float | None, int | None] = (None, None)
+    ) -> None:
+        ttl_seconds = self.ttl_seconds if is_existing else self.negative_ttl_seconds
+        self._entries[token] = (time.monotonic() + ttl_seconds, is_existing, rate_limit)
+        self._entries.move_to_end(token)
+
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
@@ -0,0 +1,23 @@
+from datetime import UTC, datetime
+
+
+class TokenUsageBuffer:
+    # request counts of api keys accumulated in memory to be stored in one batch
+    def __init__(self) -> None:
+        # api key -> (request count, last used at)
+        self._usages: dict[str, tuple[int, datetime]] = {}
+
+    def __len__(self) -> int:
+        return len(self._usages)
+
+    def add(self, token: str, count: int = 1, used_at: datetime | None = None) -> None:
+        used_at = used_at or datetime.now(UTC)
+        if token in self._usages:
+            stored_count, stored_used_at = self._usages[token]
+            count, used_at = stored_count + count, max(stored_used_at, used_at)
+        self._usages[token] = (count, used_at)
+
+    def pop_all(self) -> list[tuple[str, int, datetime]]:
+        # (api key, request count, last used at) of all keys, the buffer is emptied
+        usages, self._usages = self._usages, {}
+        return [(token, count, used_at) for token, (count, used_at) in usages.items()]
@@ -0,0 +1,73 @@
+from unittest import mock
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.api.middlewares.logger import LoggerMiddleware
+
+
+def _create_app(success_sample_rate: float) -> FastAPI:
+    app = FastAPI()
+
+    @app.get('/items/{item_id}')
+    async def get_item(item_id: int) -> dict:
+        return {'item_id': item_id}
+
+    @app.get('/error')
+    async def get_error() -> None:
+        raise ValueError('error')
+
+    app.add_middleware(LoggerMiddleware, success_sample_rate=success_sample_rate)
+    return app
+
+
+def test_logger_middleware() -> None:
+    # arrange
+    client = TestClient(_create_app(success_sample_rate=1))
+
+    # act
+    with mock.patch('src.api.middlewares.logger.logger') as logger:
+        resp = client.get('/items/1', params={'q': 'query'})
+
+    # assert
+    assert resp.status_code == 200
+    request_log = logger.info.call_args.kwargs['extra']['extra']
+    assert request_log['duration_ms'] >= 0
+    assert request_log | {'duration_ms': 0} == {
+        'method': 'GET',
+        'url': '/items/1',
+        'route': '/items/{item_id}',
+        'query-params': {'q': 'query'},
+        'path_params': {'item_id': '1'},
+        'status': 200,
+        'duration_ms': 0,
+    }
+
+
+def test_logger_middleware__success_sampled_out() -> None:
+    # arrange
+    client = TestClient(_create_app(success_sample_rate=0))
+
+    # act
+    with mock.patch('src.api.middlewares.logger.logger') as logger:
+        ok_resp = client.get('/items/1')
+        not_found_resp = client.get('/unknown')
+
+    # assert
+    assert (ok_resp.status_code, not_found_resp.status_code) == (200, 404)
+    assert logger.info.call_count == 1
+    assert logger.info.call_args.kwargs['extra']['extra']['status'] == 404
+
+
+def test_logger_middleware__error() -> None:
+    # arrange
+    client = TestClient(_create_app(success_sample_rate=0))
+
+    # act
+    with mock.patch('src.api.middlewares.logger.logger') as logger, pytest.raises(ValueError):
+        client.get('/error')
+
+    # assert
+    assert logger.error.call_count == 1
+    assert logger.error.call_args.kwargs['extra']['extra']['route'] == '/error'
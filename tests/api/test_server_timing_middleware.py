@@ -0,0 +1,43 @@
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.api.middlewares.server_timing import ServerTimingMiddleware
+from src.utils.timing import timed
+
+
+def _create_app() -> FastAPI:
+    app = FastAPI()
+
+    @app.get('/items')
+    async def get_items() -> list:
+        with timed('query'):
+            return []
+
+    app.add_middleware(ServerTimingMiddleware, admin_auth_token='admin')
+    return app
+
+
+def test_server_timing_middleware() -> None:
+    # arrange
+    client = TestClient(_create_app())
+
+    # act
+    resp = client.get('/items', headers={'Authorization': 'admin', 'X-Server-Timing': '1'})
+
+    # assert
+    assert resp.status_code == 200
+    steps = [step.split(';')[0] for step in resp.headers['Server-Timing'].split(', ')]
+    assert steps == ['query', 'total']
+
+
+def test_server_timing_middleware__disabled() -> None:
+    # arrange
+    client = TestClient(_create_app())
+
+    # act
+    not_asked_resp = client.get('/items', headers={'Authorization': 'admin'})
+    not_admin_resp = client.get('/items', headers={'Authorization': 'token', 'X-Server-Timing': '1'})
+
+    # assert
+    assert 'Server-Timing' not in not_asked_resp.headers
+    assert 'Server-Timing' not in not_admin_resp.headers
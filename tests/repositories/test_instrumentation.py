@@ -0,0 +1,74 @@
+from unittest import mock
+
+import pytest
+
+from src.repositories.postgres.instrumentation import InstrumentedPool, instrument_repository
+
+
+@instrument_repository
+class _Repository:
+    async def get(self, value: int) -> int:
+        return value
+
+    async def fail(self) -> None:
+        raise ValueError('error')
+
+    async def _private(self) -> None:
+        pass
+
+
+@pytest.mark.asyncio
+async def test_instrument_repository() -> None:
+    # arrange
+    repository = _Repository()
+
+    # act
+    with mock.patch('src.repositories.postgres.instrumentation.QUERY_DURATION') as query_duration:
+        value = await repository.get(1)
+        with pytest.raises(ValueError):
+            await repository.fail()
+        await repository._private()
+
+    # assert
+    assert value == 1
+    assert [call.args[1] for call in query_duration.observe.call_args_list] == ['_Repository.get', '_Repository.fail']
+
+
+@pytest.mark.asyncio
+async def test_instrumented_pool() -> None:
+    # arrange
+    pool = mock.AsyncMock()
+    pool.acquire.return_value = 'connection'
+    instrumented_pool = InstrumentedPool(pool)
+
+    # act
+    with mock.patch('src.repositories.postgres.instrumentation.POOL_ACQUIRE_DURATION') as acquire_duration:
+        async with instrumented_pool.acquire() as conn:
+            waiting = instrumented_pool.waiting
+
+    # assert
+    assert conn == 'connection'
+    assert waiting == 0
+    assert acquire_duration.observe.call_count == 1
+    pool.release.assert_awaited_once_with('connection', timeout=None)
+    assert instrumented_pool.get_size is pool.get_size
+
+
+@pytest.mark.asyncio
+async def test_instrumented_pool__awaited_acquire() -> None:
+    # arrange
+    pool = mock.AsyncMock()
+    pool.acquire.return_value = 'connection'
+    instrumented_pool = InstrumentedPool(pool)
+
+    # act
+    with mock.patch('src.repositories.postgres.instrumentation.POOL_ACQUIRE_DURATION') as acquire_duration:
+        conn = await instrumented_pool.acquire(timeout=1)
+        pool.release.assert_not_awaited()
+        await instrumented_pool.release(conn)
+
+    # assert
+    assert conn == 'connection'
+    pool.acquire.assert_awaited_once_with(timeout=1)
+    assert acquire_duration.observe.call_count == 1
+    pool.release.assert_awaited_once_with('connection', timeout=None)
@@ -0,0 +1,71 @@
+import asyncio
+import json
+from unittest import mock
+
+import pytest
+
+from src.api.routers.inner.models import IngestJobStatus, IngestStats
+from src.services.ingest_jobs import IngestJobsServices
+
+_STATION = {'coordinates': {'lat': 1, 'lon': 1}, 'source': {'source': 'plug_share', 'inner_id': 1}}
+
+
+def _create_service(payload: list[dict]) -> tuple[IngestJobsServices, mock.AsyncMock, mock.AsyncMock]:
+    stations_service = mock.AsyncMock()
+    stations_service.add_stations.return_value = IngestStats(stations=1)
+    service = IngestJobsServices(pool=mock.Mock(), stations_service=stations_service, batch_size=1)
+
+    ingest_jobs_repo = mock.AsyncMock()
+    ingest_jobs_repo.take_job.return_value = {
+        'id': 1, 'attempt': 2, 'payload': json.dumps(payload), 'processed_count': 0, 'stats': '{}'
+    }
+    service.ingest_jobs_repo = ingest_jobs_repo
+    return service, ingest_jobs_repo, stations_service
+
+
+@pytest.mark.asyncio
+async def test_process_next_job__invalid_payload() -> None:
+    # arrange
+    service, ingest_jobs_repo, stations_service = _create_service(payload=[{'coordinates': 'invalid'}])
+
+    # act
+    is_processed = await service.process_next_job(stale_seconds=300)
+
+    # assert
+    assert is_processed
+    stations_service.add_stations.assert_not_awaited()
+    assert ingest_jobs_repo.finish_job.await_args.kwargs['status'] == IngestJobStatus.failed
+
+
+@pytest.mark.asyncio
+async def test_process_next_job__taken_by_another_worker() -> None:
+    # arrange
+    service, ingest_jobs_repo, stations_service = _create_service(payload=[_STATION, _STATION])
+    ingest_jobs_repo.update_progress.return_value = False
+
+    # act
+    await service.process_next_job(stale_seconds=300)
+
+    # assert
+    assert stations_service.add_stations.await_count == 1
+    ingest_jobs_repo.finish_job.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_process_next_job__heartbeat_while_batch_is_running() -> None:
+    # arrange
+    service, ingest_jobs_repo, stations_service = _create_service(payload=[_STATION])
+
+    async def add_stations(stations: list) -> IngestStats:
+        await asyncio.sleep(0.1)
+        return IngestStats(stations=len(stations))
+
+    stations_service.add_stations.side_effect = add_stations
+
+    # act
+    await service.process_next_job(stale_seconds=0.03)
+
+    # assert
+    assert ingest_jobs_repo.touch_job.await_count >= 2
+    ingest_jobs_repo.touch_job.assert_awaited_with(job_id=1, attempt=2)
+    assert ingest_jobs_repo.finish_job.await_args.kwargs == {'job_id': 1, 'attempt': 2, 'status': IngestJobStatus.done}
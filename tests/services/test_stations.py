@@ -0,0 +1,49 @@
+import random
+
+from src.api.routers.v1.models import AddStation
+from src.services.stations import StationsServices
+
+
+def _get_stations(rnd: random.Random, lon: float, lat: float, source: str, count: int) -> list[AddStation]:
+    return [
+        AddStation(
+            coordinates={'lon': lon + rnd.uniform(-0.1, 0.1), 'lat': lat + rnd.uniform(-0.1, 0.1)},
+            source={'source': source, 'inner_id': i},
+        )
+        for i in range(count)
+    ]
+
+
+def test_split_by_lock_keys() -> None:
+    # arrange
+    rnd = random.Random(42)
+    paris_stations = _get_stations(rnd, lon=2.35, lat=48.85, source='plug_share', count=500)
+    new_york_stations = _get_stations(rnd, lon=-74, lat=40.7, source='charge_point', count=500)
+
+    # act
+    paris_chunks = StationsServices._split_by_lock_keys(stations=paris_stations, max_locks=256)
+    new_york_chunks = StationsServices._split_by_lock_keys(stations=new_york_stations, max_locks=256)
+
+    # assert
+    assert [station for stations, _ in paris_chunks for station in stations] == paris_stations
+    assert all(len(keys) <= 256 for _, keys in paris_chunks + new_york_chunks)
+    assert all(keys == sorted(keys) for _, keys in paris_chunks)
+    # unrelated stations don't wait for each other
+    paris_keys = {key for _, keys in paris_chunks for key in keys}
+    new_york_keys = {key for _, keys in new_york_chunks for key in keys}
+    assert not paris_keys & new_york_keys
+
+
+def test_split_by_lock_keys__same_source_in_one_chunk() -> None:
+    # arrange
+    rnd = random.Random(42)
+    stations = _get_stations(rnd, lon=2.35, lat=48.85, source='plug_share', count=100)
+    stations.append(stations[0].model_copy(update={'address': 'new address'}))
+
+    # act
+    chunks = StationsServices._split_by_lock_keys(stations=stations, max_locks=16)
+
+    # assert
+    assert len(chunks) > 1
+    assert stations[0] in chunks[0][0] and stations[-1] in chunks[0][0]
+    assert sum(len(chunk_stations) for chunk_stations, _ in chunks) == len(stations)
@@ -0,0 +1,29 @@
+from unittest import mock
+
+import pytest
+
+from src.services.tokens import TokenServices
+from src.utils.rate_limiter import RateLimiter
+
+
+@pytest.mark.parametrize('window_left_seconds, expected_retry_after', [(3.5, 3.5), (0, 0.001), (-0.0001, 0.001)])
+@pytest.mark.asyncio
+async def test_check_token__shared_window_retry_after(window_left_seconds: float, expected_retry_after: float) -> None:
+    # arrange
+    token_service = TokenServices(
+        pool=mock.Mock(),
+        rate_limiter=RateLimiter(default_rate_per_second=1, default_burst=100),
+        rate_limit_shared_window_seconds=10,
+    )
+    # no own rate limit, the 101st request of the window is over 1 request per second
+    tokens_repo = mock.AsyncMock()
+    tokens_repo.update_token_usage.return_value = {'rate_limit_per_second': None, 'rate_limit_burst': None}
+    tokens_repo.add_window_request.return_value = (101, window_left_seconds)
+    token_service._tokens_repo = tokens_repo
+
+    # act
+    is_existing, retry_after = await token_service.check_token('token')
+
+    # assert
+    assert is_existing
+    assert retry_after == expected_retry_after
@@ -0,0 +1,13 @@
+from src.utils.advisory_lock import advisory_lock_key
+
+
+def test_advisory_lock_key() -> None:
+    # act
+    key = advisory_lock_key('source', 'plug_share', 1)
+
+    # assert
+    assert key == advisory_lock_key('source', 'plug_share', 1)
+    assert -2 ** 63 <= key < 2 ** 63
+    assert key != advisory_lock_key('source', 'plug_share', 2)
+    assert key != advisory_lock_key('source', 'charge_point', 1)
+
@@ -0,0 +1,113 @@
+from unittest import mock
+
+import pytest
+
+from src.api.routers.v1.models import AreaRequest
+from src.utils.area_cache import AreaCache
+
+
+def test_area_cache__snap() -> None:
+    # arrange
+    cache = AreaCache(max_size=10, ttl_seconds=10, grid_size=0.1)
+
+    # act
+    area = cache.snap(AreaRequest(sw_lat=1.04, sw_lon=-1.04, ne_lat=1.96, ne_lon=0.3))
+
+    # assert
+    assert area.sw_lat == pytest.approx(1.0)
+    assert area.sw_lon == pytest.approx(-1.1)
+    assert area.ne_lat == pytest.approx(2.0)
+    assert area.ne_lon == pytest.approx(0.3)
+
+
+def test_area_cache__snap__close_areas_are_equal() -> None:
+    # arrange
+    cache = AreaCache(max_size=10, ttl_seconds=10, grid_size=0.1)
+
+    # act
+    area_1 = cache.snap(AreaRequest(sw_lat=1.01, sw_lon=1.01, ne_lat=1.91, ne_lon=1.91))
+    area_2 = cache.snap(AreaRequest(sw_lat=1.02, sw_lon=1.03, ne_lat=1.94, ne_lon=1.99))
+
+    # assert
+    assert area_1 == area_2
+
+
+def test_area_cache__get_and_set() -> None:
+    # arrange
+    cache = AreaCache(max_size=10, ttl_seconds=10, grid_size=0.1)
+    area = AreaRequest(sw_lat=1, sw_lon=1, ne_lat=2, ne_lon=2)
+
+    # act
+    cache.set(area=area, params=(10, None), content=b'content', version=cache.version)
+
+    # assert
+    assert cache.get(area=area, params=(10, None)) == b'content'
+    assert cache.get(area=area, params=(5, None)) is None
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_area_cache__expired() -> None:
+    # arrange
+    cache = AreaCache(max_size=10, ttl_seconds=10, grid_size=0.1)
+    area = AreaRequest(sw_lat=1, sw_lon=1, ne_lat=2, ne_lon=2)
+
+    with mock.patch('src.utils.area_cache.time.monotonic', return_value=100):
+        cache.set(area=area, params=(), content=b'content', version=cache.version)
+
+    # act
+    with mock.patch('src.utils.area_cache.time.monotonic', return_value=110):
+        content = cache.get(area=area, params=())
+
+    # assert
+    assert content is None
+    assert len(cache) == 0
+    assert (cache.misses, cache.evictions) == (1, 1)
+
+
+def test_area_cache__evicts_least_recently_used() -> None:
+    # arrange
+    cache = AreaCache(max_size=2, ttl_seconds=10, grid_size=0.1)
+    area = AreaRequest(sw_lat=1, sw_lon=1, ne_lat=2, ne_lon=2)
+    cache.set(area=area, params=1, content=b'1', version=cache.version)
+    cache.set(area=area, params=2, content=b'2', version=cache.version)
+    cache.get(area=area, params=1)
+
+    # act
+    cache.set(area=area, params=3, content=b'3', version=cache.version)
+
+    # assert
+    assert cache.get(area=area, params=2) is None
+    assert cache.get(area=area, params=1) == b'1'
+    assert cache.get(area=area, params=3) == b'3'
+    assert cache.evictions == 1
+
+
+def test_area_cache__invalidate_areas() -> None:
+    # arrange
+    cache = AreaCache(max_size=10, ttl_seconds=10, grid_size=0.1)
+    area_1 = AreaRequest(sw_lat=1, sw_lon=1, ne_lat=2, ne_lon=2)
+    area_2 = AreaRequest(sw_lat=3, sw_lon=3, ne_lat=4, ne_lon=4)
+    cache.set(area=area_1, params=(), content=b'1', version=cache.version)
+    cache.set(area=area_2, params=(), content=b'2', version=cache.version)
+
+    # act
+    cache.invalidate_areas([(1.9, 1.9, 2.1, 2.1)])
+
+    # assert
+    assert cache.get(area=area_1, params=()) is None
+    assert cache.get(area=area_2, params=()) == b'2'
+    assert cache.invalidations == 1
+
+
+def test_area_cache__does_not_set_content_built_before_invalidation() -> None:
+    # arrange
+    cache = AreaCache(max_size=10, ttl_seconds=10, grid_size=0.1)
+    area = AreaRequest(sw_lat=1, sw_lon=1, ne_lat=2, ne_lon=2)
+    version = cache.version
+
+    # act
+    cache.invalidate_areas([(5, 5, 6, 6)])
+    cache.set(area=area, params=(), content=b'content', version=version)
+
+    # assert
+    assert cache.get(area=area, params=()) is None
@@ -1,6 +1,6 @@
 import pytest
 
-from src.utils.calculate_average_rating import calculate_average_rating
+from src.utils.calculate_average_rating import calculate_average_rating, calculate_average_rating_from_sum
 
 
 @pytest.mark.parametrize(
@@ -20,3 +20,24 @@ def test_calculate_average_rating(comments_rating: list[int], expected_average_r
 
     # assert
     assert average_rating == expected_average_rating
+
+
+@pytest.mark.parametrize(
+    'comments_rating',
+    [
+        [],
+        [1],
+        [-1],
+        [1, -1],
+        [1, 1, -1],
+        [1, -1, -1, -1],
+        [1] * 7 + [-1] * 13,
+        [2, -3, 1],
+    ]
+)
+def test_calculate_average_rating_from_sum(comments_rating: list[int]) -> None:
+    # act
+    average_rating = calculate_average_rating_from_sum(sum(comments_rating), len(comments_rating))
+
+    # assert
+    assert average_rating == calculate_average_rating(comments_rating)
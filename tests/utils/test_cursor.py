@@ -0,0 +1,36 @@
+import base64
+
+import pytest
+
+from src.utils.cursor import MAX_STATION_ID, decode_cursor, encode_cursor
+
+
+@pytest.mark.parametrize('station_id', [0, 1, 42, MAX_STATION_ID])
+def test_encode_decode_cursor(station_id: int) -> None:
+    # act
+    cursor = encode_cursor(station_id)
+
+    # assert
+    assert '=' not in cursor
+    assert decode_cursor(cursor) == station_id
+
+
+@pytest.mark.parametrize('cursor', ['', 'not a cursor', '!!!', encode_cursor(-1)])
+def test_decode_cursor__invalid_cursor(cursor: str) -> None:
+    with pytest.raises(ValueError):
+        decode_cursor(cursor)
+
+
+@pytest.mark.parametrize('value', ['+1', ' 1', '1 ', '1_000', '01', '\u0661', str(MAX_STATION_ID + 1), str(10 ** 100)])
+def test_decode_cursor__not_canonical_station_id(value: str) -> None:
+    # arrange
+    cursor = base64.urlsafe_b64encode(value.encode()).decode().rstrip('=')
+
+    # act, assert
+    with pytest.raises(ValueError):
+        decode_cursor(cursor)
+
+
+def test_decode_cursor__characters_outside_alphabet() -> None:
+    with pytest.raises(ValueError):
+        decode_cursor(f'{encode_cursor(42)}.')
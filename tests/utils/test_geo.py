@@ -0,0 +1,82 @@
+import pytest
+
+from src.utils.geo import bboxes_around, distance_meters, lon_lat_to_tile, spheroid_distance_meters
+
+
+@pytest.mark.parametrize(
+    'lon, lat, zoom, expected_tile',
+    [
+        (0, 0, 0, (0, 0)),
+        (-180, 85.1, 1, (0, 0)),
+        (180, -85.1, 1, (1, 1)),
+        (13.3777, 52.5162, 10, (550, 335)),
+        (-122.4194, 37.7749, 12, (655, 1583)),
+    ]
+)
+def test_lon_lat_to_tile(lon: float, lat: float, zoom: int, expected_tile: tuple[int, int]) -> None:
+    assert lon_lat_to_tile(lon=lon, lat=lat, zoom=zoom) == expected_tile
+
+
+def test_bboxes_around() -> None:
+    # act
+    [(min_lon, min_lat, max_lon, max_lat)] = bboxes_around(lon=10, lat=60, distance_meters=1000)
+
+    # assert
+    # padded by 1% for the spheroid
+    assert min_lat == pytest.approx(60 - 0.00908, abs=1e-5)
+    assert max_lat == pytest.approx(60 + 0.00908, abs=1e-5)
+    # longitude degree is ~2 times shorter at 60 degrees latitude
+    assert min_lon == pytest.approx(10 - 0.0182, abs=1e-4)
+    assert max_lon == pytest.approx(10 + 0.0182, abs=1e-4)
+
+
+def test_bboxes_around__near_pole() -> None:
+    [(min_lon, _, max_lon, _)] = bboxes_around(lon=10, lat=90, distance_meters=1000)
+    assert (min_lon, max_lon) == (-180, 180)
+
+
+@pytest.mark.parametrize(
+    'lon, expected_lons',
+    [
+        (179.9999, [-180, -179.99102, 179.99082, 180]),
+        (-179.9999, [-180, -179.99082, 179.99102, 180]),
+    ]
+)
+def test_bboxes_around__antimeridian(lon: float, expected_lons: list[float]) -> None:
+    # act
+    bboxes = bboxes_around(lon=lon, lat=0, distance_meters=1000)
+
+    # assert
+    lons = [value for min_lon, _, max_lon, _ in sorted(bboxes) for value in (min_lon, max_lon)]
+    assert lons == pytest.approx(expected_lons, abs=1e-5)
+    for _, min_lat, _, max_lat in bboxes:
+        assert (min_lat, max_lat) == pytest.approx((-0.00908, 0.00908), abs=1e-5)
+
+
+@pytest.mark.parametrize(
+    'lon_1, lat_1, lon_2, lat_2, expected_distance',
+    [
+        (10, 60, 10, 60, 0),
+        (0, 0, 0, 1, 111_195),
+        (0, 0, 1, 0, 111_195),
+        (13.3777, 52.5162, 13.3777, 52.5171, 100),
+    ]
+)
+def test_distance_meters(lon_1: float, lat_1: float, lon_2: float, lat_2: float, expected_distance: float) -> None:
+    assert distance_meters(lon_1, lat_1, lon_2, lat_2) == pytest.approx(expected_distance, abs=1)
+
+
+@pytest.mark.parametrize(
+    'lon_1, lat_1, lon_2, lat_2, expected_distance',
+    [
+        (10, 60, 10, 60, 0),
+        (0, 0, 1, 0, 111_319.491),
+        (0, 0, 0, 1, 110_574.389),
+        (179.9999, 10, -179.9999, 10, 21.928),
+        (10, 89.9999, -170, 89.9999, 22.339),
+    ]
+)
+def test_spheroid_distance_meters(
+        lon_1: float, lat_1: float, lon_2: float, lat_2: float, expected_distance: float
+) -> None:
+    assert spheroid_distance_meters(lon_1, lat_1, lon_2, lat_2) == pytest.approx(expected_distance, abs=1e-3)
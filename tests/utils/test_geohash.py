@@ -0,0 +1,32 @@
+import pytest
+
+from src.utils.geohash import cells_in_bbox, encode
+
+
+@pytest.mark.parametrize(
+    'lon, lat, precision, expected_geohash',
+    [
+        (-5.6, 42.6, 5, 'ezs42'),
+        (10.40744, 57.64911, 11, 'u4pruydqqvj'),
+        (0, 0, 1, 's'),
+        (-180, -90, 3, '000'),
+        (180, 90, 3, 'zzz'),
+    ]
+)
+def test_encode(lon: float, lat: float, precision: int, expected_geohash: str) -> None:
+    assert encode(lon=lon, lat=lat, precision=precision) == expected_geohash
+
+
+def test_cells_in_bbox__inside_one_cell() -> None:
+    assert cells_in_bbox(-5.601, 42.599, -5.599, 42.601, precision=5) == ['ezs42']
+
+
+def test_cells_in_bbox() -> None:
+    # act
+    cells = cells_in_bbox(-0.001, -0.001, 0.001, 0.001, precision=6)
+
+    # assert
+    assert sorted(cells) == sorted(
+        encode(lon=lon, lat=lat, precision=6) for lon in (-0.001, 0.001) for lat in (-0.001, 0.001)
+    )
+    assert len(cells) == 4
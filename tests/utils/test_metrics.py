@@ -0,0 +1,48 @@
+from src.utils.metrics import Counter, Gauge, Histogram, render_metrics
+
+
+def test_render_metrics() -> None:
+    # arrange
+    counter = Counter('requests_total', 'Requests.', label_names=('route',), registry=None)
+    gauge = Gauge('connections', 'Connections.', registry=None)
+    histogram = Histogram('duration_seconds', 'Duration.', label_names=('route',), buckets=(0.1, 1), registry=None)
+
+    # act
+    counter.inc('/a')
+    counter.inc('/a', value=2)
+    counter.inc('/"b"')
+    gauge.set(0.5)
+    for value in (0.05, 0.1, 0.5, 5):
+        histogram.observe(value, '/a')
+    text = render_metrics([counter, gauge, histogram])
+
+    # assert
+    assert text == (
+        '# HELP requests_total Requests.\n'
+        '# TYPE requests_total counter\n'
+        'requests_total{route="/a"} 3\n'
+        'requests_total{route="/\\"b\\""} 1\n'
+        '# HELP connections Connections.\n'
+        '# TYPE connections gauge\n'
+        'connections 0.5\n'
+        '# HELP duration_seconds Duration.\n'
+        '# TYPE duration_seconds histogram\n'
+        'duration_seconds_bucket{route="/a",le="0.1"} 2\n'
+        'duration_seconds_bucket{route="/a",le="1"} 3\n'
+        'duration_seconds_bucket{route="/a",le="+Inf"} 4\n'
+        'duration_seconds_sum{route="/a"} 5.65\n'
+        'duration_seconds_count{route="/a"} 4\n'
+    )
+
+
+def test_render_metrics__registry() -> None:
+    # arrange
+    registry = []
+    counter = Counter('requests_total', 'Requests.', registry=registry)
+
+    # act
+    text = render_metrics(registry)
+
+    # assert
+    assert registry == [counter]
+    assert text == '# HELP requests_total Requests.\n# TYPE requests_total counter\n'
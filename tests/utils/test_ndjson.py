@@ -0,0 +1,34 @@
+import asyncio
+from collections.abc import AsyncIterator
+
+import pytest
+
+from src.utils.ndjson import LineTooLongError, iter_ndjson_lines
+
+
+async def _stream(chunks: list[bytes]) -> AsyncIterator[bytes]:
+    for chunk in chunks:
+        yield chunk
+
+
+async def _collect(chunks: list[bytes], max_line_bytes: int = 100) -> list[tuple[int, bytes]]:
+    return [line async for line in iter_ndjson_lines(_stream(chunks), max_line_bytes=max_line_bytes)]
+
+
+@pytest.mark.parametrize(
+    'chunks',
+    [
+        [b'{"a": 1}\n\n{"b": 2}\n{"c": 3}'],
+        [b'{"a": 1}\n\n{"b": 2}\n{"c": 3}\n'],
+        [b'{"a"', b': 1}\n', b'\n{"b": 2}\n{', b'"c": 3}'],
+        [b'{"a": 1}\n', b'\n', b'{"b": 2}\n', b'{"c": 3}\n', b''],
+    ]
+)
+def test_iter_ndjson_lines(chunks: list[bytes]) -> None:
+    assert asyncio.run(_collect(chunks)) == [(1, b'{"a": 1}'), (3, b'{"b": 2}'), (4, b'{"c": 3}')]
+
+
+@pytest.mark.parametrize('chunks', [[b'{"a": 1}\n', b'{"b": 22222'], [b'{"a": 1}\n{"b": 22222}\n']])
+def test_iter_ndjson_lines__line_too_long(chunks: list[bytes]) -> None:
+    with pytest.raises(LineTooLongError, match='Line 2'):
+        asyncio.run(_collect(chunks, max_line_bytes=10))
@@ -0,0 +1,62 @@
+from unittest import mock
+
+import pytest
+
+from src.utils.rate_limiter import RateLimiter
+
+
+def test_rate_limiter__get_limits() -> None:
+    # arrange
+    rate_limiter = RateLimiter(default_rate_per_second=10, default_burst=20)
+
+    # act & assert
+    assert rate_limiter.get_limits(None, None) == (10, 20)
+    assert rate_limiter.get_limits(1, None) == (1, 20)
+    assert rate_limiter.get_limits(None, 0) == (10, 1)
+
+
+def test_rate_limiter__acquire() -> None:
+    # arrange
+    rate_limiter = RateLimiter(default_rate_per_second=10, default_burst=20)
+
+    # act
+    with mock.patch('src.utils.rate_limiter.time.monotonic', return_value=100):
+        burst_retry_afters = [rate_limiter.acquire(key='key', rate_per_second=2, burst=3) for _ in range(4)]
+        other_key_retry_after = rate_limiter.acquire(key='other key', rate_per_second=2, burst=3)
+
+    with mock.patch('src.utils.rate_limiter.time.monotonic', return_value=100.25):
+        early_retry_after = rate_limiter.acquire(key='key', rate_per_second=2, burst=3)
+
+    with mock.patch('src.utils.rate_limiter.time.monotonic', return_value=100.5):
+        refilled_retry_after = rate_limiter.acquire(key='key', rate_per_second=2, burst=3)
+
+    # assert
+    assert burst_retry_afters == [0, 0, 0, 0.5]
+    assert other_key_retry_after == 0
+    assert early_retry_after == pytest.approx(0.25)
+    assert refilled_retry_after == 0
+    assert rate_limiter.rejected == 2
+
+
+def test_rate_limiter__bucket_is_not_overfilled() -> None:
+    # arrange
+    rate_limiter = RateLimiter(default_rate_per_second=10, default_burst=20)
+    with mock.patch('src.utils.rate_limiter.time.monotonic', return_value=100):
+        rate_limiter.acquire(key='key', rate_per_second=2, burst=3)
+
+    # act
+    with mock.patch('src.utils.rate_limiter.time.monotonic', return_value=1000):
+        retry_afters = [rate_limiter.acquire(key='key', rate_per_second=2, burst=3) for _ in range(4)]
+
+    # assert
+    assert retry_afters[:3] == [0, 0, 0]
+    assert retry_afters[3] > 0
+
+
+def test_rate_limiter__no_limit() -> None:
+    # arrange
+    rate_limiter = RateLimiter(default_rate_per_second=0, default_burst=1)
+
+    # act & assert
+    assert all(rate_limiter.acquire(key='key', rate_per_second=0, burst=1) == 0 for _ in range(100))
+    assert len(rate_limiter) == 0
@@ -0,0 +1,127 @@
+import random
+
+import pytest
+
+from src.utils.geo import spheroid_distance_meters
+from src.utils.spatial_index import BoxesIndex, PointsGrid
+
+
+def _find_first(points: list[tuple[float, float]], lon: float, lat: float, max_distance_meters: float) -> int | None:
+    for index, (point_lon, point_lat) in enumerate(points):
+        if spheroid_distance_meters(lon, lat, point_lon, point_lat) <= max_distance_meters:
+            return index
+    return None
+
+
+@pytest.mark.parametrize(
+    'center_lon, center_lat',
+    [
+        (13.4, 52.5),
+        # antimeridian
+        (180, 10),
+        # pole
+        (0, 89.9995),
+    ]
+)
+def test_points_grid__same_as_linear_search(center_lon: float, center_lat: float) -> None:
+    # arrange
+    rnd = random.Random(42)
+    grid = PointsGrid(max_distance_meters=100)
+    points = []
+
+    # act & assert
+    for _ in range(1000):
+        lon = (center_lon + rnd.uniform(-0.01, 0.01) + 180) % 360 - 180
+        lat = min(center_lat + rnd.uniform(-0.01, 0.01), 90)
+        assert grid.find_first(lon=lon, lat=lat) == _find_first(points, lon=lon, lat=lat, max_distance_meters=100)
+        if rnd.random() < 0.5:
+            assert grid.add(lon=lon, lat=lat) == len(points)
+            points.append((lon, lat))
+
+    assert len(grid) == len(points)
+
+
+def test_points_grid__first_added_point_found() -> None:
+    # arrange
+    grid = PointsGrid(max_distance_meters=100)
+    grid.add(lon=10.0005, lat=10)
+    grid.add(lon=10, lat=10)
+
+    # act & assert
+    assert grid.find_first(lon=10, lat=10) == 0
+    assert grid.find_first(lon=10, lat=10.01) is None
+
+
+def test_points_grid__spheroid_distance() -> None:
+    # arrange
+    grid = PointsGrid(max_distance_meters=100)
+    # 0.0009 degrees of longitude at the equator: 100.19 m on the spheroid, 100.08 m on the sphere
+    grid.add(lon=0.0009, lat=0)
+    # 0.0009 degrees of latitude at the equator: 99.52 m on the spheroid, 100.08 m on the sphere
+    grid.add(lon=0, lat=0.0009)
+
+    # act & assert
+    assert grid.find_first(lon=0, lat=0) == 1
+
+
+def _random_box(rnd: random.Random) -> tuple[float, float, float, float]:
+    size = rnd.choice([0, 0.001, 0.1, 5, 90])
+    min_lon = rnd.uniform(-180, 180 - size)
+    min_lat = rnd.uniform(-90, 90 - size)
+    return min_lon, min_lat, min_lon + rnd.uniform(0, size), min_lat + rnd.uniform(0, size)
+
+
+def _is_intersected(box_1: tuple[float, float, float, float], box_2: tuple[float, float, float, float]) -> bool:
+    return box_1[0] <= box_2[2] and box_2[0] <= box_1[2] and box_1[1] <= box_2[3] and box_2[1] <= box_1[3]
+
+
+def test_boxes_index__same_as_linear_search() -> None:
+    # arrange
+    rnd = random.Random(42)
+    index = BoxesIndex()
+    boxes = {}
+
+    # act & assert
+    for key in range(2000):
+        box = _random_box(rnd)
+        index.add(key, box)
+        boxes[key] = box
+        if rnd.random() < 0.3:
+            removed_key = rnd.choice(list(boxes))
+            index.remove(removed_key)
+            del boxes[removed_key]
+
+        query = _random_box(rnd)
+        assert index.find_intersecting(query) == {
+            key for key, box in boxes.items() if _is_intersected(box, query)
+        }
+
+    assert len(index) == len(boxes)
+
+
+def test_boxes_index__touching_and_large_boxes() -> None:
+    # arrange
+    index = BoxesIndex()
+    index.add('world', (-180, -90, 180, 90))
+    index.add('berlin', (13.3, 52.4, 13.5, 52.6))
+    index.add('point', (2.35, 48.85, 2.35, 48.85))
+
+    # act & assert
+    assert index.find_intersecting((13.5, 52.6, 14, 53)) == {'world', 'berlin'}
+    assert index.find_intersecting((2.35, 48.85, 2.35, 48.85)) == {'world', 'point'}
+    assert index.find_intersecting((-180, -90, 180, 90)) == {'world', 'berlin', 'point'}
+
+
+def test_boxes_index__add_existing_key_moves_it() -> None:
+    # arrange
+    index = BoxesIndex()
+    index.add('key', (0, 0, 1, 1))
+
+    # act
+    index.add('key', (10, 10, 11, 11))
+    index.remove('missing')
+
+    # assert
+    assert index.find_intersecting((0, 0, 1, 1)) == set()
+    assert index.find_intersecting((10, 10, 11, 11)) == {'key'}
+    assert len(index) == 1
@@ -0,0 +1,80 @@
+from unittest import mock
+
+from src.utils.tile_cache import TileCache
+
+
+def test_tile_cache__get_and_set() -> None:
+    # arrange
+    cache = TileCache(max_size=2, ttl_seconds=10)
+
+    # act
+    cache.set(1, 0, 0, b'tile', version=cache.version)
+
+    # assert
+    assert cache.get(1, 0, 0) == b'tile'
+    assert cache.get(1, 1, 0) is None
+
+
+def test_tile_cache__expired() -> None:
+    # arrange
+    cache = TileCache(max_size=2, ttl_seconds=10)
+
+    with mock.patch('src.utils.tile_cache.time.monotonic', return_value=100):
+        cache.set(1, 0, 0, b'tile', version=cache.version)
+
+    # act
+    with mock.patch('src.utils.tile_cache.time.monotonic', return_value=110):
+        tile = cache.get(1, 0, 0)
+
+    # assert
+    assert tile is None
+    assert len(cache) == 0
+    assert (cache.hits, cache.misses) == (0, 1)
+
+
+def test_tile_cache__evicts_least_recently_used() -> None:
+    # arrange
+    cache = TileCache(max_size=2, ttl_seconds=10)
+    cache.set(1, 0, 0, b'tile_1', version=cache.version)
+    cache.set(1, 1, 0, b'tile_2', version=cache.version)
+    cache.get(1, 0, 0)
+
+    # act
+    cache.set(1, 1, 1, b'tile_3', version=cache.version)
+
+    # assert
+    assert len(cache) == 2
+    assert cache.get(1, 1, 0) is None
+    assert cache.get(1, 0, 0) == b'tile_1'
+    assert cache.get(1, 1, 1) == b'tile_3'
+
+
+def test_tile_cache__invalidate_area() -> None:
+    # arrange
+    cache = TileCache(max_size=10, ttl_seconds=10)
+    for z, x, y in [(0, 0, 0), (1, 1, 0), (1, 0, 0), (10, 550, 335), (10, 551, 335)]:
+        cache.set(z, x, y, b'tile', version=cache.version)
+
+    # act
+    # area around (13.3777, 52.5162) is in (10, 550, 335) tile
+    cache.invalidate_areas([(13.37, 52.51, 13.38, 52.52)])
+
+    # assert
+    assert cache.get(0, 0, 0) is None
+    assert cache.get(1, 1, 0) is None
+    assert cache.get(10, 550, 335) is None
+    assert cache.get(1, 0, 0) == b'tile'
+    assert cache.get(10, 551, 335) == b'tile'
+
+
+def test_tile_cache__does_not_set_tile_rendered_before_invalidation() -> None:
+    # arrange
+    cache = TileCache(max_size=10, ttl_seconds=10)
+    version = cache.version
+
+    # act
+    cache.invalidate_areas([(0, 0, 1, 1)])
+    cache.set(0, 0, 0, b'tile', version=version)
+
+    # assert
+    assert cache.get(0, 0, 0) is None
@@ -0,0 +1,44 @@
+import asyncio
+
+import pytest
+
+from src.utils.timing import format_server_timing, get_timings, start_timing, stop_timing, timed
+
+
+def test_timed__timing_is_off() -> None:
+    # act
+    with timed('step'):
+        pass
+
+    # assert
+    assert get_timings() is None
+
+
+@pytest.mark.asyncio
+async def test_timed() -> None:
+    # arrange
+    async def step(name: str) -> None:
+        with timed(name):
+            await asyncio.sleep(0.01)
+
+    token = start_timing()
+
+    # act
+    try:
+        await step('first')
+        await step('first')
+        async with asyncio.TaskGroup() as tg:
+            tg.create_task(step('second'))
+        timings = get_timings()
+    finally:
+        stop_timing(token)
+
+    # assert
+    assert list(timings) == ['first', 'second']
+    assert timings['first'] >= 0.02
+    assert timings['second'] >= 0.01
+    assert get_timings() is None
+
+
+def test_format_server_timing() -> None:
+    assert format_server_timing({'db': 0.0123, 'total': 0.1}) == 'db;dur=12.3, total;dur=100.0'
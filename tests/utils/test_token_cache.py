@@ -0,0 +1,59 @@
+from unittest import mock
+
+from src.utils.token_cache import TokenCache
+
+
+def test_token_cache__get_and_set() -> None:
+    # arrange
+    cache = TokenCache(max_size=10, ttl_seconds=60, negative_ttl_seconds=5)
+
+    # act
+    cache.set('valid', True, (5, 10))
+    cache.set('invalid', False)
+
+    # assert
+    assert cache.get('valid') == (True, (5, 10))
+    assert cache.get('invalid') == (False, (None, None))
+    assert cache.get('unknown') is None
+    assert (cache.hits, cache.misses) == (2, 1)
+
+
+def test_token_cache__expired() -> None:
+    # arrange
+    cache = TokenCache(max_size=10, ttl_seconds=60, negative_ttl_seconds=5)
+
+    with mock.patch('src.utils.token_cache.time.monotonic', return_value=100):
+        cache.set('valid', True)
+        cache.set('invalid', False)
+
+    # act
+    with mock.patch('src.utils.token_cache.time.monotonic', return_value=110):
+        is_valid_existing = cache.get('valid')
+        is_invalid_existing = cache.get('invalid')
+
+    with mock.patch('src.utils.token_cache.time.monotonic', return_value=160):
+        is_valid_existing_later = cache.get('valid')
+
+    # assert
+    assert is_valid_existing == (True, (None, None))
+    # negative results expire earlier
+    assert is_invalid_existing is None
+    assert is_valid_existing_later is None
+    assert len(cache) == 0
+
+
+def test_token_cache__evicts_least_recently_used() -> None:
+    # arrange
+    cache = TokenCache(max_size=2, ttl_seconds=60, negative_ttl_seconds=5)
+    cache.set('first', True)
+    cache.set('second', True)
+    cache.get('first')
+
+    # act
+    cache.set('third', False)
+
+    # assert
+    assert len(cache) == 2
+    assert cache.get('second') is None
+    assert cache.get('first') == (True, (None, None))
+    assert cache.get('third') == (False, (None, None))
@@ -0,0 +1,24 @@
+from datetime import UTC, datetime
+
+from src.utils.token_usage_buffer import TokenUsageBuffer
+
+
+def test_token_usage_buffer() -> None:
+    # arrange
+    buffer = TokenUsageBuffer()
+    first_used_at = datetime(2024, 1, 1, tzinfo=UTC)
+    last_used_at = datetime(2024, 1, 2, tzinfo=UTC)
+
+    # act
+    buffer.add('first', used_at=last_used_at)
+    buffer.add('first', used_at=first_used_at)
+    buffer.add('second', count=3, used_at=first_used_at)
+    usages = buffer.pop_all()
+
+    # assert
+    assert sorted(usages) == [
+        ('first', 2, last_used_at),
+        ('second', 3, first_used_at),
+    ]
+    assert len(buffer) == 0
+    assert buffer.pop_all() == []
@@ -0,0 +1,72 @@
+import json
+import os
+
+import asyncpg
+import pytest
+from fastapi.testclient import TestClient
+
+
+def _station_line(inner_id: int, lat: float) -> str:
+    return json.dumps({
+        'coordinates': {'lat': lat, 'lon': 1.5},
+        'source': {'source': 'plug_share', 'inner_id': inner_id},
+        'comments': [{'source': 'plug_share', 'text': 'text', 'created_at': '2021-01-01T00:00:00+00:00'}],
+    })
+
+
+async def test_add_stations_ndjson(client: TestClient, pg: asyncpg.Pool, monkeypatch: pytest.MonkeyPatch) -> None:
+    # arrange
+    monkeypatch.setattr(client.app.state, 'ingest_batch_size', 2)
+    content = '\n'.join([_station_line(1, 1), '', _station_line(2, 2), _station_line(3, 3)])
+
+    # act
+    resp = client.post(
+        '/inner/api/stations/ndjson',
+        content=content,
+        headers={
+            'Authorization': os.environ['ADMIN_AUTH_TOKEN'],
+            'Content-Type': 'application/x-ndjson',
+        }
+    )
+
+    # assert
+    assert resp.status_code == 201
+    assert resp.json() == {
+        'stations': 3,
+        'skipped': 0,
+        'outdated': 0,
+        'new_stations': 3,
+        'new_sources': 3,
+        'events': 0,
+        'comments': 3,
+        'chargers': 0,
+    }
+    assert len(await pg.fetch('SELECT * FROM stations')) == 3
+    assert len(await pg.fetch('SELECT * FROM comments')) == 3
+
+
+async def test_add_stations_ndjson__invalid_line(
+        client: TestClient, pg: asyncpg.Pool, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    # arrange
+    monkeypatch.setattr(client.app.state, 'ingest_batch_size', 1)
+    content = '\n'.join([_station_line(1, 1), '{"coordinates": {}}', _station_line(3, 3)])
+
+    # act
+    resp = client.post(
+        '/inner/api/stations/ndjson',
+        content=content,
+        headers={
+            'Authorization': os.environ['ADMIN_AUTH_TOKEN'],
+            'Content-Type': 'application/x-ndjson',
+        }
+    )
+
+    # assert
+    assert resp.status_code == 422
+    detail = resp.json()['detail']
+    assert detail['line'] == 2
+    assert detail['errors']
+    # batch before the invalid line is stored
+    assert detail['stored']['stations'] == 1
+    assert len(await pg.fetch('SELECT * FROM stations')) == 1
@@ -3,6 +3,7 @@ import os
 import asyncpg
 from fastapi.testclient import TestClient
 
+from src.api.depends import create_token_service
 from tests_functional.helpers import add_token, get_token_stats
 
 
@@ -123,5 +124,63 @@ async def test_get_stations_by_area_twice__token_stats_increment_twice(client: T
     # assert
     assert resp.status_code == 200
 
+    # request counts are buffered until the periodic flush
+    assert await get_token_stats(pg=pg, api_key=sample_key) == 0
+    client.portal.call(create_token_service(state=client.app.state).flush_usage)
     token_stats = await get_token_stats(pg=pg, api_key=sample_key)
     assert token_stats == 2
+
+
+async def test_get_stations_by_area__removed_token_is_cached(client: TestClient, pg: asyncpg.Pool) -> None:
+    # arrange
+    sample_key = "karramba"
+    await add_token(pg=pg, api_key=sample_key)
+    params = {
+        'ne_lat': 2,
+        'ne_lon': 2,
+        'sw_lat': 1,
+        'sw_lon': 1,
+    }
+    resp = client.get('/api/v1/stations-by-area', params=params, headers={'Authorization': sample_key})
+    assert resp.status_code == 200
+    await pg.execute('DELETE FROM tokens;')
+
+    # act
+    resp = client.get('/api/v1/stations-by-area', params=params, headers={'Authorization': sample_key})
+
+    # assert
+    # removed token keeps working until its cache entry expires
+    assert resp.status_code == 200
+
+    # act
+    client.app.state.token_cache.set(sample_key, False)
+    resp = client.get('/api/v1/stations-by-area', params=params, headers={'Authorization': sample_key})
+
+    # assert
+    assert resp.status_code == 403
+
+
+async def test_get_stations_by_area__rate_limited(client: TestClient, pg: asyncpg.Pool) -> None:
+    # arrange
+    sample_key = "karramba"
+    await add_token(pg=pg, api_key=sample_key, rate_limit_per_second=0.1, rate_limit_burst=2)
+    params = {
+        'ne_lat': 2,
+        'ne_lon': 2,
+        'sw_lat': 1,
+        'sw_lon': 1,
+    }
+
+    # act
+    responses = [
+        client.get('/api/v1/stations-by-area', params=params, headers={'Authorization': sample_key})
+        for _ in range(3)
+    ]
+    admin_resp = client.get(
+        '/api/v1/stations-by-area', params=params, headers={'Authorization': os.environ['ADMIN_AUTH_TOKEN']}
+    )
+
+    # assert
+    assert [resp.status_code for resp in responses] == [200, 200, 429]
+    assert 0 < int(responses[-1].headers['Retry-After']) <= 10
+    assert admin_resp.status_code == 200
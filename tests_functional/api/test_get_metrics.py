@@ -0,0 +1,36 @@
+import os
+
+import asyncpg
+from fastapi.testclient import TestClient
+
+
+async def test_get_metrics(client: TestClient, pg: asyncpg.Pool) -> None:
+    # arrange
+    headers = {'Authorization': os.environ['ADMIN_AUTH_TOKEN']}
+    client.get('/api/v1/stations-by-area', params={'ne_lat': 2, 'ne_lon': 2, 'sw_lat': 1, 'sw_lon': 1}, headers=headers)
+
+    # act
+    resp = client.get('/metrics', headers=headers)
+
+    # assert
+    assert resp.status_code == 200
+    assert resp.headers['content-type'].startswith('text/plain')
+    lines = resp.text.splitlines()
+    assert any(
+        line.startswith(
+            'livechrg_request_duration_seconds_count{method="GET",route="/api/v1/stations-by-area",status="200"}'
+        )
+        for line in lines
+    )
+    assert any(line.startswith('livechrg_query_duration_seconds_count{method="StationsRepository.') for line in lines)
+    assert any(line.startswith('livechrg_pg_pool_acquire_duration_seconds_count') for line in lines)
+    assert any(line.startswith('livechrg_pg_pool_connections{state="max"}') for line in lines)
+    assert any(line.startswith('livechrg_cache_misses_total{cache="area"}') for line in lines)
+
+
+def test_get_metrics__unauthorized(client: TestClient) -> None:
+    # act
+    resp = client.get('/metrics')
+
+    # assert
+    assert resp.status_code == 401
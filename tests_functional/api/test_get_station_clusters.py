@@ -0,0 +1,57 @@
+import os
+
+import asyncpg
+import pytest
+from fastapi.testclient import TestClient
+
+from tests_functional.helpers import add_source, add_station
+
+
+async def test_get_station_clusters(client: TestClient, pg: asyncpg.Pool) -> None:
+    # arrange
+    for inner_id, (latitude, longitude) in enumerate([(1.4, 1.5), (1.401, 1.501), (1.9, 1.9)]):
+        station_id = await add_station(pg=pg, latitude=latitude, longitude=longitude)
+        await add_source(pg=pg, station_id=station_id, station_inner_id=inner_id, source='plug_share')
+
+    # act
+    resp = client.get(
+        '/api/v1/station-clusters',
+        params={
+            'zoom': 10,
+            'ne_lat': 2,
+            'ne_lon': 2,
+            'sw_lat': 1,
+            'sw_lon': 1,
+        },
+        headers={
+            'Authorization': os.environ['ADMIN_AUTH_TOKEN']
+        }
+    )
+
+    # assert
+    assert resp.status_code == 200
+
+    clusters = resp.json()['clusters']
+    assert [cluster['count'] for cluster in clusters] == [2, 1]
+    assert clusters[0]['coordinates']['lat'] == pytest.approx(1.4005)
+    assert clusters[0]['coordinates']['lon'] == pytest.approx(1.5005)
+    assert clusters[1]['coordinates'] == {'lat': 1.9, 'lon': 1.9}
+
+
+async def test_get_station_clusters__zoom_is_required(client: TestClient, pg: asyncpg.Pool) -> None:
+    # act
+    resp = client.get(
+        '/api/v1/station-clusters',
+        params={
+            'ne_lat': 2,
+            'ne_lon': 2,
+            'sw_lat': 1,
+            'sw_lon': 1,
+        },
+        headers={
+            'Authorization': os.environ['ADMIN_AUTH_TOKEN']
+        }
+    )
+
+    # assert
+    assert resp.status_code == 422
@@ -1,8 +1,11 @@
 import os
+from datetime import UTC, datetime
 
 import asyncpg
+import pytest
 from fastapi.testclient import TestClient
 
+from src.utils.cursor import encode_cursor
 from tests_functional.helpers import (
     add_charger,
     add_comment,
@@ -52,12 +55,13 @@ async def test_get_stations_by_area(client: TestClient, pg: asyncpg.Pool) -> Non
     assert station['last_event']['is_problem'] is False
 
 
-async def test_get_stations_by_area__validation_for_limit(client: TestClient, pg: asyncpg.Pool) -> None:
+@pytest.mark.parametrize('limit', [0, 11])
+async def test_get_stations_by_area__validation_for_limit(client: TestClient, pg: asyncpg.Pool, limit: int) -> None:
     # act
     resp = client.get(
         '/api/v1/stations-by-area',
         params={
-            'limit': 11,
+            'limit': limit,
             'ne_lat': 2,
             'ne_lon': 2,
             'sw_lat': 1,
@@ -70,3 +74,343 @@ async def test_get_stations_by_area__validation_for_limit(client: TestClient, pg
 
     # assert
     assert resp.status_code == 422
+
+
+async def test_get_stations_by_area__cursor_pagination(client: TestClient, pg: asyncpg.Pool) -> None:
+    # arrange
+    station_ids = []
+    for inner_id in range(1, 4):
+        station_id = await add_station(pg=pg, latitude=1.4, longitude=1.5)
+        await add_source(pg=pg, station_id=station_id, station_inner_id=inner_id, source='plug_share')
+        station_ids.append(station_id)
+
+    params = {
+        'limit': 2,
+        'ne_lat': 2,
+        'ne_lon': 2,
+        'sw_lat': 1,
+        'sw_lon': 1,
+    }
+
+    # act
+    first_page = client.get(
+        '/api/v1/stations-by-area',
+        params=params,
+        headers={
+            'Authorization': os.environ['ADMIN_AUTH_TOKEN']
+        }
+    )
+    second_page = client.get(
+        '/api/v1/stations-by-area',
+        params=params | {'cursor': first_page.json()['next_cursor']},
+        headers={
+            'Authorization': os.environ['ADMIN_AUTH_TOKEN']
+        }
+    )
+
+    # assert
+    assert first_page.status_code == 200
+    assert [s['sources'][0]['inner_id'] for s in first_page.json()['stations']] == [1, 2]
+    assert first_page.json()['next_cursor']
+
+    assert second_page.status_code == 200
+    assert [s['sources'][0]['inner_id'] for s in second_page.json()['stations']] == [3]
+    assert second_page.json()['next_cursor'] is None
+
+
+async def test_get_stations_by_area__invalid_cursor(client: TestClient, pg: asyncpg.Pool) -> None:
+    # act
+    resp = client.get(
+        '/api/v1/stations-by-area',
+        params={
+            'cursor': 'invalid',
+            'ne_lat': 2,
+            'ne_lon': 2,
+            'sw_lat': 1,
+            'sw_lon': 1,
+        },
+        headers={
+            'Authorization': os.environ['ADMIN_AUTH_TOKEN']
+        }
+    )
+
+    # assert
+    assert resp.status_code == 422
+
+
+async def test_get_stations_by_area__offset_with_cursor(client: TestClient, pg: asyncpg.Pool) -> None:
+    # act
+    resp = client.get(
+        '/api/v1/stations-by-area',
+        params={
+            'cursor': encode_cursor(1),
+            'offset': 1,
+            'ne_lat': 2,
+            'ne_lon': 2,
+            'sw_lat': 1,
+            'sw_lon': 1,
+        },
+        headers={
+            'Authorization': os.environ['ADMIN_AUTH_TOKEN']
+        }
+    )
+
+    # assert
+    assert resp.status_code == 422
+
+
+async def test_get_stations_by_area__single_query_and_fan_out_hydration_are_equal(
+        client: TestClient, pg: asyncpg.Pool, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    # arrange
+    station_id = await add_station(pg=pg, latitude=1.4, longitude=1.5, rating=None)
+    await add_source(pg=pg, station_id=station_id, station_inner_id=1, source='plug_share')
+    await add_comment(pg=pg, station_id=station_id, text='text', source='plug_share', rating=1)
+    await add_comment(pg=pg, station_id=station_id, text='text 2', source='plug_share', rating=-1)
+    await add_event(pg=pg, station_id=station_id, source='plug_share', is_problem=False)
+    await add_charger(pg=pg, station_id=station_id, network='network', ocpi_ids=['id_1'])
+
+    monkeypatch.setattr(client.app.state, 'area_cache', None)
+
+    responses = []
+    for single_query_hydration in (True, False):
+        monkeypatch.setattr(client.app.state, 'single_query_hydration', single_query_hydration)
+
+        # act
+        resp = client.get(
+            '/api/v1/stations-by-area',
+            params={
+                'ne_lat': 2,
+                'ne_lon': 2,
+                'sw_lat': 1,
+                'sw_lon': 1,
+            },
+            headers={
+                'Authorization': os.environ['ADMIN_AUTH_TOKEN']
+            }
+        )
+        assert resp.status_code == 200
+        responses.append(resp.json())
+
+    # assert
+    single_query_response, fan_out_response = responses
+    assert single_query_response == fan_out_response
+    assert single_query_response['stations'][0]['chargers'] == [{'network': 'network', 'ocpi_ids': ['id_1']}]
+    assert single_query_response['stations'][0]['average_rating'] == 5.5
+
+
+@pytest.mark.parametrize('single_query_hydration', [True, False])
+async def test_get_stations_by_area__events_and_comments_limit(
+        client: TestClient, pg: asyncpg.Pool, monkeypatch: pytest.MonkeyPatch, single_query_hydration: bool
+) -> None:
+    # arrange
+    monkeypatch.setattr(client.app.state, 'single_query_hydration', single_query_hydration)
+
+    station_id = await add_station(pg=pg, latitude=1.4, longitude=1.5, rating=None)
+    await add_source(pg=pg, station_id=station_id, station_inner_id=1, source='plug_share')
+    for i in range(3):
+        await add_comment(pg=pg, station_id=station_id, text=f'text {i}', source='plug_share', rating=-1)
+        await add_event(
+            pg=pg,
+            station_id=station_id,
+            source='plug_share',
+            is_problem=False,
+            charged_at=datetime(2021, 1, 1 + i, tzinfo=UTC)
+        )
+
+    # act
+    resp = client.get(
+        '/api/v1/stations-by-area',
+        params={
+            'events_limit': 2,
+            'comments_limit': 1,
+            'ne_lat': 2,
+            'ne_lon': 2,
+            'sw_lat': 1,
+            'sw_lon': 1,
+        },
+        headers={
+            'Authorization': os.environ['ADMIN_AUTH_TOKEN']
+        }
+    )
+
+    # assert
+    assert resp.status_code == 200
+
+    station = resp.json()['stations'][0]
+    assert [e['charged_at'] for e in station['events']] == ['2021-01-03T00:00:00Z', '2021-01-02T00:00:00Z']
+    assert station['last_event']['charged_at'] == '2021-01-03T00:00:00Z'
+    assert len(station['comments']) == 1
+
+    # average rating is calculated over all comments
+    assert station['average_rating'] == 1.0
+
+
+async def test_get_stations_by_area__summary_mode(client: TestClient, pg: asyncpg.Pool) -> None:
+    # arrange
+    resp = client.post(
+        '/inner/api/stations',
+        json={
+            'stations': [
+                {
+                    'coordinates': {
+                        'lat': 1.4,
+                        'lon': 1.5,
+                    },
+                    'source': {
+                        'source': 'plug_share',
+                        'inner_id': 1,
+                    },
+                    'events': [
+                        {
+                            'source': 'plug_share',
+                            'is_problem': True,
+                            'charged_at': '2021-01-02T00:00:00Z',
+                        },
+                        {
+                            'source': 'plug_share',
+                            'is_problem': False,
+                            'charged_at': '2021-01-01T00:00:00Z',
+                        }
+                    ],
+                    'comments': [
+                        {
+                            'source': 'plug_share',
+                            'text': 'text',
+                            'created_at': '2021-01-01T00:00:00Z',
+                            'rating': 1,
+                        },
+                        {
+                            'source': 'plug_share',
+                            'text': 'text 2',
+                            'created_at': '2021-01-01T00:00:00Z',
+                            'rating': -1,
+                        }
+                    ],
+                }
+            ]
+        },
+        headers={
+            'Authorization': os.environ['ADMIN_AUTH_TOKEN']
+        }
+    )
+    assert resp.status_code == 201
+
+    # act
+    resp = client.get(
+        '/api/v1/stations-by-area',
+        params={
+            'mode': 'summary',
+            'ne_lat': 2,
+            'ne_lon': 2,
+            'sw_lat': 1,
+            'sw_lon': 1,
+        },
+        headers={
+            'Authorization': os.environ['ADMIN_AUTH_TOKEN']
+        }
+    )
+
+    # assert
+    assert resp.status_code == 200
+
+    station = resp.json()['stations'][0]
+    assert station['sources'] == [{'source': 'plug_share', 'inner_id': 1}]
+    assert station['events'] is None
+    assert station['comments'] is None
+    assert station['chargers'] is None
+
+    assert station['last_event']['charged_at'] == '2021-01-02T00:00:00Z'
+    assert station['last_event']['is_problem'] is True
+    assert station['average_rating'] == 5.5
+    assert station['comment_count'] == 2
+
+
+async def test_get_stations_by_area__cache_is_invalidated_on_add_stations(
+        client: TestClient, pg: asyncpg.Pool
+) -> None:
+    # arrange
+    params = {
+        'ne_lat': 2,
+        'ne_lon': 2,
+        'sw_lat': 1,
+        'sw_lon': 1,
+    }
+    resp = client.get(
+        '/api/v1/stations-by-area',
+        params=params,
+        headers={
+            'Authorization': os.environ['ADMIN_AUTH_TOKEN']
+        }
+    )
+    assert resp.json()['stations'] == []
+
+    # act
+    resp = client.post(
+        '/inner/api/stations',
+        json={
+            'stations': [
+                {
+                    'coordinates': {
+                        'lat': 1.4,
+                        'lon': 1.5,
+                    },
+                    'source': {
+                        'source': 'plug_share',
+                        'inner_id': 1,
+                    },
+                }
+            ]
+        },
+        headers={
+            'Authorization': os.environ['ADMIN_AUTH_TOKEN']
+        }
+    )
+    assert resp.status_code == 201
+
+    resp = client.get(
+        '/api/v1/stations-by-area',
+        params=params,
+        headers={
+            'Authorization': os.environ['ADMIN_AUTH_TOKEN']
+        }
+    )
+
+    # assert
+    assert resp.status_code == 200
+    assert len(resp.json()['stations']) == 1
+
+
+async def test_get_stations_by_area__server_timing(client: TestClient, pg: asyncpg.Pool) -> None:
+    # arrange
+    station_id = await add_station(pg=pg, latitude=1.4, longitude=1.5)
+    await add_source(pg=pg, station_id=station_id, station_inner_id=1, source='plug_share')
+    params = {
+        'ne_lat': 2,
+        'ne_lon': 2,
+        'sw_lat': 1,
+        'sw_lon': 1,
+    }
+
+    # act
+    resp = client.get(
+        '/api/v1/stations-by-area',
+        params=params,
+        headers={
+            'Authorization': os.environ['ADMIN_AUTH_TOKEN'],
+            'X-Server-Timing': '1'
+        }
+    )
+    not_asked_resp = client.get(
+        '/api/v1/stations-by-area',
+        params=params,
+        headers={
+            'Authorization': os.environ['ADMIN_AUTH_TOKEN']
+        }
+    )
+
+    # assert
+    assert resp.status_code == 200
+    steps = {step.split(';')[0] for step in resp.headers['Server-Timing'].split(', ')}
+    assert {'pg_acquire', 'StationsRepository.get_by_area', 'format', 'serialize', 'total'} <= steps
+    assert 'Server-Timing' not in not_asked_resp.headers
@@ -0,0 +1,60 @@
+import os
+
+import asyncpg
+import pytest
+from fastapi.testclient import TestClient
+
+from tests_functional.helpers import add_event, add_source, add_station
+
+
+@pytest.mark.parametrize('single_query_hydration', [True, False])
+async def test_get_stations_nearby(
+        client: TestClient, pg: asyncpg.Pool, monkeypatch: pytest.MonkeyPatch, single_query_hydration: bool
+) -> None:
+    # arrange
+    monkeypatch.setattr(client.app.state, 'single_query_hydration', single_query_hydration)
+
+    for inner_id, (latitude, longitude) in enumerate([(1.3, 1.5), (1.4, 1.5), (1.0, 1.0)]):
+        station_id = await add_station(pg=pg, latitude=latitude, longitude=longitude)
+        await add_source(pg=pg, station_id=station_id, station_inner_id=inner_id, source='plug_share')
+        await add_event(pg=pg, station_id=station_id, source='plug_share', is_problem=False)
+
+    # act
+    resp = client.get(
+        '/api/v1/stations-nearby',
+        params={
+            'lat': 1.41,
+            'lon': 1.5,
+            'limit': 2,
+        },
+        headers={
+            'Authorization': os.environ['ADMIN_AUTH_TOKEN']
+        }
+    )
+
+    # assert
+    assert resp.status_code == 200
+
+    stations = resp.json()['stations']
+    assert [s['sources'][0]['inner_id'] for s in stations] == [1, 0]
+    assert stations[0]['events']
+    # 0.01 and 0.11 degrees of latitude
+    assert stations[0]['distance'] == pytest.approx(1_106, rel=0.01)
+    assert stations[1]['distance'] == pytest.approx(12_164, rel=0.01)
+
+
+async def test_get_stations_nearby__invalid_lat(client: TestClient, pg: asyncpg.Pool) -> None:
+    # act
+    resp = client.get(
+        '/api/v1/stations-nearby',
+        params={
+            'lat': 100,
+            'lon': 1.5,
+        },
+        headers={
+            'Authorization': os.environ['ADMIN_AUTH_TOKEN']
+        }
+    )
+
+    # assert
+    assert resp.status_code == 422
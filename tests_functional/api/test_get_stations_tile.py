@@ -0,0 +1,87 @@
+import os
+
+import asyncpg
+from fastapi.testclient import TestClient
+
+from src.utils.geo import lon_lat_to_tile
+from tests_functional.helpers import add_source, add_station
+
+
+async def test_get_stations_tile(client: TestClient, pg: asyncpg.Pool) -> None:
+    # arrange
+    station_id = await add_station(pg=pg, latitude=1.4, longitude=1.5)
+    await add_source(pg=pg, station_id=station_id, station_inner_id=1, source='plug_share')
+    x, y = lon_lat_to_tile(lon=1.5, lat=1.4, zoom=10)
+
+    # act
+    resp = client.get(
+        f'/api/v1/tiles/10/{x}/{y}.mvt',
+        headers={
+            'Authorization': os.environ['ADMIN_AUTH_TOKEN']
+        }
+    )
+    empty_resp = client.get(
+        f'/api/v1/tiles/10/{x + 1}/{y}.mvt',
+        headers={
+            'Authorization': os.environ['ADMIN_AUTH_TOKEN']
+        }
+    )
+
+    # assert
+    assert resp.status_code == 200
+    assert resp.headers['content-type'] == 'application/vnd.mapbox-vector-tile'
+    assert b'stations' in resp.content
+
+    assert empty_resp.status_code == 200
+    assert empty_resp.content == b''
+
+
+async def test_get_stations_tile__cache_is_invalidated_on_add_stations(client: TestClient, pg: asyncpg.Pool) -> None:
+    # arrange
+    x, y = lon_lat_to_tile(lon=1.5, lat=1.4, zoom=10)
+    url = f'/api/v1/tiles/10/{x}/{y}.mvt'
+
+    resp = client.get(url, headers={'Authorization': os.environ['ADMIN_AUTH_TOKEN']})
+    assert resp.content == b''
+
+    # act
+    resp = client.post(
+        '/inner/api/stations',
+        json={
+            'stations': [
+                {
+                    'coordinates': {
+                        'lat': 1.4,
+                        'lon': 1.5,
+                    },
+                    'source': {
+                        'source': 'plug_share',
+                        'inner_id': 1,
+                    },
+                }
+            ]
+        },
+        headers={
+            'Authorization': os.environ['ADMIN_AUTH_TOKEN']
+        }
+    )
+    assert resp.status_code == 201
+
+    resp = client.get(url, headers={'Authorization': os.environ['ADMIN_AUTH_TOKEN']})
+
+    # assert
+    assert resp.status_code == 200
+    assert b'stations' in resp.content
+
+
+async def test_get_stations_tile__out_of_range(client: TestClient, pg: asyncpg.Pool) -> None:
+    # act
+    resp = client.get(
+        '/api/v1/tiles/1/2/0.mvt',
+        headers={
+            'Authorization': os.environ['ADMIN_AUTH_TOKEN']
+        }
+    )
+
+    # assert
+    assert resp.status_code == 404
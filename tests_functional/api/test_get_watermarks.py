@@ -0,0 +1,56 @@
+import os
+from datetime import UTC, datetime
+
+import asyncpg
+from fastapi.testclient import TestClient
+
+from tests_functional.helpers import add_source, add_station
+
+
+async def test_get_watermarks(client: TestClient, pg: asyncpg.Pool) -> None:
+    # arrange
+    station_id = await add_station(pg=pg, latitude=1, longitude=1)
+    for inner_id in (3, 1, 2):
+        await add_source(pg=pg, station_id=station_id, station_inner_id=inner_id, source='plug_share')
+    await add_source(pg=pg, station_id=station_id, station_inner_id=4, source='charge_point')
+    await pg.execute(
+        'UPDATE sources SET events_watermark = $1 WHERE station_inner_id = 2',
+        datetime(2024, 1, 1, tzinfo=UTC)
+    )
+
+    # act
+    first_page = client.get(
+        '/inner/api/sources/plug_share/watermarks',
+        params={'limit': 2},
+        headers={'Authorization': os.environ['ADMIN_AUTH_TOKEN']}
+    )
+    last_page = client.get(
+        '/inner/api/sources/plug_share/watermarks',
+        params={'limit': 2, 'after_inner_id': first_page.json()['next_after_inner_id']},
+        headers={'Authorization': os.environ['ADMIN_AUTH_TOKEN']}
+    )
+
+    # assert
+    assert first_page.status_code == 200
+    assert first_page.json() == {
+        'watermarks': [
+            {'inner_id': 1, 'events_watermark': None, 'comments_watermark': None},
+            {'inner_id': 2, 'events_watermark': '2024-01-01T00:00:00Z', 'comments_watermark': None},
+        ],
+        'next_after_inner_id': 2,
+    }
+    assert last_page.status_code == 200
+    assert last_page.json() == {
+        'watermarks': [
+            {'inner_id': 3, 'events_watermark': None, 'comments_watermark': None},
+        ],
+        'next_after_inner_id': None,
+    }
+
+
+def test_get_watermarks__unauthorized(client: TestClient) -> None:
+    # act
+    resp = client.get('/inner/api/sources/plug_share/watermarks')
+
+    # assert
+    assert resp.status_code == 401
@@ -0,0 +1,73 @@
+import asyncio
+import os
+
+import asyncpg
+from fastapi.testclient import TestClient
+
+
+async def _wait_for_job(client: TestClient, job_id: int) -> dict:
+    for _ in range(100):
+        resp = client.get(f'/inner/api/ingest-jobs/{job_id}', headers={'Authorization': os.environ['ADMIN_AUTH_TOKEN']})
+        assert resp.status_code == 200
+        job = resp.json()
+        if job['status'] in ('done', 'failed'):
+            return job
+        await asyncio.sleep(0.1)
+    raise TimeoutError(f'Job {job_id} is not finished')
+
+
+async def test_add_stations__background(client: TestClient, pg: asyncpg.Pool) -> None:
+    # act
+    resp = client.post(
+        '/inner/api/stations',
+        params={'background': True},
+        json={
+            'stations': [
+                {
+                    'coordinates': {'lat': 1.4, 'lon': 1.5},
+                    'source': {'source': 'plug_share', 'inner_id': 1},
+                    'events': [
+                        {'source': 'plug_share', 'charged_at': '2021-01-01T00:00:00+00:00', 'is_problem': False},
+                    ],
+                },
+                {
+                    'coordinates': {'lat': 10, 'lon': 10},
+                    'source': {'source': 'plug_share', 'inner_id': 2},
+                },
+            ]
+        },
+        headers={
+            'Authorization': os.environ['ADMIN_AUTH_TOKEN']
+        }
+    )
+
+    # assert
+    assert resp.status_code == 202
+    job = await _wait_for_job(client=client, job_id=resp.json()['job_id'])
+
+    assert job['status'] == 'done'
+    assert job['stations_count'] == 2
+    assert job['processed_count'] == 2
+    assert job['stats'] == {
+        'stations': 2,
+        'skipped': 0,
+        'outdated': 0,
+        'new_stations': 2,
+        'new_sources': 2,
+        'events': 1,
+        'comments': 0,
+        'chargers': 0,
+    }
+    assert job['started_at'] and job['finished_at']
+    assert job['duration_seconds'] >= 0
+
+    assert len(await pg.fetch('SELECT * FROM stations')) == 2
+    assert len(await pg.fetch('SELECT * FROM events')) == 1
+
+
+async def test_get_ingest_job__not_found(client: TestClient, pg: asyncpg.Pool) -> None:
+    # act
+    resp = client.get('/inner/api/ingest-jobs/0', headers={'Authorization': os.environ['ADMIN_AUTH_TOKEN']})
+
+    # assert
+    assert resp.status_code == 404
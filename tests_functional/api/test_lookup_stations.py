@@ -0,0 +1,67 @@
+import os
+
+import asyncpg
+import pytest
+from fastapi.testclient import TestClient
+
+from tests_functional.helpers import add_comment, add_source, add_station
+
+
+@pytest.mark.parametrize('single_query_hydration', [True, False])
+async def test_lookup_stations(
+        client: TestClient, pg: asyncpg.Pool, monkeypatch: pytest.MonkeyPatch, single_query_hydration: bool
+) -> None:
+    # arrange
+    monkeypatch.setattr(client.app.state, 'single_query_hydration', single_query_hydration)
+
+    station_id = await add_station(pg=pg, latitude=1.4, longitude=1.5)
+    await add_source(pg=pg, station_id=station_id, station_inner_id=1, source='plug_share')
+    await add_source(pg=pg, station_id=station_id, station_inner_id=2, source='charge_point')
+    await add_comment(pg=pg, station_id=station_id, text='text', source='plug_share')
+
+    other_station_id = await add_station(pg=pg, latitude=1.8, longitude=1.9)
+    await add_source(pg=pg, station_id=other_station_id, station_inner_id=3, source='plug_share')
+
+    # act
+    resp = client.post(
+        '/api/v1/stations/lookup',
+        json={
+            'stations': [
+                {'source': 'plug_share', 'inner_id': 1},
+                {'source': 'charge_point', 'inner_id': 2},
+                {'source': 'plug_share', 'inner_id': 3},
+                # not found
+                {'source': 'plug_share', 'inner_id': 4},
+            ]
+        },
+        headers={
+            'Authorization': os.environ['ADMIN_AUTH_TOKEN']
+        }
+    )
+
+    # assert
+    assert resp.status_code == 200
+
+    stations = resp.json()['stations']
+    assert set(stations) == {'plug_share:1', 'charge_point:2', 'plug_share:3'}
+    assert stations['plug_share:1'] == stations['charge_point:2']
+    assert len(stations['plug_share:1']['sources']) == 2
+    assert len(stations['plug_share:1']['comments']) == 1
+    assert stations['plug_share:3']['coordinates'] == {'lat': 1.8, 'lon': 1.9}
+    assert stations['plug_share:3']['comments'] == []
+
+
+async def test_lookup_stations__too_many_stations(client: TestClient, pg: asyncpg.Pool) -> None:
+    # act
+    resp = client.post(
+        '/api/v1/stations/lookup',
+        json={
+            'stations': [{'source': 'plug_share', 'inner_id': i} for i in range(1001)]
+        },
+        headers={
+            'Authorization': os.environ['ADMIN_AUTH_TOKEN']
+        }
+    )
+
+    # assert
+    assert resp.status_code == 422
@@ -21,6 +21,7 @@ async def pg_fixture() -> asyncpg.Pool:
         await pool.execute('DELETE FROM events;')
         await pool.execute('DELETE FROM chargers;')
         await pool.execute('DELETE FROM tokens;')
+        await pool.execute('DELETE FROM ingest_jobs;')
 
     await teardown()
 
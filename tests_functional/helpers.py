@@ -142,16 +142,22 @@ async def add_charger(
 async def add_token(
         pg: asyncpg.Pool,
         api_key: str,
+        rate_limit_per_second: float | None = None,
+        rate_limit_burst: int | None = None,
 ) -> None:
     await pg.execute(
         """
         INSERT INTO tokens (
-            api_key
+            api_key,
+            rate_limit_per_second,
+            rate_limit_burst
         )
         VALUES
-            ($1)
+            ($1, $2, $3)
         """,
-        api_key
+        api_key,
+        rate_limit_per_second,
+        rate_limit_burst
     )
 
 
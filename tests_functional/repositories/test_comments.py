@@ -0,0 +1,28 @@
+from datetime import UTC, datetime
+
+import asyncpg
+
+from src.repositories.postgres.comments import CommentsRepository
+from tests_functional.helpers import add_station
+
+
+async def test_add_comments__without_created_at_have_no_natural_key(pg: asyncpg.Pool) -> None:
+    # arrange
+    station_id = await add_station(pg=pg, latitude=1, longitude=1)
+    comments_repo = CommentsRepository(pool=pg)
+    created_at = datetime(2024, 1, 1, tzinfo=UTC)
+
+    # act
+    async with pg.acquire() as conn:
+        added_count = await comments_repo.add_comments(
+            conn=conn,
+            comments=[
+                (station_id, 'text', 'plug_share', None, None, None),
+                (station_id, 'text', 'plug_share', None, None, None),
+                (station_id, 'text', 'plug_share', created_at, None, None),
+                (station_id, 'text', 'plug_share', created_at, None, None),
+            ]
+        )
+
+    # assert
+    assert added_count == 3
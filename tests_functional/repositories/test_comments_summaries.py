@@ -0,0 +1,49 @@
+import asyncpg
+
+from src.repositories.postgres.stations import StationsRepository
+from tests_functional.helpers import add_comment, add_station
+
+_GET_SUMMARIES_QUERY = 'SELECT id, rating_sum, rating_count, comment_count FROM stations ORDER BY id'
+
+
+async def test_comments_trigger(pg: asyncpg.Pool) -> None:
+    # arrange
+    station_id = await add_station(pg=pg, latitude=1, longitude=1)
+    other_station_id = await add_station(pg=pg, latitude=2, longitude=2)
+
+    # act
+    await add_comment(pg=pg, station_id=station_id, text='1', source='plug_share', rating=1)
+    await add_comment(pg=pg, station_id=station_id, text='2', source='plug_share', rating=-1)
+    await add_comment(pg=pg, station_id=station_id, text='3', source='plug_share', rating=1)
+    await add_comment(pg=pg, station_id=station_id, text='4', source='plug_share')
+    await add_comment(pg=pg, station_id=other_station_id, text='5', source='plug_share', rating=0)
+    await pg.execute("DELETE FROM comments WHERE text IN ('3', '4')")
+
+    # assert
+    rows = await pg.fetch(_GET_SUMMARIES_QUERY)
+    assert [tuple(row.values()) for row in rows] == [
+        (station_id, 0, 2, 2),
+        (other_station_id, 0, 0, 1),
+    ]
+
+
+async def test_recalculate_comments_summaries(pg: asyncpg.Pool) -> None:
+    # arrange
+    station_ids = [await add_station(pg=pg, latitude=i, longitude=i) for i in range(3)]
+    for station_id in station_ids:
+        await add_comment(pg=pg, station_id=station_id, text='text', source='plug_share', rating=1)
+    expected_rows = await pg.fetch(_GET_SUMMARIES_QUERY)
+    await pg.execute('UPDATE stations SET rating_sum = 10, rating_count = 10, comment_count = 10')
+
+    stations_repo = StationsRepository(pool=pg)
+
+    # act
+    first_batch_last_id = await stations_repo.recalculate_comments_summaries(after_id=0, limit=2)
+    last_batch_last_id = await stations_repo.recalculate_comments_summaries(after_id=first_batch_last_id, limit=2)
+    no_batch_last_id = await stations_repo.recalculate_comments_summaries(after_id=last_batch_last_id, limit=2)
+
+    # assert
+    assert first_batch_last_id == station_ids[1]
+    assert last_batch_last_id == station_ids[2]
+    assert no_batch_last_id is None
+    assert await pg.fetch(_GET_SUMMARIES_QUERY) == expected_rows
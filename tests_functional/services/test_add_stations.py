@@ -0,0 +1,328 @@
+import asyncio
+from datetime import UTC, datetime, timedelta
+
+import asyncpg
+
+from src.api.routers.v1.models import AddComment, AddStation, Event
+from src.services.stations import StationsServices
+from tests_functional.helpers import add_charger, add_event, add_source, add_station
+
+NOW = datetime(2024, 2, 1, 12, tzinfo=UTC)
+
+
+async def _prepare_stored_stations(pg: asyncpg.Pool) -> None:
+    station_id = await add_station(pg=pg, latitude=1.4, longitude=1.5)
+    await add_source(pg=pg, station_id=station_id, station_inner_id=1, source='plug_share')
+    await add_event(pg=pg, station_id=station_id, source='plug_share', is_problem=False, charged_at=NOW)
+
+    station_id = await add_station(pg=pg, latitude=10, longitude=10)
+    await add_source(pg=pg, station_id=station_id, station_inner_id=2, source='plug_share')
+    await add_charger(pg=pg, station_id=station_id, ocpi_ids=['1', '2'], network='network')
+
+
+def _get_stations() -> list[AddStation]:
+    stations = [
+        # stored station found by source, first event is already saved
+        {
+            'coordinates': {'lat': 1.4, 'lon': 1.5},
+            'source': {'source': 'plug_share', 'inner_id': 1},
+            'events': [
+                {'source': 'plug_share', 'charged_at': NOW + timedelta(seconds=10), 'is_problem': False},
+                {'source': 'plug_share', 'charged_at': NOW + timedelta(hours=1), 'is_problem': True},
+            ],
+            'comments': [
+                {'source': 'plug_share', 'text': 'text', 'created_at': NOW, 'rating': 5},
+            ],
+        },
+        # stored station found by coordinates, first charger is already saved
+        {
+            'coordinates': {'lat': 10, 'lon': 10.0005},
+            'source': {'source': 'charge_point', 'inner_id': 2},
+            'chargers': [
+                {'network': 'network', 'ocpi_ids': ['2', '1']},
+                {'network': 'network', 'ocpi_ids': ['3']},
+            ],
+        },
+        # new station
+        {
+            'coordinates': {'lat': 20, 'lon': 20},
+            'source': {'source': 'plug_share', 'inner_id': 3},
+            'address': 'address',
+            'rating': 7.5,
+            'ocpi_ids': ['ocpi'],
+            'geo': {'country': 'country'},
+            'events': [
+                {'source': 'plug_share', 'charged_at': NOW, 'name': 'name'},
+            ],
+        },
+        # new station found by coordinates of the one added in the same batch
+        {
+            'coordinates': {'lat': 20, 'lon': 20.0005},
+            'source': {'source': 'charge_point', 'inner_id': 3},
+            'events': [
+                {'source': 'charge_point', 'charged_at': NOW - timedelta(days=1)},
+            ],
+            'comments': [
+                {'source': 'charge_point', 'text': 'text', 'created_at': NOW, 'rating': 3},
+            ],
+        },
+        # new station repeated in the same batch, duplicates are not added twice
+        {
+            'coordinates': {'lat': 20, 'lon': 20},
+            'source': {'source': 'plug_share', 'inner_id': 3},
+            'events': [
+                {'source': 'plug_share', 'charged_at': NOW + timedelta(seconds=30), 'name': 'name'},
+                {'source': 'plug_share', 'charged_at': NOW + timedelta(days=1), 'name': 'name'},
+            ],
+            'comments': [
+                {'source': 'charge_point', 'text': 'text', 'created_at': NOW, 'rating': 3},
+                {'source': 'plug_share', 'text': 'other text', 'created_at': NOW},
+            ],
+        },
+        # new station far from the others
+        {
+            'coordinates': {'lat': 30, 'lon': 30},
+            'source': {'source': 'plug_share', 'inner_id': 4},
+        },
+    ]
+    return [AddStation(**station) for station in stations]
+
+
+async def _get_stored_data(pg: asyncpg.Pool) -> list[dict]:
+    # stations are identified by their sources, ids depend on the insert order
+    rows = await pg.fetch(
+        """
+        SELECT
+            s.id,
+            ST_X(s.coordinates::geometry) AS lon,
+            ST_Y(s.coordinates::geometry) AS lat,
+            s.geo,
+            s.address,
+            s.ocpi_ids,
+            s.rating,
+            s.last_event_at,
+            s.last_event,
+            s.rating_sum,
+            s.rating_count,
+            s.comment_count,
+            (
+                SELECT
+                    array_agg(source || ':' || station_inner_id ORDER BY source, station_inner_id)
+                FROM
+                    sources
+                WHERE
+                    station_id = s.id
+            ) AS sources
+        FROM
+            stations s
+        """
+    )
+    data = []
+    for row in rows:
+        events = await pg.fetch(
+            'SELECT source, charged_at, name, is_problem FROM events WHERE station_id = $1', row['id']
+        )
+        comments = await pg.fetch(
+            'SELECT text, user_name, created_at, source, rating FROM comments WHERE station_id = $1', row['id']
+        )
+        chargers = await pg.fetch('SELECT ocpi_ids, network FROM chargers WHERE station_id = $1', row['id'])
+        station = {key: value for key, value in row.items() if key != 'id'}
+        station['events'] = sorted((tuple(event.values()) for event in events), key=repr)
+        station['comments'] = sorted((tuple(comment.values()) for comment in comments), key=repr)
+        station['chargers'] = sorted((tuple(charger.values()) for charger in chargers), key=repr)
+        data.append(station)
+    return sorted(data, key=lambda station: station['sources'])
+
+
+async def test_add_stations(pg: asyncpg.Pool) -> None:
+    # arrange
+    stations_service = StationsServices(pool=pg)
+    await _prepare_stored_stations(pg=pg)
+
+    # act
+    stats = await stations_service.add_stations(stations=_get_stations())
+
+    # assert
+    assert (stats.new_stations, stats.new_sources, stats.events, stats.comments, stats.chargers) == (2, 4, 4, 3, 1)
+    data = [
+        {
+            key: station[key]
+            for key in (
+                'sources', 'events', 'comments', 'chargers', 'last_event_at', 'rating_sum', 'rating_count',
+                'comment_count'
+            )
+        }
+        for station in await _get_stored_data(pg=pg)
+    ]
+    assert data == [
+        # stored station found by coordinates, stored charger is not added twice
+        {
+            'sources': ['charge_point:2', 'plug_share:2'],
+            'events': [],
+            'comments': [],
+            'chargers': [('["1", "2"]', 'network'), ('["3"]', 'network')],
+            'last_event_at': None,
+            'rating_sum': 0,
+            'rating_count': 0,
+            'comment_count': 0,
+        },
+        # new station with the one found by its coordinates and the repeated one merged into it
+        {
+            'sources': ['charge_point:3', 'plug_share:3'],
+            'events': sorted(
+                [
+                    ('plug_share', NOW, 'name', None),
+                    ('charge_point', NOW - timedelta(days=1), None, None),
+                    ('plug_share', NOW + timedelta(days=1), 'name', None),
+                ],
+                key=repr
+            ),
+            'comments': sorted(
+                [
+                    ('text', None, NOW, 'charge_point', 3),
+                    ('other text', None, NOW, 'plug_share', None),
+                ],
+                key=repr
+            ),
+            'chargers': [],
+            'last_event_at': NOW + timedelta(days=1),
+            'rating_sum': 3,
+            'rating_count': 1,
+            'comment_count': 2,
+        },
+        # stored station found by source, stored event is not added twice
+        {
+            'sources': ['plug_share:1'],
+            'events': sorted(
+                [
+                    ('plug_share', NOW, None, False),
+                    ('plug_share', NOW + timedelta(hours=1), None, True),
+                ],
+                key=repr
+            ),
+            'comments': [('text', None, NOW, 'plug_share', 5)],
+            'chargers': [],
+            'last_event_at': NOW + timedelta(hours=1),
+            'rating_sum': 5,
+            'rating_count': 1,
+            'comment_count': 1,
+        },
+        {
+            'sources': ['plug_share:4'],
+            'events': [],
+            'comments': [],
+            'chargers': [],
+            'last_event_at': None,
+            'rating_sum': 0,
+            'rating_count': 0,
+            'comment_count': 0,
+        },
+    ]
+
+
+async def test_add_stations__added_twice(pg: asyncpg.Pool) -> None:
+    # arrange
+    stations_service = StationsServices(pool=pg)
+    await _prepare_stored_stations(pg=pg)
+    await stations_service.add_stations(stations=_get_stations())
+    expected_data = await _get_stored_data(pg=pg)
+
+    # act
+    await stations_service.add_stations(stations=_get_stations())
+
+    # assert
+    assert await _get_stored_data(pg=pg) == expected_data
+
+
+async def test_add_stations__concurrently(pg: asyncpg.Pool) -> None:
+    # arrange
+    stations_service = StationsServices(pool=pg, ingest_batch_size=2)
+    stations = _get_stations()
+
+    # act
+    await asyncio.gather(
+        stations_service.add_stations(stations=stations),
+        stations_service.add_stations(stations=stations[::-1]),
+        stations_service.add_stations(stations=stations[2:]),
+    )
+
+    # assert
+    data = await _get_stored_data(pg=pg)
+    assert [station['sources'] for station in data] == [
+        ['charge_point:2'],
+        ['charge_point:3', 'plug_share:3'],
+        ['plug_share:1'],
+        ['plug_share:4'],
+    ]
+
+
+async def test_add_stations__unchanged_stations_skipped(pg: asyncpg.Pool) -> None:
+    # arrange
+    stations_service = StationsServices(pool=pg)
+    stations = _get_stations()
+    await stations_service.add_stations(stations=stations)
+
+    get_payload_hash_query = 'SELECT payload_hash FROM sources WHERE station_inner_id = 4'
+    payload_hash = await pg.fetchval(get_payload_hash_query)
+    changed_station = stations[-1].model_copy(update={'address': 'new address'})
+
+    # act
+    stats = await stations_service.add_stations(stations=[*stations[:-1], changed_station])
+
+    # assert
+    assert stats.stations == len(stations)
+    assert stats.skipped == len(stations) - 1
+    assert payload_hash
+    assert await pg.fetchval(get_payload_hash_query) != payload_hash
+
+
+async def test_add_stations__outdated_events_dropped(pg: asyncpg.Pool) -> None:
+    # arrange
+    stations_service = StationsServices(pool=pg)
+    station = _get_stations()[2]
+    await stations_service.add_stations(stations=[station])
+
+    events = [
+        {'source': 'plug_share', 'charged_at': NOW - timedelta(days=1), 'name': 'outdated'},
+        {'source': 'plug_share', 'charged_at': NOW + timedelta(days=1), 'name': 'new'},
+    ]
+    changed_station = station.model_copy(update={'events': [Event(**event) for event in events]})
+
+    # act
+    stats = await stations_service.add_stations(stations=[changed_station])
+
+    # assert
+    assert stats.outdated == 1
+    assert stats.events == 1
+    names = await pg.fetch('SELECT name FROM events ORDER BY charged_at')
+    assert [row['name'] for row in names] == ['name', 'new']
+    watermark = await pg.fetchval('SELECT events_watermark FROM sources WHERE station_inner_id = 3')
+    assert watermark == NOW + timedelta(days=1)
+
+
+async def test_add_stations__duplicates_across_minute_boundary(pg: asyncpg.Pool) -> None:
+    # arrange
+    stations_service = StationsServices(pool=pg)
+    station = _get_stations()[2].model_copy(update={'events': None, 'comments': None})
+    minute_end = datetime(2024, 2, 1, 12, 0, 59, tzinfo=UTC)
+    stored_station = station.model_copy(update={
+        'events': [Event(source='plug_share', charged_at=minute_end, name='name')],
+        'comments': [AddComment(source='plug_share', text='text', created_at=minute_end)],
+    })
+    await stations_service.add_stations(stations=[stored_station])
+
+    next_minute_start = minute_end + timedelta(seconds=2)
+    changed_station = station.model_copy(update={
+        'address': 'new address',
+        'events': [Event(source='plug_share', charged_at=next_minute_start, name='name')],
+        'comments': [AddComment(source='plug_share', text='text', created_at=next_minute_start)],
+    })
+
+    # act
+    stats = await stations_service.add_stations(stations=[changed_station])
+
+    # assert
+    assert stats.events == 0
+    assert stats.comments == 0
+    assert await pg.fetchval('SELECT array_agg(charged_at) FROM events') == [minute_end]
+    assert await pg.fetchval('SELECT array_agg(created_at) FROM comments') == [minute_end]
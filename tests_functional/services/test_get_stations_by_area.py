@@ -0,0 +1,40 @@
+from datetime import UTC, datetime
+
+import asyncpg
+
+from src.api.routers.v1.models import AreaRequest
+from src.services.stations import StationsServices
+from tests_functional.conftest import test_settings
+from tests_functional.helpers import add_event, add_source, add_station
+
+
+async def test_get_by_area__timestamps_in_utc_whatever_session_time_zone(pg: asyncpg.Pool) -> None:
+    # arrange
+    station_id = await add_station(pg=pg, latitude=1.4, longitude=1.5)
+    await add_source(pg=pg, station_id=station_id, station_inner_id=1, source='plug_share')
+    await add_event(
+        pg=pg, station_id=station_id, source='plug_share', is_problem=False, charged_at=datetime(2021, 1, 1, tzinfo=UTC)
+    )
+
+    pool = await asyncpg.create_pool(
+        dsn=f'postgresql://{test_settings.PG_USER}:{test_settings.PG_PASSWORD}'
+        f'@{test_settings.PG_HOST}:{test_settings.PG_PORT}/{test_settings.PG_DATABASE}',
+        server_settings={'timezone': 'Asia/Kolkata'}
+    )
+    area = AreaRequest(sw_lat=1, sw_lon=1, ne_lat=2, ne_lon=2)
+
+    # act
+    try:
+        responses = [
+            await StationsServices(pool=pool, single_query_hydration=single_query_hydration).get_by_area_response(
+                limit=10, offset=0, area=area
+            )
+            for single_query_hydration in (True, False)
+        ]
+    finally:
+        await pool.close()
+
+    # assert
+    single_query_response, fan_out_response = responses
+    assert single_query_response == fan_out_response
+    assert b'"charged_at":"2021-01-01T00:00:00Z"' in single_query_response